@@ -0,0 +1,127 @@
+"""
+Micro-benchmark of the command preparation. Measures the time taken to turn the data classes into XML commands, with
+a communicator which does not send them, so only the client side of the hot path of the bulk runs is measured.
+
+Usage, with pyepp installed: python benchmarks/bench_commands.py [--count 10000]
+"""
+
+import argparse
+import timeit
+from typing import Callable
+
+from pyepp.contact import AddressData, Contact, ContactData, PostalInfoData
+from pyepp.domain import (
+    DigestTypeEnum,
+    DNSKeyFlagEnum,
+    DNSSECAlgorithm,
+    Domain,
+    DomainData,
+    DSRecordData,
+    DSRecordKeyData,
+)
+from pyepp.epp import EppResultData
+from pyepp.host import Host, HostData, IPAddressData
+
+_RESULT = EppResultData(
+    code=1000,
+    message="Command completed successfully",
+    raw_response=b"<epp/>",
+    result_data=None,
+)
+
+_DOMAIN = DomainData(
+    domain_name="example.nz",
+    registrant="registrant",
+    admin="admin",
+    tech="tech",
+    host=["ns1.example.nz", "ns2.example.nz"],
+    period=1,
+    password="Password&123",
+    dns_sec=[
+        DSRecordData(
+            key_tag=12345,
+            algorithm=DNSSECAlgorithm.ECDSA_CURVE_P_256_WITH_SHA_256.value,
+            digest_type=DigestTypeEnum.SHA_256.value,
+            digest="49FD46E6C4B45C55D4AC69CBD3CD34AC1AFE51DE4C2E4DE4B5A6D8B8F0E2C1A3",
+            dns_key=DSRecordKeyData(
+                flag=DNSKeyFlagEnum.FLAG_257.value,
+                protocol=3,
+                algorithm=DNSSECAlgorithm.ECDSA_CURVE_P_256_WITH_SHA_256.value,
+                public_key="mdsswUyr3DPW132mOi8V9xESWE8jTo0dxCjjnopKl+GqJxpVXckHAeF+KkxLbxILfDLUT0rAK9iUzy1L53eKGQ==",
+            ),
+        )
+        for _ in range(2)
+    ],
+)
+
+_CONTACT = ContactData(
+    id="contact",
+    email="contact@example.nz",
+    phone="+64.41234567",
+    postal_info=PostalInfoData(
+        name="Mock & Contact",
+        organization="InternetNZ",
+        address=AddressData(
+            street_1="18 Willis Street",
+            street_2="Level 11",
+            city="Wellington",
+            postal_code="6011",
+            country_code="NZ",
+        ),
+    ),
+    password="Password&123",
+)
+
+_HOST = HostData(
+    host_name="ns1.example.nz",
+    address=[
+        IPAddressData(address="192.0.2.1", ip="v4"),
+        IPAddressData(address="2001:db8::1", ip="v6"),
+    ],
+)
+
+_DOMAIN_NAMES = [f"example{index}.nz" for index in range(10)]
+
+
+# pylint: disable=too-few-public-methods
+class StubCommunicator:
+    """A communicator which drops the commands and returns a successful result."""
+
+    # pylint: disable=unused-argument
+    def execute(self, cmd: str, **kwargs) -> EppResultData:
+        """Drop a command.
+
+        :param cmd: XML command
+        :param kwargs: Keyword arguments
+
+        :return: Successful result
+        :rtype: EppResultData
+        """
+        return _RESULT
+
+
+BENCHMARKS: dict[str, Callable[[StubCommunicator], Callable[[], EppResultData]]] = {
+    "domain-create": lambda epp: lambda: Domain(epp).create(_DOMAIN),
+    "domain-check": lambda epp: lambda: Domain(epp).check(_DOMAIN_NAMES),
+    "contact-create": lambda epp: lambda: Contact(epp).create(_CONTACT),
+    "host-create": lambda epp: lambda: Host(epp).create(_HOST),
+}
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--count", type=int, default=10000)
+    args = arg_parser.parse_args()
+
+    epp = StubCommunicator()
+    print(f"{'Command':<16}{'µs/command':>12}")
+    for name, benchmark in BENCHMARKS.items():
+        command = benchmark(epp)
+        command()
+        best = min(timeit.repeat(command, number=args.count, repeat=5))
+        print(f"{name:<16}{best / args.count * 1000000:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Memory benchmark of the result and data classes. Compares the memory used per object by the slotted data classes with
+equivalent data classes backed by a per-instance ``__dict__``.
+
+Usage, with pyepp installed: python benchmarks/bench_memory.py [--count 100000]
+"""
+
+import argparse
+import gc
+import functools
+import tracemalloc
+from dataclasses import field, fields, make_dataclass
+from typing import Callable
+
+from pyepp.contact import ContactData
+from pyepp.domain import DomainData
+from pyepp.epp import EppResultData
+from pyepp.host import HostData
+from pyepp.poll import ServiceMessageQueueData
+
+SAMPLES = {
+    EppResultData: lambda cls: cls(
+        code=1000,
+        message="Command completed successfully",
+        raw_response=b"<epp/>",
+        result_data=None,
+        client_transaction_id="ABC-12345",
+        server_transaction_id="54321-XYZ",
+    ),
+    DomainData: lambda cls: cls(
+        domain_name="example.nz", registrant="registrant", period=1
+    ),
+    ContactData: lambda cls: cls(
+        id="contact", postal_info=None, email="contact@example.nz"
+    ),
+    HostData: lambda cls: cls(host_name="ns1.example.nz"),
+    ServiceMessageQueueData: lambda cls: cls(
+        message_count=1, message_id=1, queue_date="2024-01-01T00:00:00Z"
+    ),
+}
+
+
+def unslotted(cls: type) -> type:
+    """Create a data class with the same fields as a slotted data class, but backed by a ``__dict__``.
+
+    :param cls: Slotted data class
+
+    :return: Equivalent data class without slots
+    :rtype: type
+    """
+    return make_dataclass(
+        f"Unslotted{cls.__name__}",
+        [
+            (
+                data_field.name,
+                data_field.type,
+                field(
+                    default=data_field.default,
+                    default_factory=data_field.default_factory,
+                ),
+            )
+            for data_field in fields(cls)
+        ],
+    )
+
+
+def measure(factory: Callable[[], object], count: int) -> float:
+    """Measure the memory used per object.
+
+    :param factory: Creates an object
+    :param count: Number of objects to create
+
+    :return: Number of bytes per object
+    :rtype: float
+    """
+    gc.collect()
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    objects = [factory() for _ in range(count)]
+    used = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    del objects
+
+    return used / count
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--count", type=int, default=100000)
+    args = arg_parser.parse_args()
+
+    print(f"{'Class':<26}{'__dict__':>12}{'slots':>12}{'saving':>10}")
+    for cls, sample in SAMPLES.items():
+        dict_cls = unslotted(cls)
+        dict_size = measure(functools.partial(sample, dict_cls), args.count)
+        slots_size = measure(functools.partial(sample, cls), args.count)
+        saving = 1 - slots_size / dict_size
+        print(
+            f"{cls.__name__:<26}{dict_size:>10.0f} B{slots_size:>10.0f} B{saving:>10.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,380 @@
+"""
+Benchmark of the commands against a local mock EPP server. Measures the throughput, latency, CPU time and memory
+allocation of the commands, so regressions in the hot path are caught without a registry.
+
+Usage, with pyepp installed:
+
+    python benchmarks/bench_server.py --count 2000 --save baseline.json
+    python benchmarks/bench_server.py --count 2000 --compare baseline.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
+
+from pyepp.base_command import ErrorCodeInResultException
+from pyepp.contact import AddressData, Contact, ContactData, PostalInfoData
+from pyepp.domain import Domain, DomainData
+from pyepp.epp import EppCommunicator, EppResultCode, EppResultData
+from pyepp.host import Host, HostData, IPAddressData
+from pyepp.poll import Poll
+from pyepp.testing import MockEppServer, create_client_ssl_context
+
+# Number of commands measured for the memory allocation. Tracing the allocations slows the commands down, so it is
+# measured separately on fewer commands.
+ALLOCATION_SAMPLES = 100
+
+_CONTACT = ContactData(
+    id="contact",
+    email="contact@example.nz",
+    phone="+64.41234567",
+    postal_info=PostalInfoData(
+        name="Mock Contact",
+        organization="InternetNZ",
+        address=AddressData(
+            street_1="18 Willis Street",
+            city="Wellington",
+            postal_code="6011",
+            country_code="NZ",
+        ),
+    ),
+)
+
+# Benchmark name -> command class and the command executed on an instance of it
+BENCHMARKS: dict[str, tuple[type, Callable[[Any], EppResultData]]] = {
+    "domain-check": (
+        Domain,
+        lambda domain: domain.check(["example1.nz", "example2.nz", "example3.nz"]),
+    ),
+    "domain-info": (Domain, lambda domain: domain.info("example.nz")),
+    "domain-create": (
+        Domain,
+        lambda domain: domain.create(
+            DomainData(
+                domain_name="example.nz",
+                registrant="registrant",
+                admin="admin",
+                tech="tech",
+                host=["ns1.example.nz", "ns2.example.nz"],
+                period=1,
+                password="Password123",
+            )
+        ),
+    ),
+    "contact-check": (Contact, lambda contact: contact.check(["contact1", "contact2"])),
+    "contact-info": (Contact, lambda contact: contact.info("contact")),
+    "contact-create": (Contact, lambda contact: contact.create(_CONTACT)),
+    "host-check": (Host, lambda host: host.check(["ns1.example.nz", "ns2.example.nz"])),
+    "host-info": (Host, lambda host: host.info("ns1.example.nz")),
+    "host-create": (
+        Host,
+        lambda host: host.create(
+            HostData(
+                host_name="ns1.example.nz",
+                address=[IPAddressData(address="192.0.2.1", ip="v4")],
+            )
+        ),
+    ),
+    "poll-request": (Poll, lambda poll: poll.request()),
+}
+
+
+@dataclass(slots=True)
+class BenchmarkResult:
+    """Result of a benchmark."""
+
+    name: str
+    commands: int
+    commands_per_second: float
+    latency_p50: float
+    latency_p99: float
+    cpu_per_command: float
+    allocated_per_command: float
+
+
+def run_benchmark(
+    name: str, epp: EppCommunicator, count: int = 1000, warmup: int = 50
+) -> BenchmarkResult:
+    """
+    Execute a command repeatedly and measure it. Latencies and CPU times are in seconds and allocations in bytes.
+    The CPU time is the one of the calling thread, so a server running in the same process is not counted.
+
+    :param name: Benchmark name
+    :param epp: Logged-in EPP communicator
+    :param count: Number of commands measured. It must be at least 1.
+    :param warmup: Number of commands executed before measuring
+
+    :return: Benchmark result
+    :rtype: BenchmarkResult
+
+    :raises ValueError: When the number of commands is less than 1
+    :raises ErrorCodeInResultException: When the command is not successful
+    """
+    if count < 1:
+        raise ValueError("Number of commands must be at least 1.")
+
+    command_class, command = BENCHMARKS[name]
+    command_object = command_class(epp)
+
+    for _ in range(max(warmup, 1)):
+        result = command(command_object)
+    if result.code >= EppResultCode.UNKNOWN_COMMAND.value:
+        raise ErrorCodeInResultException(
+            f"Benchmark {name} failed with code {result.code}: {result.message}"
+        )
+
+    latencies = []
+    cpu_start = time.thread_time()
+    start = time.perf_counter()
+    for _ in range(count):
+        command_start = time.perf_counter()
+        command(command_object)
+        latencies.append(time.perf_counter() - command_start)
+    elapsed = time.perf_counter() - start
+    cpu_time = time.thread_time() - cpu_start
+
+    latencies.sort()
+    return BenchmarkResult(
+        name=name,
+        commands=count,
+        commands_per_second=count / elapsed,
+        latency_p50=statistics.median(latencies),
+        latency_p99=latencies[min(count - 1, int(count * 0.99))],
+        cpu_per_command=cpu_time / count,
+        allocated_per_command=_measure_allocations(
+            command, command_object, min(count, ALLOCATION_SAMPLES)
+        ),
+    )
+
+
+def _measure_allocations(
+    command: Callable[[Any], EppResultData], command_object: Any, count: int
+) -> float:
+    """
+    Measure the peak memory allocated by a command.
+
+    :param command: Command
+    :param command_object: Command object the command is executed on
+    :param count: Number of commands
+
+    :return: Average number of bytes
+    :rtype: float
+    """
+    allocations = []
+    tracemalloc.start()
+    try:
+        for _ in range(count):
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            command(command_object)
+            allocations.append(tracemalloc.get_traced_memory()[1] - before)
+    finally:
+        tracemalloc.stop()
+
+    return statistics.mean(allocations) if allocations else 0.0
+
+
+def compare_results(
+    results: list[BenchmarkResult], baseline: dict[str, dict], max_regression: float
+) -> list[str]:
+    """
+    Compare benchmark results with a baseline.
+
+    :param results: Benchmark results
+    :param baseline: Baseline results by benchmark name, as saved by ``--save``
+    :param max_regression: Largest accepted regression of the throughput and the p99 latency, in percent
+
+    :return: Descriptions of the regressions
+    :rtype: list[str]
+    """
+    regressions = []
+    for result in results:
+        base = baseline.get(result.name)
+        if base is None:
+            continue
+
+        throughput_change = (
+            result.commands_per_second / base["commands_per_second"] - 1
+        ) * 100
+        if throughput_change < -max_regression:
+            regressions.append(
+                f"{result.name}: throughput changed by {throughput_change:.1f}%"
+            )
+
+        latency_change = (result.latency_p99 / base["latency_p99"] - 1) * 100
+        if latency_change > max_regression:
+            regressions.append(
+                f"{result.name}: p99 latency changed by +{latency_change:.1f}%"
+            )
+
+    return regressions
+
+
+def positive_int(value: str) -> int:
+    """
+    Parse a positive integer argument.
+
+    :param value: Argument value
+
+    :return: Integer
+    :rtype: int
+
+    :raises argparse.ArgumentTypeError: When the value is not a positive integer
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"{value!r} is not a positive integer")
+    return number
+
+
+@contextmanager
+def _mock_server_process() -> Iterator[tuple[str, int, str]]:
+    """
+    Start a mock EPP server in a child process.
+
+    :return: Host, port and certificate path of the server
+    :rtype: Iterator[tuple[str, int, str]]
+    """
+    context = multiprocessing.get_context("spawn")
+    addresses = context.Queue()
+    stopped = context.Event()
+    server = context.Process(target=_serve, args=(addresses, stopped), daemon=True)
+    server.start()
+
+    try:
+        yield addresses.get(timeout=30)
+    finally:
+        stopped.set()
+        server.join()
+
+
+def _serve(addresses: Any, stopped: Any) -> None:
+    """
+    Run a mock EPP server until it is stopped. The server runs in its own process, so its CPU time and allocations
+    are not measured.
+
+    :param addresses: Queue the host, port and certificate path of the server are put into
+    :param stopped: Event set to stop the server
+    """
+    with MockEppServer() as server:
+        addresses.put((*server.address, server.certfile))
+        stopped.wait()
+
+
+def _run_benchmarks(
+    names: list[str], count: int, warmup: int
+) -> Iterator[BenchmarkResult]:
+    """
+    Run benchmarks against a mock EPP server started in a child process.
+
+    :param names: Benchmark names
+    :param count: Number of commands measured per benchmark
+    :param warmup: Number of commands executed before measuring
+
+    :return: Benchmark results
+    :rtype: Iterator[BenchmarkResult]
+    """
+    with _mock_server_process() as (host, port, certfile):
+        epp = EppCommunicator(
+            host, port, ssl_context=create_client_ssl_context(certfile)
+        )
+        epp.connect()
+        epp.login("bench", "password")
+        try:
+            for name in names:
+                yield run_benchmark(name, epp, count=count, warmup=warmup)
+        finally:
+            epp.logout()
+            epp.close()
+
+
+def _format_result(result: BenchmarkResult) -> str:
+    """
+    Format a benchmark result as a table row.
+
+    :param result: Benchmark result
+
+    :return: Table row
+    :rtype: str
+    """
+    return (
+        f"{result.name:<16}{result.commands_per_second:>12.0f}"
+        f"{result.latency_p50 * 1000:>10.3f}{result.latency_p99 * 1000:>10.3f}"
+        f"{result.cpu_per_command * 1000000:>12.0f}{result.allocated_per_command / 1024:>12.1f}"
+    )
+
+
+def main() -> None:
+    """Run the benchmarks and print the results."""
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument(
+        "--count",
+        type=positive_int,
+        default=1000,
+        help="Number of commands measured per benchmark. Defaults to 1000.",
+    )
+    arg_parser.add_argument(
+        "--warmup",
+        type=int,
+        default=50,
+        help="Number of commands executed before measuring. Defaults to 50.",
+    )
+    arg_parser.add_argument(
+        "--benchmark",
+        "-b",
+        dest="names",
+        action="append",
+        choices=list(BENCHMARKS),
+        help="Benchmark to run. All of them are run if it is not given.",
+    )
+    arg_parser.add_argument("--save", help="Save the results as JSON.")
+    arg_parser.add_argument(
+        "--compare",
+        help="Compare the results with the saved ones and fail on regressions.",
+    )
+    arg_parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=10.0,
+        help="Largest accepted regression of the throughput and the p99 latency, in percent. Defaults to 10.",
+    )
+    args = arg_parser.parse_args()
+
+    print(
+        f"{'Benchmark':<16}{'Commands/s':>12}{'p50 ms':>10}{'p99 ms':>10}"
+        f"{'CPU µs/cmd':>12}{'KiB/cmd':>12}"
+    )
+    results = []
+    for result in _run_benchmarks(
+        args.names or list(BENCHMARKS), args.count, args.warmup
+    ):
+        results.append(result)
+        print(_format_result(result))
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as file:
+            json.dump(
+                {result.name: asdict(result) for result in results}, file, indent=2
+            )
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            regressions = compare_results(results, json.load(file), args.max_regression)
+        for regression in regressions:
+            print(f"Regression - {regression}", file=sys.stderr)
+        if regressions:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,12 +8,17 @@ from pyepp.epp import (
     EppCommunicator,
     EppResultCode,
     EppCommunicatorException,
+    EppSessionLimitExceededException,
     EppResultData,
+    RawResponsePolicy,
 )
+from pyepp.bulk import BulkEngine, BulkException, BulkResult
+from pyepp.cache import AvailabilityCache, TTLCache
 from pyepp.contact import Contact, ContactData, PostalInfoData, AddressData
 from pyepp.domain import (
     Domain,
     DomainData,
+    LazyDomainData,
     DSRecordData,
     DSRecordKeyData,
     DNSKeyFlagEnum,
@@ -21,5 +26,15 @@ from pyepp.domain import (
     DNSSECAlgorithm,
 )
 from pyepp.host import Host, HostData, IPAddressData
+from pyepp.instrumentation import (
+    CallbackObserver,
+    CommandMetrics,
+    CommandObserver,
+    WireTrace,
+)
+from pyepp.keepalive import KeepAlive
+from pyepp.openmetrics import MetricsCollector, MetricsServer
 
 from pyepp.poll import Poll, ServiceMessageQueueData, ServiceMessageData
+from pyepp.pool import SessionPool, SessionPoolException
+from pyepp.ratelimit import RateLimiter, RateLimitMetrics, TokenBucket
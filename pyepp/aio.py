@@ -0,0 +1,749 @@
+"""
+Asyncio EPP Module. An EPP client built on asyncio streams, so one event loop can drive many EPP sessions
+concurrently without a thread per connection.
+
+The async command classes share the command rendering and the response parsing of their blocking counterparts.
+Commands which need their response to be parsed are coroutines, and the other commands return the awaitable of
+``AsyncBaseCommand.execute`` directly, or of ``AsyncBaseCommand._execute_change`` when the cached info results of the
+changed objects must be removed after the command, so every command is used with ``await``.
+
+.. code:: python
+
+    epp = AsyncEppCommunicator("epp.test.net.nz", "700")
+    await epp.connect()
+    await epp.login("user_name", "password")
+
+    result = await AsyncDomain(epp).check(["example.nz"])
+
+    await epp.logout()
+"""
+
+import asyncio
+import inspect
+import logging
+import ssl
+import struct
+import time
+import uuid
+from typing import Any, AsyncIterator, Callable, Iterable, Optional
+
+from pyepp.base_command import BaseCommand, ErrorCodeInResultException
+from pyepp.command_templates import (
+    LOGIN_XML,
+    LOGOUT_XML,
+    HELLO_XML,
+    CONTACT_CHECK_XML,
+    CONTACT_INFO_XML,
+    DOMAIN_CHECK_XML,
+    DOMAIN_INFO_XML,
+    HOST_CHECK_XML,
+    HOST_INFO_XML,
+    POLL_REQUEST_XML,
+    POLL_ACK_XML,
+    get_template,
+)
+from pyepp.contact import Contact
+from pyepp.domain import DEFAULT_CHECK_BATCH_SIZE, Domain
+from pyepp.epp import (
+    CLOSING_CONNECTION_CODES,
+    DEFAULT_MAX_FRAME_SIZE,
+    DEFAULT_RAW_RESPONSE_LIMIT,
+    LENGTH_FIELD_SIZE,
+    EppCommunicatorException,
+    EppResultCode,
+    EppResultData,
+    RawResponsePolicy,
+    check_login_result,
+    create_ssl_context,
+    get_client_transaction_id,
+    get_format_32,
+    get_payload_size,
+    parse_response,
+    retain_raw_response,
+)
+from pyepp.helper import batched, get_command_type
+from pyepp.host import Host
+from pyepp.instrumentation import (
+    CommandMetrics,
+    CommandObserver,
+    WireTrace,
+    notify_observers,
+    notify_session_event,
+)
+from pyepp.poll import Poll, ServiceMessageQueueData
+from pyepp.ratelimit import OTHER_COMMANDS
+
+
+# pylint: disable=too-many-instance-attributes
+class AsyncEppCommunicator:
+    """
+    An asyncio EPP client for connecting to EPP server.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        server: str,
+        port: str,
+        client_cert: Optional[str] = None,
+        client_key: Optional[str] = None,
+        timeout: Optional[float] = 10,
+        max_frame_size: int = DEFAULT_MAX_FRAME_SIZE,
+        raw_response_policy: RawResponsePolicy = RawResponsePolicy.KEEP,
+        raw_response_limit: int = DEFAULT_RAW_RESPONSE_LIMIT,
+        ssl_context: Optional[ssl.SSLContext] = None,
+        observers: Optional[list[CommandObserver]] = None,
+        wire_trace: Optional[WireTrace] = None,
+    ) -> None:
+        """
+        :param server: EPP server to connect to.
+        :param port: EPP port to connect to.
+        :param client_cert: Path to client certificate
+        :param client_key: Path to client key
+        :param timeout: Number of seconds to wait for connecting and for each response. Waits forever if it is None.
+        :param max_frame_size: Largest response accepted from the server, in bytes
+        :param raw_response_policy: Retention policy of the raw responses in the result objects
+        :param raw_response_limit: Number of bytes of the raw responses kept by the truncate policy
+        :param ssl_context: TLS context used to connect to the server. It is created out of the client certificate
+            and key if it is None.
+        :param observers: Observers notified of the metrics of every executed command
+        :param wire_trace: Wire trace logging the XML of a sample of the commands
+        """
+        self._server = server
+        self._port = port
+        self._user = None
+        self._client_cert = client_cert
+        self._client_key = client_key
+        self._timeout = timeout
+        self._max_frame_size = max_frame_size
+        self._raw_response_policy = raw_response_policy
+        self._raw_response_limit = raw_response_limit
+        self._ssl_context = ssl_context
+        self._observers = list(observers or [])
+        self._wire_trace = wire_trace
+        # Identifies the communicator in the command metrics
+        self.session_id = uuid.uuid4().hex
+        self._logged_in = False
+
+        self._format_32 = get_format_32()
+
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        # A session can only have one command in flight.
+        self._lock = asyncio.Lock()
+        self.greeting = None
+        # The time the length field of the last response has been received, which ends the wait for the server
+        self._response_started = 0.0
+
+        # Number of bytes written to and read from the server, including the length fields.
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+    @property
+    def user(self):
+        """User property"""
+        return self._user
+
+    @property
+    def is_connected(self) -> bool:
+        """Whether the connection to the server is established and has not been closed."""
+        return bool(self.greeting) and self._writer is not None
+
+    def add_observer(self, observer: CommandObserver) -> None:
+        """
+        Add an observer notified of the metrics of every executed command.
+
+        :param observer: Command observer
+        """
+        self._observers.append(observer)
+
+    def remove_observer(self, observer: CommandObserver) -> None:
+        """
+        Remove a command observer.
+
+        :param observer: Command observer
+        """
+        self._observers.remove(observer)
+
+    async def _read(self) -> Optional[bytes]:
+        """
+        Read the response from the stream.
+
+        :return: Response
+        :rtype: Optional[bytes]
+
+        :raises EppCommunicatorException: When the length field is invalid or too large
+        """
+        try:
+            length = await self._reader.readexactly(LENGTH_FIELD_SIZE)
+            self._response_started = time.perf_counter()
+            total_bytes = get_payload_size(
+                struct.unpack(self._format_32, length)[0], self._max_frame_size
+            )
+            response = await self._reader.readexactly(total_bytes)
+            self.bytes_received += LENGTH_FIELD_SIZE + total_bytes
+            return response
+        except asyncio.IncompleteReadError:
+            return None
+        except EppCommunicatorException:
+            # The stream cannot be resynchronised after a bad length field.
+            await self.close()
+            raise
+
+    async def _write(self, xml: str) -> int:
+        """
+        Write the request into the stream.
+
+        :param str xml: XML Command
+
+        :return: Number of send bytes
+        :rtype: int
+        """
+        data_to_send = (xml + "\r\n").encode("utf-8")
+        # +4 for the length field itself (section 4 mandates that)
+        length = struct.pack(self._format_32, len(data_to_send) + LENGTH_FIELD_SIZE)
+
+        self._writer.write(length + data_to_send)
+        await self._writer.drain()
+        self.bytes_sent += LENGTH_FIELD_SIZE + len(data_to_send)
+        return len(data_to_send)
+
+    async def _execute_command(
+        self, cmd: str, metrics: Optional[CommandMetrics] = None
+    ) -> bytes:
+        """
+        Execute the command. Sending the request to the server and receive the response.
+
+        :param str cmd: XML command
+        :param metrics: Metrics of the command, which the time spent on the network and the transferred bytes are
+            recorded in
+
+        :return: Response
+        :rtype: bytes
+        """
+        logging.debug("Sending xml to server :\n%s", cmd)
+
+        async with self._lock:
+            start = time.perf_counter()
+            try:
+                sent = await self._write(cmd)
+                written = time.perf_counter()
+                response = await asyncio.wait_for(self._read(), self._timeout)
+                received = time.perf_counter()
+            except asyncio.TimeoutError as ex:
+                # The stream is out of sync once a response has been abandoned half way.
+                await self.close()
+                raise EppCommunicatorException(
+                    "Timed out waiting for the server response!"
+                ) from ex
+            except BaseException:
+                # The same goes for a command cancelled by the caller, e.g. by its own timeout, which would leave its
+                # response to the next command.
+                await self.close()
+                raise
+
+        if response is None:
+            raise EppCommunicatorException("Cannot connect to server. Please re-login!")
+
+        logging.debug("Received xml response from server :\n%s", response)
+
+        if metrics is not None:
+            metrics.write_time = written - start
+            metrics.server_time = self._response_started - written
+            metrics.read_time = received - self._response_started
+            metrics.bytes_sent = LENGTH_FIELD_SIZE + sent
+            metrics.bytes_received = LENGTH_FIELD_SIZE + len(response)
+
+        return response
+
+    async def connect(self) -> bytes:
+        """
+        Initial connect to the server.
+
+        :return: Greeting message
+        :rtype: bytes
+
+        :raises EppCommunicatorException: When there is any errors
+        """
+        try:
+            context = self._ssl_context or create_ssl_context(
+                self._client_cert, self._client_key
+            )
+            self._reader, self._writer = await asyncio.wait_for(
+                asyncio.open_connection(
+                    self._server,
+                    int(self._port),
+                    ssl=context,
+                    server_hostname=self._server,
+                ),
+                self._timeout,
+            )
+            self.greeting = await asyncio.wait_for(self._read(), self._timeout)
+            logging.debug("Received greeting from server :\n%s", self.greeting)
+            return self.greeting
+        except Exception as ex:
+            logging.error("Could not setup a sec sure connection. %s", str(ex))
+            raise EppCommunicatorException(
+                "Could not setup a sec sure connection"
+            ) from ex
+
+    async def execute(
+        self,
+        cmd: str,
+        raw_response_policy: Optional[RawResponsePolicy] = None,
+        render_time: float = 0.0,
+    ) -> EppResultData:
+        """
+        Execute the command. Sending the request to the server and receive the response.
+
+        :param str cmd: XML Command
+        :param raw_response_policy: Retention policy of the raw response. The policy of the communicator is used if
+            it is None.
+        :param render_time: Time spent rendering the command, in seconds. It is reported to the observers.
+
+        :return: Result object
+        :rtype: EppResultData
+
+        :raises EppCommunicatorException: When there is any errors.
+        """
+        metrics = (
+            CommandMetrics(
+                command_type=get_command_type(cmd) or OTHER_COMMANDS,
+                session_id=self.session_id,
+                client_transaction_id=get_client_transaction_id(cmd),
+                render_time=render_time,
+            )
+            if self._observers
+            else None
+        )
+        traced = self._wire_trace is not None and self._wire_trace.sample()
+        raw_response = result = None
+        try:
+            if not self.greeting:
+                raise EppCommunicatorException(
+                    "The connection to the server has not been established yet!"
+                )
+
+            raw_response = await self._execute_command(cmd, metrics)
+            parse_start = time.perf_counter()
+            result = parse_response(raw_response)
+            if metrics is not None:
+                metrics.parse_time = time.perf_counter() - parse_start
+                metrics.result_code = result.code
+
+            if result.code in CLOSING_CONNECTION_CODES:
+                logging.warning(
+                    "Server closed the connection. Code: %s - Message: %s",
+                    result.code,
+                    result.message,
+                )
+                await self.close()
+
+            return retain_raw_response(
+                result,
+                raw_response_policy or self._raw_response_policy,
+                self._raw_response_limit,
+            )
+        except EppCommunicatorException as epp_ex:
+            if metrics is not None:
+                metrics.error = epp_ex
+            raise epp_ex
+        except Exception as ex:
+            epp_ex = EppCommunicatorException(ex)
+            if metrics is not None:
+                metrics.error = epp_ex
+            raise epp_ex from ex
+        finally:
+            notify_observers(self._observers, metrics)
+            if traced:
+                self._wire_trace.trace(
+                    self.session_id,
+                    cmd,
+                    raw_response,
+                    result.code if result is not None else None,
+                    get_client_transaction_id(cmd),
+                )
+
+    async def hello(self) -> bytes:
+        """
+        Send Hello command the server.
+
+        :return: Greeting response
+        :rtype: bytes
+        """
+        logging.debug("Send Hello command to the server!")
+        greeting = await self._execute_command(HELLO_XML)
+        return greeting
+
+    async def login(
+        self, user: str, password: str, extensions: Optional[list[str]] = None
+    ) -> EppResultData:
+        """
+        Login the user to EPP server.
+
+        :param user: username
+        :param password: password
+        :param extensions: A list of supported extension URIs
+
+        :return: Result object
+        :rtype: EppResultData
+
+        :raises EppCommunicatorException: When there are any errors.
+        """
+        if extensions is None:
+            extensions = []
+
+        self._user = user
+
+        command_template = get_template(LOGIN_XML)
+        command = command_template.render(
+            user=user, password=password, extensions=extensions
+        )
+
+        result = await self.execute(command)
+        check_login_result(result)
+
+        self._logged_in = True
+        notify_session_event(self._observers, "session_opened", self.session_id)
+
+        logging.info("User %s logged in to %s:%s", self._user, self._server, self._port)
+
+        return result
+
+    async def logout(self) -> EppResultData:
+        """
+        Logout the user from EPP server.
+
+        :return: Result object
+        :rtype: EppResultData
+        """
+        logout = await self.execute(LOGOUT_XML)
+        await self.close()
+        logging.info(
+            "User %s logged out from %s:%s", self._user, self._server, self._port
+        )
+
+        return logout
+
+    async def close(self) -> None:
+        """
+        Close the connection to the server without logging out. It is safe to call this on a connection which
+        has already been closed.
+        """
+        writer = self._writer
+        self._reader = None
+        self._writer = None
+        self.greeting = None
+
+        if self._logged_in:
+            self._logged_in = False
+            notify_session_event(self._observers, "session_closed", self.session_id)
+
+        if writer is None:
+            return
+
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except (OSError, asyncio.CancelledError) as ex:
+            logging.debug("Error while closing the connection. %s", str(ex))
+
+
+# pylint: disable=too-few-public-methods
+class AsyncBaseCommand(BaseCommand):
+    """
+    Base class of the async EPP commands.
+    """
+
+    # pylint: disable=invalid-overridden-method
+    async def execute(self, xml_command: str, **kwargs: Any) -> EppResultData:
+        """This receives an EPP XML command and the arguments and send to the EPP server to be executed.
+
+        :param xml_command: XML command
+        :param kwargs: Keyword arguments
+
+        :return: Response Object
+        """
+        start = time.perf_counter()
+        cmd = self._prepare_command(xml_command, **kwargs)
+        render_time = time.perf_counter() - start
+
+        result = await self._epp_communicator.execute(cmd, render_time=render_time)
+        return result
+
+    async def _execute_change(
+        self, object_ids: tuple, xml_command: str, **kwargs: Any
+    ) -> EppResultData:
+        """Execute a command which changes objects, and then remove their cached info results. The cached results are
+        only removed once the command has been executed, so a concurrent info command cannot cache the objects as
+        they were before the change. The inherited create, update and delete methods return this coroutine.
+
+        :param object_ids: Ids of the changed objects
+        :param xml_command: XML command
+        :param kwargs: Keyword arguments
+
+        :return: Response Object
+        """
+        result = await self.execute(xml_command, **kwargs)
+        self._invalidate_info(*object_ids)
+        return result
+
+
+# pylint: disable=invalid-overridden-method,arguments-differ
+class AsyncDomain(AsyncBaseCommand, Domain):
+    """
+    Async version of :class:`pyepp.domain.Domain`.
+    """
+
+    async def check(
+        self, domain_names: list[str], client_transaction_id: Optional[str] = None
+    ) -> EppResultData:
+        """Check the availability of domain names. See :meth:`pyepp.domain.Domain.check`.
+
+        :param list domain_names: List of domain names
+        :param client_transaction_id: Client transaction id
+
+        :return: Result object
+        :rtype: EppResultData
+        """
+        cached, missing = self._get_cached_checks(domain_names, client_transaction_id)
+        if not missing:
+            return self._cached_check_result(cached)
+
+        result = await self.execute(
+            DOMAIN_CHECK_XML,
+            domain_names=missing,
+            client_transaction_id=client_transaction_id,
+        )
+
+        return self._merge_cached_checks(self._parse_check(result), cached)
+
+    async def check_many(
+        self,
+        domain_names: Iterable[str],
+        batch_size: int = DEFAULT_CHECK_BATCH_SIZE,
+    ) -> AsyncIterator[dict]:
+        """Check the availability of any number of domain names. See :meth:`pyepp.domain.Domain.check_many`. The
+        commands of a session are not pipelined by the async communicator.
+
+        :param domain_names: Domain names
+        :param int batch_size: Maximum number of domain names per check command, as allowed by the registry
+
+        :return: Check results of each batch, in the same format as the result data of ``check``
+        :rtype: AsyncIterator[dict]
+
+        :raises ErrorCodeInResultException: When a check command is not successful
+        """
+        for batch in batched(domain_names, batch_size):
+            result = await self.execute(DOMAIN_CHECK_XML, domain_names=batch)
+            yield self._check_many_result(result)
+
+    async def info(
+        self, domain_name: str, client_transaction_id: Optional[str] = None
+    ) -> EppResultData:
+        """Retrieve the details of a domain name. See :meth:`pyepp.domain.Domain.info`.
+
+        :param domain_name: Domain name
+        :param client_transaction_id: Client transaction id
+
+        :return: Result object
+        :rtype: EppResultData
+        """
+        if client_transaction_id is None:
+            cached = self._get_cached_info(domain_name)
+            if cached is not None:
+                return cached
+
+        result = await self.execute(
+            DOMAIN_INFO_XML,
+            domain_name=domain_name,
+            client_transaction_id=client_transaction_id,
+        )
+
+        result = self._parse_info(result)
+        self._cache_info(domain_name, result)
+
+        return result
+
+
+# pylint: disable=invalid-overridden-method,arguments-differ
+class AsyncContact(AsyncBaseCommand, Contact):
+    """
+    Async version of :class:`pyepp.contact.Contact`.
+    """
+
+    async def check(
+        self, contact_ids: list[str], client_transaction_id: Optional[str] = None
+    ) -> EppResultData:
+        """Check the availability of contact ids. See :meth:`pyepp.contact.Contact.check`.
+
+        :param contact_ids: List of contact ids
+        :param client_transaction_id: Client transaction id
+
+        :return: contact check result
+        :rtype: EppResultData
+        """
+        result = await self.execute(
+            CONTACT_CHECK_XML,
+            ids=contact_ids,
+            client_transaction_id=client_transaction_id,
+        )
+
+        return self._parse_check(result)
+
+    async def info(
+        self, contact_id: str, client_transaction_id: Optional[str] = None
+    ) -> EppResultData:
+        """Retrieve the details of a contact. See :meth:`pyepp.contact.Contact.info`.
+
+        :param contact_id: Contact ID
+        :param client_transaction_id: Client transaction id
+
+        :return: Contact details
+        :rtype: EppResultData
+        """
+        if client_transaction_id is None:
+            cached = self._get_cached_info(contact_id)
+            if cached is not None:
+                return cached
+
+        result = await self.execute(
+            CONTACT_INFO_XML, id=contact_id, client_transaction_id=client_transaction_id
+        )
+
+        result = self._parse_info(result)
+        self._cache_info(contact_id, result)
+
+        return result
+
+
+# pylint: disable=invalid-overridden-method,arguments-differ
+class AsyncHost(AsyncBaseCommand, Host):
+    """
+    Async version of :class:`pyepp.host.Host`.
+    """
+
+    async def check(
+        self, host_names: list[str], client_transaction_id: Optional[str] = None
+    ) -> EppResultData:
+        """Check the availability of host names. See :meth:`pyepp.host.Host.check`.
+
+        :param host_names: List of host names
+        :param client_transaction_id: Client transaction id
+
+        :return: Result object
+        :rtype: EppResultData
+        """
+        result = await self.execute(
+            HOST_CHECK_XML,
+            host_names=host_names,
+            client_transaction_id=client_transaction_id,
+        )
+
+        return self._parse_check(result)
+
+    async def info(
+        self, host_name: str, client_transaction_id: Optional[str] = None
+    ) -> EppResultData:
+        """Retrieve the details of a host. See :meth:`pyepp.host.Host.info`.
+
+        :param host_name: Host name
+        :param client_transaction_id: Client transaction id
+
+        :return: Result object
+        :rtype: EppResultData
+        """
+        if client_transaction_id is None:
+            cached = self._get_cached_info(host_name)
+            if cached is not None:
+                return cached
+
+        result = await self.execute(
+            HOST_INFO_XML,
+            host_name=host_name,
+            client_transaction_id=client_transaction_id,
+        )
+
+        result = self._parse_info(result)
+        self._cache_info(host_name, result)
+
+        return result
+
+
+# pylint: disable=invalid-overridden-method,arguments-differ
+class AsyncPoll(AsyncBaseCommand, Poll):
+    """
+    Async version of :class:`pyepp.poll.Poll`.
+    """
+
+    async def request(
+        self, client_transaction_id: Optional[str] = None
+    ) -> EppResultData:
+        """Retrieve the first queued service message. See :meth:`pyepp.poll.Poll.request`.
+
+        :param client_transaction_id: Client transaction id
+
+        :return: Result object
+        :rtype: EppResultData
+        """
+        result = await self.execute(
+            POLL_REQUEST_XML, client_transaction_id=client_transaction_id
+        )
+
+        return self._parse_request(result)
+
+    async def acknowledge(
+        self, message_id: int, client_transaction_id: Optional[str] = None
+    ) -> EppResultData:
+        """Acknowledge and dequeue a service message. See :meth:`pyepp.poll.Poll.acknowledge`.
+
+        :param message_id: Message id
+        :param client_transaction_id: Client transaction id
+
+        :return: Response object
+        :rtype: EppResultData
+        """
+        result = await self.execute(
+            POLL_ACK_XML,
+            message_id=message_id,
+            client_transaction_id=client_transaction_id,
+        )
+
+        return self._parse_acknowledge(result)
+
+    async def drain(
+        self,
+        callback: Optional[Callable[[ServiceMessageQueueData], Any]] = None,
+    ) -> AsyncIterator[ServiceMessageQueueData]:
+        """Retrieve and acknowledge all the messages of the poll queue, until the queue is empty. See
+        :meth:`pyepp.poll.Poll.drain`. The commands of a session are not pipelined by the async communicator.
+
+        .. code:: python
+
+            async for message in AsyncPoll(epp).drain():
+                print(message.message_id, message.messages)
+
+        :param callback: Called with every message before it is acknowledged. It can be a coroutine function.
+
+        :return: Messages
+        :rtype: AsyncIterator[ServiceMessageQueueData]
+
+        :raises ErrorCodeInResultException: When a poll command is not successful
+        """
+        result = await self.request()
+
+        while int(result.code) != int(EppResultCode.SUCCESS_NO_MESSAGE.value):
+            if int(result.code) != int(EppResultCode.SUCCESS_ACK_TO_DEQUEUE.value):
+                raise ErrorCodeInResultException(
+                    f"Poll request failed with code {result.code}: {result.message}"
+                )
+
+            message = result.result_data
+            if callback is not None:
+                outcome = callback(message)
+                if inspect.isawaitable(outcome):
+                    await outcome
+            yield message
+
+            self._check_acknowledge(await self.acknowledge(message.message_id))
+            result = await self.request()
@@ -2,15 +2,35 @@
 Base command
 """
 
-from typing import Any
+from typing import Any, Iterable, Iterator, Optional
 
+import functools
+import time
 import uuid
 
-from dataclasses import dataclass
-from html import escape
+from dataclasses import dataclass, fields
 
-from pyepp.epp import EppCommunicator, EppResultData
-from pyepp.command_templates import template_engine
+from pyepp.cache import TTLCache
+from pyepp.epp import (
+    DEFAULT_PIPELINE_WINDOW,
+    EppCommunicator,
+    EppResultCode,
+    EppResultData,
+    RawResponsePolicy,
+)
+from pyepp.command_templates import get_template, get_template_source
+
+
+@functools.cache
+def _field_names(data_class: type) -> tuple[str, ...]:
+    """Get the field names of a dataclass.
+
+    :param data_class: Dataclass
+
+    :return: Field names
+    :rtype: tuple[str, ...]
+    """
+    return tuple(field.name for field in fields(data_class))
 
 
 class ErrorCodeInResultException(Exception):
@@ -26,82 +46,149 @@ class BaseCommand:
     """
 
     PARAMS = ()
+    # Object type used in the cache keys
+    OBJECT_TYPE = ""
 
-    def __init__(self, epp_communicator: EppCommunicator) -> None:
+    def __init__(
+        self, epp_communicator: EppCommunicator, cache: Optional[TTLCache] = None
+    ) -> None:
         """
         :param epp_communicator: EPP Communicator object
+        :param cache: Cache of the info results. It can be shared by several command objects. The cached results are
+            shared as well and must not be modified.
         """
         self._epp_communicator = epp_communicator
+        self._cache = cache
+
+    def _get_cached_info(self, object_id: str) -> Optional[EppResultData]:
+        """Get the cached info result of an object.
+
+        :param object_id: Object id
+
+        :return: Cached result if any
+        :rtype: Optional[EppResultData]
+        """
+        if self._cache is None:
+            return None
+        return self._cache.get((self.OBJECT_TYPE, object_id))
+
+    def _cache_info(self, object_id: str, result: EppResultData) -> None:
+        """Cache a successful info result of an object.
+
+        :param object_id: Object id
+        :param result: Result object
+        """
+        if self._cache is not None and result.code == EppResultCode.SUCCESS.value:
+            self._cache.set((self.OBJECT_TYPE, object_id), result)
+
+    def _invalidate_info(self, *object_ids: str) -> None:
+        """Remove the cached info results of objects which are changed by a command.
+
+        :param object_ids: Object ids
+        """
+        if self._cache is None:
+            return
+        for object_id in object_ids:
+            self._cache.invalidate((self.OBJECT_TYPE, object_id))
+
+    def _release_tree(self, result: EppResultData) -> EppResultData:
+        """Release the parsed response of a result once its data has been parsed. The tree is only kept along with
+        the raw response, under the keep policy, whether it is the policy of the communicator or of the command.
+
+        :param result: Result object
+
+        :return: The result object
+        :rtype: EppResultData
+        """
+        result.release_tree()
+        return result
 
     def execute(self, xml_command: str, **kwargs) -> EppResultData:
         """This receives an EPP XML command and the arguments and send to the EPP server to be executed.
 
-        :param xml_command: XML command
+        :param xml_command: XML command or the name of a registered template
         :param kwargs: Keyword arguments
 
         :return: Response Object
         """
+        start = time.perf_counter()
         cmd = self._prepare_command(xml_command, **kwargs)
+        render_time = time.perf_counter() - start
 
-        result = self._epp_communicator.execute(cmd)
+        result = self._epp_communicator.execute(cmd, render_time=render_time)
         return result
 
+    def _execute_change(
+        self, object_ids: tuple, xml_command: str, **kwargs
+    ) -> EppResultData:
+        """Execute a command which changes objects, and then remove their cached info results.
+
+        :param object_ids: Ids of the changed objects
+        :param xml_command: XML command or the name of a registered template
+        :param kwargs: Keyword arguments
+
+        :return: Response Object
+        """
+        result = self.execute(xml_command, **kwargs)
+        self._invalidate_info(*object_ids)
+        return result
+
+    def execute_pipelined(
+        self,
+        commands: Iterable[tuple[str, dict]],
+        window: int = DEFAULT_PIPELINE_WINDOW,
+        raw_response_policy: Optional[RawResponsePolicy] = None,
+    ) -> Iterator[EppResultData]:
+        """Send EPP XML commands in the pipelined mode of the communicator. A client transaction id is generated for
+        every command which has not got one.
+
+        :param commands: Pairs of an XML command, or the name of a registered template, and its keyword arguments.
+            They are consumed lazily.
+        :param int window: Maximum number of commands waiting for their responses
+        :param raw_response_policy: Retention policy of the raw responses. The policy of the communicator is used if
+            it is None.
+
+        :return: Result objects in the order of the commands
+        :rtype: Iterator[EppResultData]
+        """
+        cmds = (
+            self._prepare_command(xml_command, **kwargs)
+            for xml_command, kwargs in commands
+        )
+
+        return self._epp_communicator.execute_pipelined(
+            cmds, window=window, raw_response_policy=raw_response_policy
+        )
+
     def _prepare_command(self, cmd: str, **kwargs: Any) -> str:
         """Prepare an EPP XML command for execution by setting up the arguments.
 
-        :param cmd: Command in XML format
+        :param cmd: Command in XML format or the name of a registered template
         :param kwargs: Keyword arguments
 
         :return: XML command
         """
-        if cmd.find("client_transaction_id") != -1 and not kwargs.get(
+        source = get_template_source(cmd)
+        if source.find("client_transaction_id") != -1 and not kwargs.get(
             "client_transaction_id"
         ):
             kwargs["client_transaction_id"] = str(uuid.uuid4())
 
         kwargs = {key: value for key, value in kwargs.items() if value is not None}
 
-        new_kwargs = self.__escape_dict(kwargs)
-
-        template = template_engine.from_string(cmd)
-        xml = template.render(**new_kwargs)
+        # The values are escaped once, when they are rendered, by the autoescaping of the template engine. Nested
+        # lists, dicts and data classes are passed through as they are.
+        template = get_template(source)
+        xml = template.render(**kwargs)
 
         return xml
 
-    def __escape_list(self, input_list: list) -> list:
-        result = []
-
-        for value in input_list:
-            if isinstance(value, list):
-                result.append(self.__escape_list(value))
-            elif isinstance(value, dict):
-                result.append(self.__escape_dict(value))
-            elif isinstance(value, str):
-                result.append(escape(value))
-            elif value is not None:
-                result.append(value)
-
-        return result
-
-    def __escape_dict(self, input_dict: dict) -> dict:
-        result = {}
-
-        for key, value in input_dict.items():
-            if isinstance(value, list):
-                result[key] = self.__escape_list(value)
-            elif isinstance(value, dict):
-                result[key] = self.__escape_dict(value)
-            elif isinstance(value, str):
-                result[key] = escape(value)
-            elif value is not None:
-                result[key] = value
-
-        return result
-
     def _data_to_dict(self, data: dataclass) -> dict:
-        """Convert a dataclass to a dict.
+        """Convert a dataclass to a dict of its fields. The dict is shallow, the nested dataclasses and lists are the
+        ones of the data, so nothing is copied. The templates read the attributes of the nested dataclasses.
 
         :param data: data
 
         :return: data
         """
+        return {name: getattr(data, name) for name in _field_names(type(data))}
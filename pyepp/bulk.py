@@ -0,0 +1,367 @@
+"""
+EPP Bulk Module. Runs domain commands over many items in parallel worker processes. Every worker owns a logged-in EPP
+session, so the XML rendering and parsing are spread over several cores while the number of sessions stays within the
+registry limit.
+"""
+
+import logging
+import multiprocessing
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Any, Iterable, Iterator, Optional
+
+from pyepp.domain import Domain, DomainData
+from pyepp.epp import (
+    EppCommunicator,
+    EppCommunicatorException,
+    EppResultData,
+    RawResponsePolicy,
+)
+
+# Seconds between checks of the stop flag while waiting on the queues
+_POLL_INTERVAL = 0.1
+
+
+class BulkException(EppCommunicatorException):
+    """
+    Bulk engine exception.
+    """
+
+
+@dataclass(slots=True)
+class BulkResult:
+    """Result of a single item of a bulk run."""
+
+    index: int
+    item: Any
+    result: Optional[EppResultData] = None
+    error: Optional[str] = None
+    worker: Optional[int] = None
+
+    @property
+    def is_successful(self) -> bool:
+        """Whether the command has been executed. The result code still needs to be checked."""
+        return self.error is None
+
+
+@dataclass(slots=True)
+class _WorkerExit:
+    """Sent by a worker when it stops."""
+
+    worker: int
+    error: Optional[str] = None
+
+
+def _open_session(config: dict) -> EppCommunicator:
+    """Open a session and log in.
+
+    :param config: Keyword arguments of the EPP communicator and the login credentials
+
+    :return: Logged-in EPP communicator
+    :rtype: EppCommunicator
+    """
+    config = dict(config)
+    user = config.pop("user")
+    password = config.pop("password")
+    extensions = config.pop("extensions")
+
+    epp = EppCommunicator(auto_reconnect=True, **config)
+    try:
+        epp.connect()
+        epp.login(user, password, extensions=extensions)
+    except EppCommunicatorException:
+        epp.close()
+        raise
+
+    return epp
+
+
+def _run_worker(
+    worker: int, config: dict, command: str, tasks: Any, results: Any
+) -> None:
+    """Worker process. Logs in and executes the command for every task until it receives None.
+
+    :param worker: Worker number
+    :param config: Keyword arguments of the EPP communicator and the login credentials
+    :param command: Name of the Domain method to be executed
+    :param tasks: Queue of (index, item) tasks
+    :param results: Queue of the results
+    """
+    try:
+        epp = _open_session(config)
+    except EppCommunicatorException as ex:
+        results.put(_WorkerExit(worker, str(ex)))
+        return
+
+    domain = Domain(epp)
+    method = getattr(domain, command)
+    try:
+        while (task := tasks.get()) is not None:
+            index, item = task
+            try:
+                if isinstance(item, dict):
+                    result = method(**item)
+                else:
+                    result = method(item)
+                results.put(BulkResult(index, item, result=result, worker=worker))
+            except Exception as ex:  # pylint: disable=broad-exception-caught
+                results.put(BulkResult(index, item, error=str(ex), worker=worker))
+    finally:
+        try:
+            epp.logout()
+        except EppCommunicatorException as ex:
+            logging.debug("Could not log out the session. %s", str(ex))
+        epp.close()
+        results.put(_WorkerExit(worker))
+
+
+class BulkEngine:
+    """
+    Execute domain commands over a large number of items in parallel worker processes.
+
+    Each worker process logs in its own session, so at most ``min(workers, max_sessions)`` sessions are open at the
+    same time. A worker which cannot log in, e.g. because the registry session limit has been reached, stops and the
+    other workers carry on. The items are read lazily and the results are streamed back as soon as they are available.
+
+    .. code:: python
+
+        engine = BulkEngine("epp.test.net.nz", "700", "user", "password", workers=8, max_sessions=4)
+        for bulk_result in engine.create_domains(domains):
+            print(bulk_result.index, bulk_result.item.domain_name, bulk_result.result.code)
+    """
+
+    # pylint: disable=too-many-arguments,too-many-instance-attributes
+    def __init__(
+        self,
+        server: str,
+        port: str,
+        user: str,
+        password: str,
+        client_cert: Optional[str] = None,
+        client_key: Optional[str] = None,
+        extensions: Optional[list[str]] = None,
+        workers: int = 4,
+        max_sessions: Optional[int] = None,
+        start_method: Optional[str] = None,
+        raw_response_policy: RawResponsePolicy = RawResponsePolicy.KEEP,
+    ) -> None:
+        """
+        :param server: EPP server to connect to.
+        :param port: EPP port to connect to.
+        :param user: username
+        :param password: password
+        :param client_cert: Path to client certificate
+        :param client_key: Path to client key
+        :param extensions: A list of supported extension URIs
+        :param workers: Number of worker processes
+        :param max_sessions: Maximum number of sessions allowed by the registry. No limit if it is None.
+        :param start_method: Multiprocessing start method, e.g. "spawn" or "fork". The platform default is used if it
+            is None.
+        :param raw_response_policy: Retention policy of the raw responses in the results. Dropping them saves memory
+            and the cost of sending them back from the workers.
+        """
+        if workers < 1:
+            raise ValueError("Number of workers must be at least 1.")
+        if max_sessions is not None and max_sessions < 1:
+            raise ValueError("Maximum number of sessions must be at least 1.")
+
+        self._config = {
+            "server": server,
+            "port": port,
+            "client_cert": client_cert,
+            "client_key": client_key,
+            "user": user,
+            "password": password,
+            "extensions": extensions,
+            "raw_response_policy": raw_response_policy,
+        }
+        self._workers = workers if max_sessions is None else min(workers, max_sessions)
+        self._context = multiprocessing.get_context(start_method)
+
+    @property
+    def workers(self) -> int:
+        """Number of worker processes, capped by the maximum number of sessions."""
+        return self._workers
+
+    def create_domains(
+        self, domains: Iterable[DomainData], ordered: bool = False
+    ) -> Iterator[BulkResult]:
+        """Create domains in bulk.
+
+        :param domains: Domain data of the domains to be created
+        :param ordered: Yield the results in the order of the domains
+
+        :return: Results
+        :rtype: Iterator[BulkResult]
+        """
+        return self.run("create", domains, ordered=ordered)
+
+    def renew_domains(
+        self, renewals: Iterable[dict], ordered: bool = False
+    ) -> Iterator[BulkResult]:
+        """Renew domains in bulk.
+
+        :param renewals: Keyword arguments of ``Domain.renew`` for every domain, e.g.
+            ``{"domain_name": "example.nz", "expiry_date": date(2025, 1, 1), "period": 1}``
+        :param ordered: Yield the results in the order of the renewals
+
+        :return: Results
+        :rtype: Iterator[BulkResult]
+        """
+        return self.run("renew", renewals, ordered=ordered)
+
+    def run(
+        self, command: str, items: Iterable[Any], ordered: bool = False
+    ) -> Iterator[BulkResult]:
+        """Execute a Domain command for every item. Dictionary items are passed as keyword arguments and any other
+        items as the only argument of the command.
+
+        :param command: Name of the ``Domain`` method, e.g. "create" or "renew"
+        :param items: Items. They are consumed lazily.
+        :param ordered: Yield the results in the order of the items. Otherwise, they are yielded as soon as they are
+            available.
+
+        :return: Results, with the index of their item
+        :rtype: Iterator[BulkResult]
+
+        :raises BulkException: When no worker could log in
+        """
+        if not callable(getattr(Domain, command, None)) or command.startswith("_"):
+            raise ValueError(f"Unknown domain command: {command}")
+
+        results = self._stream(command, items)
+        if ordered:
+            results = _in_order(results)
+
+        return results
+
+    def _stream(self, command: str, items: Iterable[Any]) -> Iterator[BulkResult]:
+        """Start the workers and stream back their results.
+
+        :param command: Name of the ``Domain`` method
+        :param items: Items
+
+        :return: Results in the order of completion
+        :rtype: Iterator[BulkResult]
+        """
+        tasks = self._context.Queue(maxsize=self._workers * 2)
+        results = self._context.Queue()
+        stopped = threading.Event()
+        sent = []
+
+        processes = [
+            self._context.Process(
+                target=_run_worker,
+                args=(worker, self._config, command, tasks, results),
+                daemon=True,
+            )
+            for worker in range(self._workers)
+        ]
+        for process in processes:
+            process.start()
+
+        feeder = threading.Thread(
+            target=_feed,
+            args=(items, tasks, self._workers, stopped, sent),
+            daemon=True,
+        )
+        feeder.start()
+
+        running = self._workers
+        received = 0
+        errors = []
+        try:
+            while running:
+                try:
+                    message = results.get(timeout=_POLL_INTERVAL)
+                except queue.Empty:
+                    if not any(process.is_alive() for process in processes):
+                        break
+                    continue
+
+                if isinstance(message, _WorkerExit):
+                    running -= 1
+                    if message.error:
+                        logging.warning(
+                            "Bulk worker %s could not log in. %s",
+                            message.worker,
+                            message.error,
+                        )
+                        errors.append(message.error)
+                    continue
+
+                received += 1
+                yield message
+
+            if not sent or received < sent[0]:
+                raise BulkException(
+                    f"Bulk workers stopped before all the items were processed! {'; '.join(errors)}"
+                )
+        finally:
+            stopped.set()
+            feeder.join()
+            for process in processes:
+                process.join(timeout=_POLL_INTERVAL)
+                if process.is_alive():
+                    process.terminate()
+                    process.join()
+
+
+def _feed(
+    items: Iterable[Any], tasks: Any, workers: int, stopped: threading.Event, sent: list
+) -> None:
+    """Put the items into the task queue, followed by a stop marker for every worker.
+
+    :param items: Items
+    :param tasks: Task queue
+    :param workers: Number of workers
+    :param stopped: Set when the bulk run is stopped
+    :param sent: The number of items is appended once all of them have been queued
+    """
+    count = 0
+    for index, item in enumerate(items):
+        if not _put(tasks, (index, item), stopped):
+            return
+        count += 1
+    sent.append(count)
+
+    for _ in range(workers):
+        if not _put(tasks, None, stopped):
+            return
+
+
+def _put(tasks: Any, task: Any, stopped: threading.Event) -> bool:
+    """Put a task into the queue, unless the bulk run is stopped.
+
+    :param tasks: Task queue
+    :param task: Task
+    :param stopped: Set when the bulk run is stopped
+
+    :return: False if the bulk run has been stopped
+    :rtype: bool
+    """
+    while not stopped.is_set():
+        try:
+            tasks.put(task, timeout=_POLL_INTERVAL)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _in_order(results: Iterator[BulkResult]) -> Iterator[BulkResult]:
+    """Reorder results by the index of their items.
+
+    :param results: Results in any order
+
+    :return: Results in the order of the items
+    :rtype: Iterator[BulkResult]
+    """
+    pending = {}
+    next_index = 0
+    for result in results:
+        pending[result.index] = result
+        while next_index in pending:
+            yield pending.pop(next_index)
+            next_index += 1
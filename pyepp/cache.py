@@ -0,0 +1,162 @@
+"""
+EPP Cache Module. A small thread safe cache with time-to-live and least-recently-used bounds, used to serve repeated
+queries without a round trip to the registry.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """
+    A thread safe cache whose entries expire after a time-to-live. When the cache is full, the least recently used
+    entry is evicted.
+
+    .. code:: python
+
+        info_cache = TTLCache(ttl=30, max_size=10000)
+        domain = Domain(epp, cache=info_cache)
+    """
+
+    def __init__(self, ttl: float = 30, max_size: int = 1024) -> None:
+        """
+        :param ttl: Default number of seconds an entry is kept
+        :param max_size: Maximum number of entries
+        """
+        if ttl <= 0:
+            raise ValueError("TTL must be positive.")
+        if max_size < 1:
+            raise ValueError("Maximum size must be at least 1.")
+
+        self._ttl = ttl
+        self._max_size = max_size
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a value which has not expired yet.
+
+        :param key: Key
+        :param default: Returned when there is no value for the key
+
+        :return: Cached value
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Add or replace a value.
+
+        :param key: Key
+        :param value: Value
+        :param ttl: Number of seconds the value is kept. The default TTL of the cache is used if it is None.
+        """
+        expires = time.monotonic() + (self._ttl if ttl is None else ttl)
+
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        """Remove a value. It is safe to call this for a key which is not cached.
+
+        :param key: Key
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all the values."""
+        with self._lock:
+            self._entries.clear()
+
+
+class AvailabilityCache:
+    """
+    A cache of domain check results. Available and unavailable results are kept for different times, as a domain
+    name which is available may be registered at any moment while a registered domain name rarely becomes available.
+
+    .. code:: python
+
+        availability_cache = AvailabilityCache(available_ttl=5, unavailable_ttl=60)
+        domain = Domain(epp, availability_cache=availability_cache)
+    """
+
+    def __init__(
+        self,
+        available_ttl: float = 5,
+        unavailable_ttl: float = 60,
+        max_size: int = 10000,
+    ) -> None:
+        """
+        :param available_ttl: Number of seconds an available result is kept
+        :param unavailable_ttl: Number of seconds an unavailable result is kept
+        :param max_size: Maximum number of domain names
+        """
+        if available_ttl <= 0:
+            raise ValueError("TTL must be positive.")
+
+        self._available_ttl = available_ttl
+        self._cache = TTLCache(ttl=unavailable_ttl, max_size=max_size)
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    @property
+    def hits(self) -> int:
+        """Number of domain names served from the cache."""
+        return self._cache.hits
+
+    @property
+    def misses(self) -> int:
+        """Number of domain names not found in the cache."""
+        return self._cache.misses
+
+    def get(self, domain_name: str) -> Optional[dict]:
+        """Get the check result of a domain name.
+
+        :param domain_name: Domain name
+
+        :return: Check result, in the format of ``Domain.check`` result data
+        :rtype: Optional[dict]
+        """
+        return self._cache.get(domain_name)
+
+    def set(self, domain_name: str, check: dict) -> None:
+        """Add the check result of a domain name.
+
+        :param domain_name: Domain name
+        :param check: Check result, in the format of ``Domain.check`` result data
+        """
+        ttl = self._available_ttl if check["avail"] else None
+        self._cache.set(domain_name, check, ttl=ttl)
+
+    def invalidate(self, domain_name: str) -> None:
+        """Remove the check result of a domain name.
+
+        :param domain_name: Domain name
+        """
+        self._cache.invalidate(domain_name)
+
+    def clear(self) -> None:
+        """Remove all the check results."""
+        self._cache.clear()
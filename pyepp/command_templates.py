@@ -1,8 +1,11 @@
 """
-EPP XML command templates
+EPP XML command templates. All the ``*_XML`` templates of this module are compiled once and kept in a registry keyed
+by their names, so commands only render them.
 """
 
-from jinja2 import Environment, BaseLoader
+from functools import lru_cache
+
+from jinja2 import Environment, BaseLoader, Template
 
 template_engine = Environment(
     loader=BaseLoader(), trim_blocks=True, lstrip_blocks=True, autoescape=True
@@ -243,33 +246,33 @@ DOMAIN_CREATE_XML = """<?xml version="1.0" encoding="UTF-8" standalone="no"?>
     {% if dns_sec %}
     <extension>
       <secDNS:create xmlns:secDNS="urn:ietf:params:xml:ns:secDNS-1.1">
-        {% if dns_sec is mapping %}
+        {% if dns_sec is mapping or dns_sec.key_tag is defined %}
           {% set dns_sec_list = [dns_sec] %}
         {% else %}
           {% set dns_sec_list = dns_sec %}
         {% endif %}
         {% for ds in dns_sec_list %}
         <secDNS:dsData>
-          <secDNS:keyTag>{{ ds.get('key_tag') }}</secDNS:keyTag>
-          <secDNS:alg>{{ ds.get('algorithm') }}</secDNS:alg>
-          <secDNS:digestType>{{ ds.get('digest_type') }}</secDNS:digestType>
-          <secDNS:digest>{{ ds.get('digest') }}</secDNS:digest>
-          {% if ds.get('dns_key') %}
+          <secDNS:keyTag>{{ ds.key_tag }}</secDNS:keyTag>
+          <secDNS:alg>{{ ds.algorithm }}</secDNS:alg>
+          <secDNS:digestType>{{ ds.digest_type }}</secDNS:digestType>
+          <secDNS:digest>{{ ds.digest }}</secDNS:digest>
+          {% if ds.dns_key %}
           <secDNS:keyData>
-            <secDNS:flags>{{ ds.get('dns_key').get('flag') }}</secDNS:flags>
-            <secDNS:protocol>{{ ds.get('dns_key').get('protocol') }}</secDNS:protocol>
-            <secDNS:alg>{{ ds.get('dns_key').get('algorithm') }}</secDNS:alg>
-            <secDNS:pubKey>{{ ds.get('dns_key').get('public_key') }}</secDNS:pubKey>
+            <secDNS:flags>{{ ds.dns_key.flag }}</secDNS:flags>
+            <secDNS:protocol>{{ ds.dns_key.protocol }}</secDNS:protocol>
+            <secDNS:alg>{{ ds.dns_key.algorithm }}</secDNS:alg>
+            <secDNS:pubKey>{{ ds.dns_key.public_key }}</secDNS:pubKey>
           </secDNS:keyData>
           {% endif %}
         </secDNS:dsData>
         {% endfor %}
         {% if dns_key %}
         <secDNS:keyData>
-          <secDNS:flags>{{ dns_key.dns_key.get('flag') }}</secDNS:flags>
-          <secDNS:protocol>{{ dns_key.dns_key.get('protocol') }}</secDNS:protocol>
-          <secDNS:alg>{{ dns_key.dns_key.get('algorithm') }}</secDNS:alg>
-          <secDNS:pubKey>{{ dns_key.dns_key.get('public_key') }}</secDNS:pubKey>
+          <secDNS:flags>{{ dns_key.dns_key.flag }}</secDNS:flags>
+          <secDNS:protocol>{{ dns_key.dns_key.protocol }}</secDNS:protocol>
+          <secDNS:alg>{{ dns_key.dns_key.algorithm }}</secDNS:alg>
+          <secDNS:pubKey>{{ dns_key.dns_key.public_key }}</secDNS:pubKey>
         </secDNS:keyData>
         {% endif %}
       </secDNS:create>
@@ -548,3 +551,75 @@ POLL_ACK_XML = """<?xml version="1.0" encoding="UTF-8" standalone="no"?>
     <clTRID>{{ client_transaction_id }}</clTRID>
   </command>
 </epp>"""
+
+# Template name -> template source
+_TEMPLATE_SOURCES: dict[str, str] = {}
+# Template source -> compiled template of the registered templates
+_COMPILED_TEMPLATES: dict[str, Template] = {}
+
+
+def register_template(name: str, source: str) -> Template:
+    """Compile a template and add it to the registry. It can be used for custom or extension commands.
+
+    .. code:: python
+
+        register_template("DOMAIN_SYNC_XML", DOMAIN_SYNC_XML)
+        Domain(epp).execute("DOMAIN_SYNC_XML", domain_name="example.nz")
+
+    :param name: Template name
+    :param source: Template source in XML format
+
+    :return: Compiled template
+    :rtype: Template
+    """
+    template = template_engine.from_string(source)
+
+    _TEMPLATE_SOURCES[name] = source
+    _COMPILED_TEMPLATES[source] = template
+
+    return template
+
+
+def get_template_source(template: str) -> str:
+    """Get the source of a template.
+
+    :param template: Name of a registered template or a template source
+
+    :return: Template source
+    :rtype: str
+    """
+    return _TEMPLATE_SOURCES.get(template, template)
+
+
+def get_template(template: str) -> Template:
+    """Get a compiled template. Templates which are not registered are compiled and cached on the first use.
+
+    :param template: Name of a registered template or a template source
+
+    :return: Compiled template
+    :rtype: Template
+    """
+    source = get_template_source(template)
+
+    compiled = _COMPILED_TEMPLATES.get(source)
+    if compiled is None:
+        compiled = _compile_template(source)
+
+    return compiled
+
+
+@lru_cache(maxsize=128)
+def _compile_template(source: str) -> Template:
+    """Compile a template which is not registered.
+
+    :param source: Template source
+
+    :return: Compiled template
+    :rtype: Template
+    """
+    return template_engine.from_string(source)
+
+
+for _name, _source in list(globals().items()):
+    if _name.endswith("_XML"):
+        register_template(_name, _source)
@@ -3,10 +3,9 @@ Contact Mapping Module. This module is used to manage contact objects in Registr
 """
 
 from typing import Optional
-from dataclasses import dataclass, asdict
-from bs4 import BeautifulSoup
+from dataclasses import dataclass
 
-from pyepp import helper
+from pyepp import helper, parser
 from pyepp.base_command import BaseCommand
 from pyepp.command_templates import (
     CONTACT_CHECK_XML,
@@ -17,8 +16,36 @@ from pyepp.command_templates import (
 )
 from pyepp.epp import EppResultCode, EppResultData
 
-
-@dataclass
+_CHECK_DATA = parser.xpath(
+    "/epp:epp/epp:response/epp:resData/contact:chkData/contact:cd"
+)
+_CHECK_ID = parser.xpath("contact:id")
+_CHECK_REASON = parser.xpath("contact:reason")
+
+_INFO_DATA = parser.xpath("/epp:epp/epp:response/epp:resData/contact:infData")
+_INFO_ID = parser.xpath("contact:id")
+_INFO_STATUS = parser.xpath("contact:status")
+_INFO_CREATE_DATE = parser.xpath("contact:crDate")
+_INFO_CREATE_CLIENT_ID = parser.xpath("contact:crID")
+_INFO_SPONSORING_CLIENT_ID = parser.xpath("contact:clID")
+_INFO_UPDATE_CLIENT_ID = parser.xpath("contact:upID")
+_INFO_UPDATE_DATE = parser.xpath("contact:upDate")
+_INFO_POSTAL_INFO = parser.xpath("contact:postalInfo[1]")
+_INFO_PHONE = parser.xpath("contact:voice")
+_INFO_FAX = parser.xpath("contact:fax")
+_INFO_EMAIL = parser.xpath("contact:email")
+_INFO_PASSWORD = parser.xpath("contact:authInfo/contact:pw")
+
+_POSTAL_INFO_NAME = parser.xpath("contact:name")
+_POSTAL_INFO_ORGANIZATION = parser.xpath("contact:org")
+_POSTAL_INFO_STREETS = parser.xpath("contact:addr/contact:street")
+_POSTAL_INFO_CITY = parser.xpath("contact:addr/contact:city")
+_POSTAL_INFO_PROVINCE = parser.xpath("contact:addr/contact:sp")
+_POSTAL_INFO_POSTAL_CODE = parser.xpath("contact:addr/contact:pc")
+_POSTAL_INFO_COUNTRY_CODE = parser.xpath("contact:addr/contact:cc")
+
+
+@dataclass(slots=True)
 class AddressData:
     """Contact address data class."""
 
@@ -31,7 +58,7 @@ class AddressData:
     postal_code: Optional[str] = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class PostalInfoData:
     """Contact postal info data class."""
 
@@ -40,7 +67,7 @@ class PostalInfoData:
     address: Optional[AddressData] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ContactData:
     """Contact data class. Contains the properties of the contacts associated with the domain name."""
 
@@ -73,6 +100,8 @@ class Contact(BaseCommand):
       payment of fees related to the domain name and will monitor period activity, account balances, and account status.
     """
 
+    OBJECT_TYPE = "contact"
+
     def _data_to_dict(self, data: ContactData) -> dict:
         """Convert a contact dataclass to a dictionary.
 
@@ -81,14 +110,14 @@ class Contact(BaseCommand):
         :return: Contact details
         :rtype: dict
         """
-        data_dict = asdict(data)
-        postal_info = data_dict.pop("postal_info", {})
-        address = postal_info.pop("address", {}) if postal_info is not None else {}
+        data_dict = super()._data_to_dict(data)
+        postal_info = data_dict.pop("postal_info", None)
 
-        if address:
-            data_dict.update(address)
-        if postal_info:
-            data_dict.update(postal_info)
+        if postal_info is not None:
+            if postal_info.address is not None:
+                data_dict.update(super()._data_to_dict(postal_info.address))
+            data_dict["name"] = postal_info.name
+            data_dict["organization"] = postal_info.organization
 
         return data_dict
 
@@ -111,25 +140,34 @@ class Contact(BaseCommand):
             client_transaction_id=client_transaction_id,
         )
 
-        if result.code != int(EppResultCode.SUCCESS.value):
-            return result
+        return self._parse_check(result)
 
-        raw_response = BeautifulSoup(result.raw_response, "xml")
-        contacts_check_data = raw_response.find_all("cd")
+    def _parse_check(self, result: EppResultData) -> EppResultData:
+        """Parse the contact check response into the result data.
+
+        :param result: Result object
+
+        :return: Result object
+        :rtype: EppResultData
+        """
+        if result.code != int(EppResultCode.SUCCESS.value):
+            return self._release_tree(result)
 
         result_data = {}
-        for contact_cd in contacts_check_data:
-            contact = contact_cd.find("id")
+        for contact_cd in _CHECK_DATA(parser.get_tree(result)):
+            contact = parser.find(_CHECK_ID, contact_cd)
             available = contact.get("avail") in ("true", "1")
-            reason = contact_cd.find("reason").text if not available else None
-            result_data[contact.text] = {
+            reason = (
+                parser.find_text(_CHECK_REASON, contact_cd) if not available else None
+            )
+            result_data[parser.text(contact)] = {
                 "avail": available,
                 "reason": reason,
             }
 
         result.result_data = result_data
 
-        return result
+        return self._release_tree(result)
 
     def info(
         self, contact_id: str, client_transaction_id: Optional[str] = None
@@ -147,83 +185,82 @@ class Contact(BaseCommand):
         :return: Contact details
         :rtype: EppResultData
         """
+        if client_transaction_id is None:
+            cached = self._get_cached_info(contact_id)
+            if cached is not None:
+                return cached
+
         result = self.execute(
             CONTACT_INFO_XML, id=contact_id, client_transaction_id=client_transaction_id
         )
 
+        result = self._parse_info(result)
+        self._cache_info(contact_id, result)
+
+        return result
+
+    def _parse_info(self, result: EppResultData) -> EppResultData:
+        """Parse the contact info response into the result data.
+
+        :param result: Result object
+
+        :return: Result object
+        :rtype: EppResultData
+        """
         if result.code != int(EppResultCode.SUCCESS.value):
-            return result
+            return self._release_tree(result)
 
-        raw_response = BeautifulSoup(result.raw_response, "xml")
+        info_data = parser.find(_INFO_DATA, parser.get_tree(result))
+        postal_info = parser.find(_INFO_POSTAL_INFO, info_data)
+        streets = [parser.text(street) for street in _POSTAL_INFO_STREETS(postal_info)]
 
         result_data = {
-            "id": raw_response.find("id").text,
-            "status": [status.text for status in raw_response.find_all("status")],
-            "create_date": raw_response.find("crDate").text,
-            "creat_client_id": raw_response.find("crID").text,
-            "sponsoring_client_id": raw_response.find("clID").text,
-            "update_client_id": (
-                raw_response.find("upID").text if raw_response.find("upID") else None
-            ),
-            "update_date": (
-                raw_response.find("upDate").text
-                if raw_response.find("upDate")
-                else None
+            "id": parser.find_text(_INFO_ID, info_data),
+            "status": [parser.text(status) for status in _INFO_STATUS(info_data)],
+            "create_date": parser.find_text(_INFO_CREATE_DATE, info_data),
+            "creat_client_id": parser.find_text(_INFO_CREATE_CLIENT_ID, info_data),
+            "sponsoring_client_id": parser.find_text(
+                _INFO_SPONSORING_CLIENT_ID, info_data
             ),
+            "update_client_id": parser.find_text(_INFO_UPDATE_CLIENT_ID, info_data),
+            "update_date": parser.find_text(_INFO_UPDATE_DATE, info_data),
             "postal_info": PostalInfoData(
                 **{
-                    "name": raw_response.find("name").text,
-                    "organization": (
-                        raw_response.find("org").text
-                        if raw_response.find("org")
-                        else None
+                    "name": parser.find_text(_POSTAL_INFO_NAME, postal_info),
+                    "organization": parser.find_text(
+                        _POSTAL_INFO_ORGANIZATION, postal_info
                     ),
                     "address": AddressData(
                         **{
-                            "street_1": (
-                                raw_response.find_all("street")[0].text
-                                if len(raw_response.find_all("street")) >= 1
-                                else None
-                            ),
-                            "street_2": (
-                                raw_response.find_all("street")[1].text
-                                if len(raw_response.find_all("street")) >= 2
-                                else None
-                            ),
-                            "street_3": (
-                                raw_response.find_all("street")[2].text
-                                if len(raw_response.find_all("street")) >= 3
-                                else None
+                            "street_1": streets[0] if len(streets) >= 1 else None,
+                            "street_2": streets[1] if len(streets) >= 2 else None,
+                            "street_3": streets[2] if len(streets) >= 3 else None,
+                            "city": parser.find_text(_POSTAL_INFO_CITY, postal_info),
+                            "province": parser.find_text(
+                                _POSTAL_INFO_PROVINCE, postal_info
                             ),
-                            "city": raw_response.find("city").text,
-                            "province": (
-                                raw_response.find("sp").text
-                                if raw_response.find("sp")
-                                else None
+                            "postal_code": parser.find_text(
+                                _POSTAL_INFO_POSTAL_CODE, postal_info
                             ),
-                            "postal_code": (
-                                raw_response.find("pc").text
-                                if raw_response.find("pc")
-                                else None
+                            "country_code": parser.find_text(
+                                _POSTAL_INFO_COUNTRY_CODE, postal_info
                             ),
-                            "country_code": raw_response.find("cc").text,
                         }
                     ),
                 }
             ),
-            "phone": (
-                raw_response.find("voice").text if raw_response.find("voice") else None
-            ),
-            "fax": raw_response.find("fax").text if raw_response.find("fax") else None,
-            "email": raw_response.find("email").text,
+            "phone": parser.find_text(_INFO_PHONE, info_data),
+            "fax": parser.find_text(_INFO_FAX, info_data),
+            "email": parser.find_text(_INFO_EMAIL, info_data),
         }
 
-        if raw_response.find("pw"):
-            result_data["password"] = raw_response.find("pw").text
+        password = parser.find_text(_INFO_PASSWORD, info_data)
+        if password is not None:
+            result_data["password"] = password
 
         result.result_data = ContactData(**result_data)
 
-        return result
+        return self._release_tree(result)
 
     def create(
         self, contact: ContactData, client_transaction_id: Optional[str] = None
@@ -258,7 +295,8 @@ class Contact(BaseCommand):
 
         :return: Result object
         """
-        result = self.execute(
+        result = self._execute_change(
+            (contact_id,),
             CONTACT_DELETE_XML,
             id=contact_id,
             client_transaction_id=client_transaction_id,
@@ -296,6 +334,6 @@ class Contact(BaseCommand):
         )
         params["client_transaction_id"] = client_transaction_id
 
-        result = self.execute(CONTACT_UPDATE_XML, **params)
+        result = self._execute_change((contact.id,), CONTACT_UPDATE_XML, **params)
 
         return result
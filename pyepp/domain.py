@@ -2,15 +2,16 @@
 Domain Mapping Module.
 """
 
-from dataclasses import dataclass, asdict
+from contextlib import closing
+from dataclasses import dataclass, fields
 from enum import Enum
-from typing import Optional
+from typing import Any, Callable, Iterable, Iterator, Optional
 from datetime import date, datetime
 
-from bs4 import BeautifulSoup
-
-from pyepp.epp import EppResultData
-from pyepp.base_command import BaseCommand
+from pyepp import parser
+from pyepp.epp import EppCommunicator, EppResultData
+from pyepp.base_command import BaseCommand, ErrorCodeInResultException
+from pyepp.cache import AvailabilityCache, TTLCache
 from pyepp.command_templates import (
     DOMAIN_CHECK_XML,
     DOMAIN_INFO_XML,
@@ -25,6 +26,42 @@ from pyepp.command_templates import (
 from pyepp import helper
 from pyepp.epp import EppResultCode
 
+# Number of domain names sent in a single check command by ``Domain.check_many``
+DEFAULT_CHECK_BATCH_SIZE = 10
+
+_CHECK_DATA = parser.xpath("/epp:epp/epp:response/epp:resData/domain:chkData/domain:cd")
+_CHECK_NAME = parser.xpath("domain:name")
+_CHECK_REASON = parser.xpath("domain:reason")
+
+_INFO_DATA = parser.xpath("/epp:epp/epp:response/epp:resData/domain:infData")
+_INFO_NAME = parser.xpath("domain:name")
+_INFO_SPONSORING_CLIENT_ID = parser.xpath("domain:clID")
+_INFO_STATUS = parser.xpath("domain:status/@s")
+_INFO_NS = parser.xpath("domain:ns")
+_INFO_HOSTS = parser.xpath("domain:ns/domain:hostObj")
+_INFO_REGISTRANT = parser.xpath("domain:registrant")
+_INFO_ADMIN = parser.xpath("domain:contact[@type='admin']")
+_INFO_TECH = parser.xpath("domain:contact[@type='tech']")
+_INFO_BILLING = parser.xpath("domain:contact[@type='billing']")
+_INFO_CREATE_DATE = parser.xpath("domain:crDate")
+_INFO_CREATE_CLIENT_ID = parser.xpath("domain:crID")
+_INFO_EXPIRY_DATE = parser.xpath("domain:exDate")
+_INFO_UPDATE_CLIENT_ID = parser.xpath("domain:upID")
+_INFO_UPDATE_DATE = parser.xpath("domain:upDate")
+_INFO_TRANSFER_DATE = parser.xpath("domain:trDate")
+_INFO_PASSWORD = parser.xpath("domain:authInfo/domain:pw")
+# Relative to the domain info data node, which is in the resData sibling of the extension
+_INFO_DS_DATA = parser.xpath("../../epp:extension/secDNS:infData/secDNS:dsData")
+
+_DS_KEY_TAG = parser.xpath("secDNS:keyTag")
+_DS_ALGORITHM = parser.xpath("secDNS:alg")
+_DS_DIGEST_TYPE = parser.xpath("secDNS:digestType")
+_DS_DIGEST = parser.xpath("secDNS:digest")
+_DS_KEY_DATA = parser.xpath("secDNS:keyData")
+_KEY_FLAGS = parser.xpath("secDNS:flags")
+_KEY_PROTOCOL = parser.xpath("secDNS:protocol")
+_KEY_PUBLIC_KEY = parser.xpath("secDNS:pubKey")
+
 
 class DNSSECAlgorithm(Enum):
     """DNSSEC algorithms enumeration."""
@@ -60,7 +97,7 @@ class DNSKeyFlagEnum(Enum):
     FLAG_257 = 257
 
 
-@dataclass
+@dataclass(slots=True)
 class DSRecordKeyData:
     """DNSSEC Key data enumeration."""
 
@@ -70,7 +107,7 @@ class DSRecordKeyData:
     protocol: str = 3
 
 
-@dataclass
+@dataclass(slots=True)
 class DSRecordData:
     """DNSSEC dataclass."""
 
@@ -81,7 +118,7 @@ class DSRecordData:
     dns_key: Optional[DSRecordKeyData] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class DomainData:
     """Domain name dataclass."""
 
@@ -105,22 +142,156 @@ class DomainData:
     dns_sec: Optional[list[DSRecordData]] = None
 
 
-class Domain(BaseCommand):
+def _parse_dns_sec(info_data: Any) -> Optional[list[DSRecordData]]:
+    """Parse the DNSSEC records of a domain info response.
+
+    :param info_data: Domain info data node
+
+    :return: DNSSEC records if any
+    :rtype: Optional[list[DSRecordData]]
     """
-    Epp domain object class is used to create and manage domain names in Registry.
+    dns_sec = []
+    for ds_data in _INFO_DS_DATA(info_data):
+        key_data = parser.find(_DS_KEY_DATA, ds_data)
+        dns_sec.append(
+            DSRecordData(
+                **{
+                    "key_tag": parser.find_text(_DS_KEY_TAG, ds_data),
+                    "algorithm": parser.find_text(_DS_ALGORITHM, ds_data),
+                    "digest_type": parser.find_text(_DS_DIGEST_TYPE, ds_data),
+                    "digest": parser.find_text(_DS_DIGEST, ds_data),
+                    "dns_key": (
+                        {
+                            "flag": parser.find_text(_KEY_FLAGS, key_data),
+                            "protocol": parser.find_text(_KEY_PROTOCOL, key_data),
+                            "algorithm": parser.find_text(_DS_ALGORITHM, ds_data),
+                            "public_key": parser.find_text(_KEY_PUBLIC_KEY, key_data),
+                        }
+                        if key_data is not None
+                        else None
+                    ),
+                }
+            )
+        )
+
+    return dns_sec or None
+
+
+# Parsers of the domain data fields out of the domain info data node
+_INFO_FIELD_PARSERS: dict[str, Callable[[Any], Any]] = {
+    "domain_name": lambda info_data: parser.find_text(_INFO_NAME, info_data),
+    "period": lambda info_data: None,
+    "registrant": lambda info_data: parser.find_text(_INFO_REGISTRANT, info_data),
+    "admin": lambda info_data: parser.find_text(_INFO_ADMIN, info_data),
+    "tech": lambda info_data: parser.find_text(_INFO_TECH, info_data),
+    "sponsoring_client_id": lambda info_data: parser.find_text(
+        _INFO_SPONSORING_CLIENT_ID, info_data
+    ),
+    "billing": lambda info_data: [
+        parser.text(billing) for billing in _INFO_BILLING(info_data)
+    ]
+    or None,
+    "status": _INFO_STATUS,
+    "host": lambda info_data: (
+        [parser.text(host) for host in _INFO_HOSTS(info_data)]
+        if parser.find(_INFO_NS, info_data) is not None
+        else None
+    ),
+    "create_date": lambda info_data: parser.find_text(_INFO_CREATE_DATE, info_data),
+    "creat_client_id": lambda info_data: parser.find_text(
+        _INFO_CREATE_CLIENT_ID, info_data
+    ),
+    "update_client_id": lambda info_data: parser.find_text(
+        _INFO_UPDATE_CLIENT_ID, info_data
+    ),
+    "update_date": lambda info_data: parser.find_text(_INFO_UPDATE_DATE, info_data),
+    "expiry_date": lambda info_data: parser.find_text(_INFO_EXPIRY_DATE, info_data),
+    "transfer_date": lambda info_data: parser.find_text(
+        _INFO_TRANSFER_DATE, info_data
+    ),
+    "password": lambda info_data: parser.find_text(_INFO_PASSWORD, info_data),
+    "dns_sec": _parse_dns_sec,
+}
+
+
+class LazyDomainData(DomainData):
+    """
+    Domain data parsed from a domain info response on demand. Every field is parsed on its first access and then kept,
+    so reading a few fields, e.g. the expiry date, skips parsing the rest of the response. It can be used wherever a
+    ``DomainData`` is expected, including ``asdict`` and ``EppResultData.to_dict``. Copies and pickles are plain
+    ``DomainData`` objects.
+
+    The info data node keeps the whole parsed response alive until ``load`` is called.
     """
 
-    def _data_to_dict(self, data: DomainData) -> dict:
-        """Convert a domain dataclass to a dictionary.
+    __slots__ = ("_info_data",)
 
-        :param DomainData data: Domain name details
+    @classmethod
+    def from_info_data(cls, info_data: Any) -> "LazyDomainData":
+        """Create the domain data of a domain info data node.
 
-        :return: Domain name details
-        :rtype: dict
+        :param info_data: Domain info data node
+
+        :return: Domain data
+        :rtype: LazyDomainData
         """
-        data_dict = asdict(data)
+        domain_data = cls.__new__(cls)
+        domain_data._info_data = info_data  # pylint: disable=attribute-defined-outside-init
+        return domain_data
+
+    def load(self) -> None:
+        """Parse all the fields which have not been parsed yet and release the info data node."""
+        for name in _INFO_FIELD_PARSERS:
+            getattr(self, name)
+        self._info_data = None  # pylint: disable=attribute-defined-outside-init
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for the fields which have not been set yet
+        field_parser = _INFO_FIELD_PARSERS.get(name)
+        if field_parser is None:
+            raise AttributeError(name)
+
+        value = field_parser(self._info_data)
+        setattr(self, name, value)
+        return value
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, DomainData):
+            return NotImplemented
+        return all(
+            getattr(self, data_field.name) == getattr(other, data_field.name)
+            for data_field in fields(DomainData)
+        )
+
+    __hash__ = None
+
+    def __reduce__(self) -> tuple:
+        return DomainData, tuple(
+            getattr(self, data_field.name) for data_field in fields(DomainData)
+        )
 
-        return data_dict
+
+class Domain(BaseCommand):
+    """
+    Epp domain object class is used to create and manage domain names in Registry.
+    """
+
+    OBJECT_TYPE = "domain"
+
+    def __init__(
+        self,
+        epp_communicator: EppCommunicator,
+        cache: Optional[TTLCache] = None,
+        availability_cache: Optional[AvailabilityCache] = None,
+    ) -> None:
+        """
+        :param epp_communicator: EPP Communicator object
+        :param cache: Cache of the info results
+        :param availability_cache: Cache of the check results. Only the domain names which are not cached are sent
+            to the server.
+        """
+        super().__init__(epp_communicator, cache=cache)
+        self._availability_cache = availability_cache
 
     # pylint: disable=R0801
     def check(
@@ -129,37 +300,189 @@ class Domain(BaseCommand):
         """A successful Domain Check request determines whether a domain name is available for use and whether a domain
         name registration can be successfully created in the Registry.
 
+        When there is an availability cache, only the domain names which are not cached are sent to the server. If
+        all of them are cached, no command is sent and the result has no raw response.
+
         :param list domain_names: List of domain names
         :param client_transaction_id: Client transaction id
 
         :return: Result object
         :rtype: EppResultData
         """
+        cached, missing = self._get_cached_checks(domain_names, client_transaction_id)
+        if not missing:
+            return self._cached_check_result(cached)
+
         result = self.execute(
             DOMAIN_CHECK_XML,
-            domain_names=domain_names,
+            domain_names=missing,
             client_transaction_id=client_transaction_id,
         )
 
+        return self._merge_cached_checks(self._parse_check(result), cached)
+
+    def _get_cached_checks(
+        self, domain_names: list[str], client_transaction_id: Optional[str] = None
+    ) -> tuple[dict, list[str]]:
+        """Split domain names into the ones with a cached check result and the ones to be checked by the server.
+
+        :param domain_names: List of domain names
+        :param client_transaction_id: Client transaction id. The cache is not used if it is given.
+
+        :return: Cached check results and the domain names to be checked
+        :rtype: tuple[dict, list[str]]
+        """
+        if self._availability_cache is None or client_transaction_id is not None:
+            return {}, domain_names
+
+        cached = {}
+        missing = []
+        for domain_name in domain_names:
+            check = self._availability_cache.get(domain_name)
+            if check is None:
+                missing.append(domain_name)
+            else:
+                cached[domain_name] = check
+
+        return cached, missing
+
+    def _cached_check_result(self, cached: dict) -> EppResultData:
+        """Create the result of a check served from the cache only.
+
+        :param cached: Cached check results
+
+        :return: Result object
+        :rtype: EppResultData
+        """
+        return EppResultData(
+            code=EppResultCode.SUCCESS.value,
+            message="Command completed successfully",
+            raw_response=b"",
+            result_data=cached,
+        )
+
+    def _merge_cached_checks(self, result: EppResultData, cached: dict) -> EppResultData:
+        """Cache the check results of the server and add the cached ones.
+
+        :param result: Parsed check result
+        :param cached: Cached check results
+
+        :return: Result object
+        :rtype: EppResultData
+        """
         if int(result.code) != int(EppResultCode.SUCCESS.value):
             return result
 
-        raw_response = BeautifulSoup(result.raw_response, "xml")
-        domains_check_data = raw_response.find_all("cd")
+        self._cache_checks(result.result_data)
+        result.result_data = {**cached, **result.result_data}
+
+        return result
+
+    def _cache_checks(self, checks: dict) -> None:
+        """Add check results to the availability cache.
+
+        :param checks: Check results
+        """
+        if self._availability_cache is None:
+            return
+        for domain_name, check in checks.items():
+            self._availability_cache.set(domain_name, check)
+
+    def _invalidate_info(self, *object_ids: str) -> None:
+        super()._invalidate_info(*object_ids)
+        if self._availability_cache is not None:
+            for object_id in object_ids:
+                self._availability_cache.invalidate(object_id)
+
+    def check_many(
+        self,
+        domain_names: Iterable[str],
+        batch_size: int = DEFAULT_CHECK_BATCH_SIZE,
+        pipeline_window: int = 1,
+    ) -> Iterator[dict]:
+        """Check the availability of any number of domain names. The names are read lazily from the iterable and sent
+        in check commands of at most ``batch_size`` names, so only a few batches are kept in memory at a time.
+
+        .. code:: python
+
+            for availability in Domain(epp).check_many(candidate_names, batch_size=20, pipeline_window=5):
+                for domain_name, check in availability.items():
+                    print(domain_name, check["avail"], check["reason"])
+
+        :param domain_names: Domain names
+        :param int batch_size: Maximum number of domain names per check command, as allowed by the registry
+        :param int pipeline_window: Number of check commands sent before waiting for their responses. The commands
+            are not pipelined by default, so they are executed one by one and retried on a lost connection like any
+            other check command.
+
+        :return: Check results of each batch, in the same format as the result data of ``check``
+        :rtype: Iterator[dict]
+
+        :raises ErrorCodeInResultException: When a check command is not successful
+        """
+        batches = helper.batched(domain_names, batch_size)
+        if pipeline_window > 1:
+            results = self.execute_pipelined(
+                ((DOMAIN_CHECK_XML, {"domain_names": batch}) for batch in batches),
+                window=pipeline_window,
+            )
+        else:
+            results = (
+                self.execute(DOMAIN_CHECK_XML, domain_names=batch) for batch in batches
+            )
+
+        # Closing the results when a batch fails or the consumer stops early closes a pipeline with commands in
+        # flight, whose responses would otherwise be read by the next command.
+        with closing(results):
+            for result in results:
+                yield self._check_many_result(result)
+
+    def _check_many_result(self, result: EppResultData) -> dict:
+        """Parse and cache the result of a check command of ``check_many``.
+
+        :param result: Result object
+
+        :return: Check results
+        :rtype: dict
+
+        :raises ErrorCodeInResultException: When the check command is not successful
+        """
+        if int(result.code) != int(EppResultCode.SUCCESS.value):
+            raise ErrorCodeInResultException(
+                f"Domain check failed with code {result.code}: {result.message}"
+            )
+
+        result_data = self._parse_check(result).result_data
+        self._cache_checks(result_data)
+
+        return result_data
+
+    def _parse_check(self, result: EppResultData) -> EppResultData:
+        """Parse the domain check response into the result data.
+
+        :param result: Result object
+
+        :return: Result object
+        :rtype: EppResultData
+        """
+        if int(result.code) != int(EppResultCode.SUCCESS.value):
+            return self._release_tree(result)
 
         result_data = {}
-        for domain_cd in domains_check_data:
-            domain = domain_cd.find("name")
+        for domain_cd in _CHECK_DATA(parser.get_tree(result)):
+            domain = parser.find(_CHECK_NAME, domain_cd)
             available = domain.get("avail") in ("true", "1")
-            reason = domain_cd.find("reason").text if not available else None
-            result_data[domain.text] = {
+            reason = (
+                parser.find_text(_CHECK_REASON, domain_cd) if not available else None
+            )
+            result_data[parser.text(domain)] = {
                 "avail": available,
                 "reason": reason,
             }
 
         result.result_data = result_data
 
-        return result
+        return self._release_tree(result)
 
     def info(
         self, domain_name: str, client_transaction_id: Optional[str] = None
@@ -172,106 +495,42 @@ class Domain(BaseCommand):
         :return: Result object
         :rtype: EppResultData
         """
+        if client_transaction_id is None:
+            cached = self._get_cached_info(domain_name)
+            if cached is not None:
+                return cached
+
         result = self.execute(
             DOMAIN_INFO_XML,
             domain_name=domain_name,
             client_transaction_id=client_transaction_id,
         )
 
-        if int(result.code) != int(EppResultCode.SUCCESS.value):
-            return result
+        result = self._parse_info(result)
+        self._cache_info(domain_name, result)
 
-        raw_response = BeautifulSoup(result.raw_response, "xml")
-
-        result_data = {
-            "domain_name": raw_response.find("name").text,
-            "sponsoring_client_id": raw_response.find("clID").text,
-            "status": [status.get("s") for status in raw_response.find_all("status")],
-            "host": (
-                [host.text for host in raw_response.find_all("hostObj")]
-                if raw_response.find("ns")
-                else None
-            ),
-            "registrant": raw_response.find("registrant").text,
-            "admin": (
-                raw_response.find("contact", {"type": "admin"}).text
-                if raw_response.find("contact", {"type": "admin"})
-                else None
-            ),
-            "tech": (
-                raw_response.find("contact", {"type": "tech"}).text
-                if raw_response.find("contact", {"type": "tech"})
-                else None
-            ),
-            "billing": (
-                [
-                    billing.text
-                    for billing in raw_response.find_all("contact", {"type": "billing"})
-                ]
-                if raw_response.find("contact", {"type": "billing"})
-                else None
-            ),
-            "create_date": (
-                raw_response.find("crDate").text
-                if raw_response.find("crDate")
-                else None
-            ),
-            "creat_client_id": (
-                raw_response.find("crID").text if raw_response.find("crID") else None
-            ),
-            "expiry_date": (
-                raw_response.find("exDate").text
-                if raw_response.find("exDate")
-                else None
-            ),
-            "update_client_id": (
-                raw_response.find("upID").text if raw_response.find("upID") else None
-            ),
-            "update_date": (
-                raw_response.find("upDate").text
-                if raw_response.find("upDate")
-                else None
-            ),
-            "transfer_date": (
-                raw_response.find("trDate").text
-                if raw_response.find("trDate")
-                else None
-            ),
-            "password": (
-                raw_response.find("pw").text if raw_response.find("pw") else None
-            ),
-            "period": None,
-            "dns_sec": None,
-        }
-
-        dns_sec = []
-        all_ds_data = raw_response.find_all("dsData")
-        for ds_data in all_ds_data:
-            dns_sec.append(
-                DSRecordData(
-                    **{
-                        "key_tag": ds_data.find("keyTag").text,
-                        "algorithm": ds_data.find("alg").text,
-                        "digest_type": ds_data.find("digestType").text,
-                        "digest": ds_data.find("digest").text,
-                        "dns_key": (
-                            {
-                                "flag": ds_data.find("flags").text,
-                                "protocol": ds_data.find("protocol").text,
-                                "algorithm": ds_data.find("alg").text,
-                                "public_key": ds_data.find("pubKey").text,
-                            }
-                            if ds_data.find("keyData")
-                            else None
-                        ),
-                    }
-                )
-            )
+        return result
 
-        if dns_sec:
-            result_data["dns_sec"] = dns_sec
+    def _parse_info(self, result: EppResultData) -> EppResultData:
+        """Parse the domain info response into the result data.
 
-        result.result_data = DomainData(**result_data)
+        :param result: Result object
+
+        :return: Result object. The result data is None if the response has no domain info data.
+        :rtype: EppResultData
+        """
+        if int(result.code) != int(EppResultCode.SUCCESS.value):
+            return self._release_tree(result)
+
+        info_data = parser.find(_INFO_DATA, parser.get_tree(result))
+        if info_data is None:
+            return self._release_tree(result)
+
+        result.result_data = LazyDomainData.from_info_data(info_data)
+        self._release_tree(result)
+        if result.xml_tree is None:
+            # The info data node would keep the released tree alive.
+            result.result_data.load()
 
         return result
 
@@ -293,7 +552,9 @@ class Domain(BaseCommand):
         if not params.get('password'):
             params['password'] = helper.generate_password(16)
 
-        result = self.execute(DOMAIN_CREATE_XML, **params)
+        result = self._execute_change(
+            (domain.domain_name,), DOMAIN_CREATE_XML, **params
+        )
 
         return result
 
@@ -308,7 +569,8 @@ class Domain(BaseCommand):
         :return: Result object
         :rtype: EppResultData
         """
-        result = self.execute(
+        result = self._execute_change(
+            (domain_name,),
             DOMAIN_DELETE_XML,
             domain_name=domain_name,
             client_transaction_id=client_transaction_id,
@@ -333,7 +595,8 @@ class Domain(BaseCommand):
         :return: Result object
         :rtype: EppResultData
         """
-        result = self.execute(
+        result = self._execute_change(
+            (domain_name,),
             DOMAIN_RENEW_XML,
             domain_name=domain_name,
             expiry_date=expiry_date.strftime("%Y-%m-%d"),
@@ -361,7 +624,8 @@ class Domain(BaseCommand):
         :return: Result object
         :rtype: EppResultData
         """
-        result = self.execute(
+        result = self._execute_change(
+            (domain_name,),
             TRANSFER_REQUEST_XML,
             domain_name=domain_name,
             password=password,
@@ -421,7 +685,8 @@ class Domain(BaseCommand):
         )
         change = bool(registrant or password)
 
-        result = self.execute(
+        result = self._execute_change(
+            (domain_name,),
             DOMAIN_UPDATE_XML,
             add=add,
             remove=remove,
@@ -455,7 +720,8 @@ class Domain(BaseCommand):
         :return: Result object
         :rtype: EppResultData
         """
-        result = self.execute(
+        result = self._execute_change(
+            (domain_name,),
             DOMAIN_RESTORE_XML,
             domain_name=domain_name,
             client_transaction_id=client_transaction_id,
@@ -497,7 +763,8 @@ class Domain(BaseCommand):
         :return: Result object
         :rtype: EppResultData
         """
-        result = self.execute(
+        result = self._execute_change(
+            (domain_name,),
             DOMAIN_RESTORE_REPORT_XML,
             domain_name=domain_name,
             pre_data=pre_data,
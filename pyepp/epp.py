@@ -2,22 +2,52 @@
 EPP Communicator Module
 """
 
+# pylint: disable=too-many-lines
+
+import re
 import ssl
 import socket
 import struct
 import logging
 import sys
-from dataclasses import dataclass, asdict
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import closing
+from dataclasses import dataclass, asdict, field, fields, replace
 from enum import Enum
-from typing import Optional, Any
-
-from bs4 import BeautifulSoup
-
-from pyepp.command_templates import LOGOUT_XML, LOGIN_XML, HELLO_XML, template_engine
+from typing import Iterable, Iterator, Optional, Any, Union
+from xml.sax.saxutils import unescape
+
+from pyepp import helper, parser
+from pyepp.instrumentation import (
+    CommandMetrics,
+    CommandObserver,
+    WireTrace,
+    notify_observers,
+    notify_session_event,
+)
+from pyepp.ratelimit import OTHER_COMMANDS, RateLimiter
+from pyepp.command_templates import LOGOUT_XML, LOGIN_XML, HELLO_XML, get_template
 
 LENGTH_FIELD_SIZE = 4
 CRLF_SIZE = 2
 
+# Largest frame accepted from the server, in bytes. It protects against allocating huge buffers for a bad length field.
+DEFAULT_MAX_FRAME_SIZE = 10 * 1024 * 1024
+
+# Number of commands which are sent ahead of their responses in the pipelined mode by default.
+DEFAULT_PIPELINE_WINDOW = 10
+
+# Number of bytes of the raw response kept by the truncate retention policy by default
+DEFAULT_RAW_RESPONSE_LIMIT = 1024
+
+# Commands which are safe to send again after the connection has been lost
+IDEMPOTENT_COMMANDS = ("hello", "check", "info", "poll")
+
+_COMMAND_CLIENT_TRANSACTION_ID = re.compile(r"<clTRID>\s*(.*?)\s*</clTRID>", re.DOTALL)
+
 
 class EppCommunicatorException(Exception):
     """
@@ -25,6 +55,12 @@ class EppCommunicatorException(Exception):
     """
 
 
+class EppSessionLimitExceededException(EppCommunicatorException):
+    """
+    The server refused the login because the registrar has reached its session limit.
+    """
+
+
 class EppResultCode(Enum):
     """
     EPP result codes enumeration.
@@ -66,6 +102,26 @@ class EppResultCode(Enum):
     SESSION_LIMIT_EXCEEDED_CLOSING_CONNECTION = 2502
 
 
+class RawResponsePolicy(Enum):
+    """
+    Retention policies of the raw response kept in the result objects. The object mappings use the parsed response,
+    so they work with any policy.
+    """
+
+    KEEP = "keep"
+    DROP = "drop"
+    TRUNCATE = "truncate"
+    KEEP_ON_ERROR = "keep_on_error"
+
+
+# The server closes the connection after responding with any of these codes.
+CLOSING_CONNECTION_CODES = (
+    EppResultCode.COMMAND_FAILED_CLOSING_CONNECTION.value,
+    EppResultCode.AUTHENTICATION_ERROR_CLOSING_CONNECTION.value,
+    EppResultCode.SESSION_LIMIT_EXCEEDED_CLOSING_CONNECTION.value,
+)
+
+
 def get_format_32() -> str:
     """
     Get the size of C integers. We need 32 bits unsigned.
@@ -76,31 +132,237 @@ def get_format_32() -> str:
 
 
 # pylint: disable=too-many-instance-attributes
-@dataclass
+@dataclass(slots=True)
 class EppResultData:
     """Epp result data structure."""
 
     code: int
     message: str
-    raw_response: str
+    # A bytearray from the sync communicator, which returns the receive buffer without copying it
+    raw_response: Optional[Union[bytes, bytearray]]
     result_data: Any
     reason: Optional[str] = None
     client_transaction_id: Optional[str] = None
     server_transaction_id: Optional[str] = None
     repository_object_id: Optional[str] = None
+    xml_tree: Any = field(default=None, repr=False, compare=False)
+    # Items set with the dictionary style access which are not fields. The instances are slotted and have no
+    # __dict__ to keep them in.
+    _extra_items: Optional[dict] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # Whether the retention policy applied to the raw response keeps the parsed response as well
+    _keep_tree: bool = field(default=True, init=False, repr=False, compare=False)
 
     def __setitem__(self, key, value):
-        self.__dict__[key] = value
+        if key in _EPP_RESULT_FIELDS:
+            setattr(self, key, value)
+        else:
+            if self._extra_items is None:
+                self._extra_items = {}
+            self._extra_items[key] = value
 
     def __getitem__(self, key):
-        return self.__dict__[key]
+        if key in _EPP_RESULT_FIELDS:
+            return getattr(self, key)
+        if self._extra_items is None:
+            raise KeyError(key)
+        return self._extra_items[key]
 
     def __len__(self):
-        return len(self.__dict__)
+        return len(_EPP_RESULT_FIELDS) + len(self._extra_items or ())
+
+    def __iter__(self):
+        yield from _EPP_RESULT_FIELDS
+        yield from self._extra_items or ()
+
+    def __getstate__(self) -> dict:
+        # The parsed response cannot be pickled. It can be parsed again from the raw response.
+        state = {name: getattr(self, name) for name in _EPP_RESULT_FIELDS}
+        state["xml_tree"] = None
+        state["_extra_items"] = self._extra_items
+        state["_keep_tree"] = self._keep_tree
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        for name, value in state.items():
+            setattr(self, name, value)
 
     def to_dict(self) -> dict:
         """Convert an EppResultData object to a dictionary."""
-        return asdict(self)
+        data = asdict(replace(self, xml_tree=None))
+        data.pop("xml_tree")
+        data.pop("_extra_items")
+        data.pop("_keep_tree")
+        return data
+
+    def release_tree(self) -> None:
+        """Release the parsed response, unless the retention policy applied to the raw response is the keep one."""
+        if not self._keep_tree:
+            self.xml_tree = None
+
+
+# The fields of the dictionary style access. The parsed response is not part of it.
+_EPP_RESULT_FIELDS = tuple(
+    result_field.name
+    for result_field in fields(EppResultData)
+    if result_field.name not in ("xml_tree", "_extra_items", "_keep_tree")
+)
+
+
+def get_payload_size(frame_size: int, max_frame_size: int) -> int:
+    """
+    Get the size of the XML payload of a frame out of its length field.
+
+    :param int frame_size: Value of the length field. It includes the length field itself.
+    :param int max_frame_size: Largest accepted frame size
+
+    :return: Payload size
+    :rtype: int
+
+    :raises EppCommunicatorException: When the frame size is invalid or too large
+    """
+    if frame_size < LENGTH_FIELD_SIZE:
+        raise EppCommunicatorException(f"Invalid frame size: {frame_size} bytes")
+    if frame_size > max_frame_size:
+        raise EppCommunicatorException(
+            f"Frame size {frame_size} exceeds the maximum of {max_frame_size} bytes"
+        )
+    return frame_size - LENGTH_FIELD_SIZE
+
+
+def create_ssl_context(
+    client_cert: Optional[str] = None, client_key: Optional[str] = None
+) -> ssl.SSLContext:
+    """
+    Create the TLS context used to connect to the EPP server.
+
+    :param client_cert: Path to client certificate
+    :param client_key: Path to client key
+
+    :return: SSL context
+    :rtype: ssl.SSLContext
+    """
+    context = ssl.create_default_context()
+    context.minimum_version = ssl.TLSVersion.TLSv1_2
+    context.options |= ssl.OP_NO_TLSv1 | ssl.OP_NO_TLSv1_1
+    context.load_default_certs()
+    if client_cert and client_key:
+        context.load_cert_chain(certfile=client_cert, keyfile=client_key)
+
+    return context
+
+
+def parse_response(raw_response: Union[bytes, bytearray]) -> EppResultData:
+    """
+    Parse the result of a command out of the raw server response. The parsed response is kept in the result object,
+    so the object mappings do not need to parse it again.
+
+    :param raw_response: Response received from the server
+
+    :return: Result object
+    :rtype: EppResultData
+
+    :raises EppCommunicatorException: When the result code cannot be found
+    """
+    xml_tree = parser.parse_xml(raw_response)
+
+    result = parser.find(parser.RESULT, xml_tree)
+    try:
+        code = int(result.get("code"))
+    except (AttributeError, TypeError, ValueError) as exc:
+        raise EppCommunicatorException("Could not get result code.") from exc
+
+    message = parser.find_text(parser.RESULT_MESSAGE, result)
+
+    reason = None
+    if code not in (
+        EppResultCode.SUCCESS.value,
+        EppResultCode.SUCCESS_END_SESSION.value,
+    ):
+        reason = parser.find_text(parser.RESULT_REASON, result)
+
+    logging.debug("Command executed:\n%s", raw_response)
+
+    return EppResultData(
+        code=code,
+        message=message,
+        reason=reason,
+        raw_response=raw_response,
+        client_transaction_id=parser.find_text(parser.CLIENT_TRANSACTION_ID, xml_tree),
+        server_transaction_id=parser.find_text(parser.SERVER_TRANSACTION_ID, xml_tree),
+        repository_object_id=parser.find_text(parser.REPOSITORY_OBJECT_ID, xml_tree),
+        result_data=None,
+        xml_tree=xml_tree,
+    )
+
+
+def retain_raw_response(
+    result: EppResultData,
+    policy: RawResponsePolicy,
+    limit: int = DEFAULT_RAW_RESPONSE_LIMIT,
+) -> EppResultData:
+    """
+    Apply a retention policy to the raw response of a result. A dropped raw response is set to None. The parsed
+    response is kept for the object mappings, which release it under any policy but the keep one once they have parsed
+    the result data. The policy is recorded in the result for that.
+
+    :param result: Result object
+    :param policy: Retention policy
+    :param limit: Number of bytes kept by the truncate policy
+
+    :return: The result object
+    :rtype: EppResultData
+    """
+    if policy is RawResponsePolicy.DROP or (
+        policy is RawResponsePolicy.KEEP_ON_ERROR
+        and result.code < EppResultCode.UNKNOWN_COMMAND.value
+    ):
+        result.raw_response = None
+    elif policy is RawResponsePolicy.TRUNCATE and result.raw_response is not None:
+        result.raw_response = result.raw_response[:limit]
+    # pylint: disable-next=protected-access
+    result._keep_tree = policy is RawResponsePolicy.KEEP
+
+    return result
+
+
+def get_client_transaction_id(cmd: str) -> Optional[str]:
+    """
+    Get the client transaction id of an XML command.
+
+    :param cmd: XML command
+
+    :return: Client transaction id if the command has any
+    :rtype: Optional[str]
+    """
+    match = _COMMAND_CLIENT_TRANSACTION_ID.search(cmd)
+    return unescape(match.group(1)) if match else None
+
+
+def check_login_result(result: EppResultData) -> None:
+    """
+    Check the result of a login command.
+
+    :param result: Login result object
+
+    :raises EppCommunicatorException: When the login has not been successful
+    """
+    if result.code == EppResultCode.SUCCESS.value:
+        return
+
+    if result.code == EppResultCode.PARAMETER_RANGE_ERROR.value:
+        raise EppCommunicatorException(
+            "Incorrect user name or password. Please try again!"
+        )
+    if result.code == EppResultCode.SESSION_LIMIT_EXCEEDED_CLOSING_CONNECTION.value:
+        raise EppSessionLimitExceededException(
+            f"Session limit exceeded! Message: {result.message} - Reason {result.reason}"
+        )
+    raise EppCommunicatorException(
+        f"Something went wrong! Code: {result.code} - Message: "
+        f"{result.message} - Reason {result.reason}"
+    )
 
 
 class EppCommunicator:
@@ -108,7 +370,7 @@ class EppCommunicator:
     An EPP client for connecting to EPP server.
     """
 
-    # pylint: disable=too-many-instance-attributes,too-many-arguments
+    # pylint: disable=too-many-instance-attributes,too-many-arguments,too-many-locals
     def __init__(
         self,
         server: str,
@@ -116,6 +378,16 @@ class EppCommunicator:
         client_cert: Optional[str] = None,
         client_key: Optional[str] = None,
         dry_run: Optional[bool] = False,
+        max_frame_size: int = DEFAULT_MAX_FRAME_SIZE,
+        auto_reconnect: bool = False,
+        reconnect_attempts: int = 3,
+        reconnect_backoff: float = 1.0,
+        rate_limiter: Optional[RateLimiter] = None,
+        raw_response_policy: RawResponsePolicy = RawResponsePolicy.KEEP,
+        raw_response_limit: int = DEFAULT_RAW_RESPONSE_LIMIT,
+        ssl_context: Optional[ssl.SSLContext] = None,
+        observers: Optional[list[CommandObserver]] = None,
+        wire_trace: Optional[WireTrace] = None,
     ) -> None:
         """
         :param server: EPP server to connect to.
@@ -123,6 +395,22 @@ class EppCommunicator:
         :param client_cert: Path to client certificate
         :param client_key: Path to client key
         :param dry_run: dry run the request
+        :param max_frame_size: Largest response accepted from the server, in bytes
+        :param auto_reconnect: Reconnect and login again with the credentials of the last login when the connection
+            is lost. Idempotent commands (hello, check, info and poll) are retried once on the new connection.
+        :param reconnect_attempts: Number of attempts to reconnect
+        :param reconnect_backoff: Seconds to wait before the second attempt to reconnect. The wait is doubled for
+            every further attempt.
+        :param rate_limiter: Rate limiter consulted before sending every command. It can be shared by several
+            communicators.
+        :param raw_response_policy: Retention policy of the raw responses in the result objects. Dropping them saves
+            memory when a large number of results is kept.
+        :param raw_response_limit: Number of bytes of the raw responses kept by the truncate policy
+        :param ssl_context: TLS context used to connect to the server, e.g. to trust a test server. It is created out
+            of the client certificate and key if it is None.
+        :param observers: Observers notified of the metrics of every executed command
+        :param wire_trace: Wire trace logging the XML of a sample of the commands. It can be shared by several
+            communicators.
         """
         self._server = server
         self._port = port
@@ -131,19 +419,73 @@ class EppCommunicator:
         self._client_key = client_key
 
         self._dry_run = dry_run
+        self._max_frame_size = max_frame_size
+
+        self._auto_reconnect = auto_reconnect
+        self._reconnect_attempts = reconnect_attempts
+        self._reconnect_backoff = reconnect_backoff
+        self._reconnecting = False
+        self._rate_limiter = rate_limiter
+        self._raw_response_policy = raw_response_policy
+        self._raw_response_limit = raw_response_limit
+        self._observers = list(observers or [])
+        self._wire_trace = wire_trace
+        # Identifies the communicator in the command metrics
+        self.session_id = uuid.uuid4().hex
+        self._logged_in = False
+        # The credentials are only kept for reconnecting.
+        self._password = None
+        self._extensions = None
 
         self._format_32 = get_format_32()
 
+        self._ssl_context = ssl_context
         self._context = None
         self._socket = None
         self._ssl_socket = None
         self.greeting = None
 
+        # Number of bytes written to and read from the server, including the length fields.
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+        # A session can only have one command in flight. The lock is shared with the keep-alive thread.
+        self._lock = threading.RLock()
+        self._last_activity = time.monotonic()
+        # The time the length field of the last response has been received, which ends the wait for the server
+        self._response_started = 0.0
+
     @property
     def user(self):
         """User property"""
         return self._user
 
+    @property
+    def is_connected(self) -> bool:
+        """Whether the connection to the server is established and has not been closed."""
+        return bool(self.greeting) and self._ssl_socket is not None
+
+    @property
+    def idle_time(self) -> float:
+        """Number of seconds since the last data was sent to or received from the server."""
+        return time.monotonic() - self._last_activity
+
+    def add_observer(self, observer: CommandObserver) -> None:
+        """
+        Add an observer notified of the metrics of every executed command.
+
+        :param observer: Command observer
+        """
+        self._observers.append(observer)
+
+    def remove_observer(self, observer: CommandObserver) -> None:
+        """
+        Remove a command observer.
+
+        :param observer: Command observer
+        """
+        self._observers.remove(observer)
+
     def _unpack_data(self, data: int) -> str:
         """
         Unpack data.
@@ -165,27 +507,56 @@ class EppCommunicator:
         """
         return struct.pack(self._format_32, data)
 
-    def _read(self) -> bytes:
+    def _recv_exactly(self, buffer: memoryview) -> bool:
         """
-        Read the response from the socket.
+        Fill the buffer with the data received from the socket.
 
-        :return: Response
-        :rtype: Optional[bytes]
+        :param buffer: Buffer to fill
+
+        :return: False if the connection was closed before the buffer was filled
+        :rtype: bool
+        """
+        total_bytes = len(buffer)
+        received = 0
+        while received < total_bytes:
+            count = self._ssl_socket.recv_into(buffer[received:])
+            if not count:
+                return False
+            received += count
+        return True
+
+    def _read(self) -> Optional[bytearray]:
         """
-        length = self._ssl_socket.read(LENGTH_FIELD_SIZE)
-        buffer = bytes()
+        Read the response from the socket. The length field is read first and the payload is received into a buffer
+        of the declared size, which is returned as it is, without copying it.
 
-        if not length:
+        :return: Response
+        :rtype: Optional[bytearray]
+
+        :raises EppCommunicatorException: When the length field is invalid or too large
+        """
+        length = bytearray(LENGTH_FIELD_SIZE)
+        if not self._recv_exactly(memoryview(length)):
             return None
+        self._response_started = time.perf_counter()
 
-        total_bytes = self._unpack_data(length) - LENGTH_FIELD_SIZE
-        while len(buffer) < total_bytes:
-            remaining = total_bytes - len(buffer)
-            chunk = self._ssl_socket.recv(remaining)
-            if not chunk:
+        try:
+            total_bytes = get_payload_size(
+                self._unpack_data(length), self._max_frame_size
+            )
+        except EppCommunicatorException:
+            # The stream cannot be resynchronised after a bad length field.
+            self.close()
+            raise
+
+        buffer = bytearray(total_bytes)
+        with memoryview(buffer) as view:
+            if not self._recv_exactly(view):
                 return None
-            buffer += chunk
-            logging.info("Received %s/%s bytes", len(buffer), total_bytes)
+
+        self.bytes_received += LENGTH_FIELD_SIZE + total_bytes
+        self._last_activity = time.monotonic()
+
         return buffer
 
     def _write(self, xml: str) -> int:
@@ -197,25 +568,28 @@ class EppCommunicator:
         :return: Number of send bytes
         :rtype: int
         """
+        data_to_send = (xml + "\r\n").encode("utf-8")
         # +4 for the length field itself (section 4 mandates that)
-        # +2 for the CRLF at the end
-        xml_bytes = xml.encode("utf-8")
-        length = self._pack_data(len(xml_bytes) + LENGTH_FIELD_SIZE + CRLF_SIZE)
-
-        self._ssl_socket.sendall(length)
-        xml += "\r\n"
-        data_to_send = xml.encode("utf-8")
-        self._ssl_socket.sendall(data_to_send)
+        length = self._pack_data(len(data_to_send) + LENGTH_FIELD_SIZE)
+
+        # The length field and the payload are sent in one call, so they go out in the same TLS record.
+        self._ssl_socket.sendall(length + data_to_send)
+        self.bytes_sent += LENGTH_FIELD_SIZE + len(data_to_send)
+        self._last_activity = time.monotonic()
         return len(data_to_send)
 
-    def _execute_command(self, cmd: str) -> bytes:
+    def _execute_command(
+        self, cmd: str, metrics: Optional[CommandMetrics] = None
+    ) -> bytearray:
         """
         Execute the command. Sending the request to the server and receive the response.
 
         :param str cmd: XML command
+        :param metrics: Metrics of the command, which the time spent on the network and the transferred bytes are
+            recorded in
 
         :return: Response
-        :rtype: bytes
+        :rtype: bytearray
         """
 
         # Print the xml command and exit the app
@@ -223,36 +597,86 @@ class EppCommunicator:
             print(cmd)
             sys.exit()
 
+        rate_limit_wait = self._wait_for_rate_limit(cmd)
+
         logging.debug("Sending xml to server :\n%s", cmd)
 
-        self._write(cmd)
+        with self._lock:
+            start = time.perf_counter()
+            sent = self._write(cmd)
+            written = time.perf_counter()
+            response = self._read()
+            received = time.perf_counter()
 
-        response = self._read()
         if response is None:
             raise EppCommunicatorException("Cannot connect to server. Please re-login!")
 
         logging.debug("Received xml response from server :\n%s", response)
 
+        if metrics is not None:
+            metrics.rate_limit_wait = rate_limit_wait
+            metrics.write_time = written - start
+            metrics.server_time = self._response_started - written
+            metrics.read_time = received - self._response_started
+            metrics.bytes_sent = LENGTH_FIELD_SIZE + sent
+            metrics.bytes_received = LENGTH_FIELD_SIZE + len(response)
+
         return response
 
-    def connect(self) -> bytes:
+    def _wait_for_rate_limit(self, cmd: str) -> float:
+        """
+        Wait until the rate limiter allows the command to be sent.
+
+        :param str cmd: XML command
+
+        :return: Number of seconds waited
+        :rtype: float
+        """
+        if self._rate_limiter is None:
+            return 0.0
+
+        wait_time = self._rate_limiter.acquire(helper.get_command_type(cmd))
+        if wait_time:
+            logging.debug("Command delayed by the rate limiter for %.3fs", wait_time)
+        return wait_time
+
+    def _create_metrics(
+        self, cmd: str, render_time: float = 0.0, pipelined: bool = False
+    ) -> Optional[CommandMetrics]:
+        """
+        Create the metrics of a command if there are observers to notify.
+
+        :param str cmd: XML command
+        :param render_time: Time spent rendering the command, in seconds
+        :param pipelined: Whether the command is executed in the pipelined mode
+
+        :return: Command metrics. None if there are no observers.
+        :rtype: Optional[CommandMetrics]
+        """
+        if not self._observers:
+            return None
+
+        return CommandMetrics(
+            command_type=helper.get_command_type(cmd) or OTHER_COMMANDS,
+            session_id=self.session_id,
+            client_transaction_id=get_client_transaction_id(cmd),
+            render_time=render_time,
+            pipelined=pipelined,
+        )
+
+    def connect(self) -> bytearray:
         """
         Initial connect to the server.
 
         :return: Greeting message
-        :rtype: bytes
+        :rtype: bytearray
 
         :raises EppCommunicatorException: When there is any errors
         """
         try:
-            self._context = ssl.create_default_context()
-            self._context.minimum_version = ssl.TLSVersion.TLSv1_2
-            self._context.options |= ssl.OP_NO_TLSv1 | ssl.OP_NO_TLSv1_1
-            self._context.load_default_certs()
-            if self._client_cert and self._client_key:
-                self._context.load_cert_chain(
-                    certfile=self._client_cert, keyfile=self._client_key
-                )
+            self._context = self._ssl_context or create_ssl_context(
+                self._client_cert, self._client_key
+            )
             self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM, 0)
             self._socket.settimeout(10)
 
@@ -261,7 +685,12 @@ class EppCommunicator:
             )
             self._ssl_socket.connect((self._server, int(self._port)))
             self.greeting = self._read()
-            logging.debug(BeautifulSoup(self.greeting, "xml"))
+            # Prettifying the greeting parses it, which is only worth it when it is logged.
+            if logging.getLogger().isEnabledFor(logging.DEBUG):
+                logging.debug(
+                    "Received greeting from server :\n%s",
+                    helper.xml_pretty(self.greeting),
+                )
             return self.greeting
         except Exception as ex:
             logging.error("Could not setup a sec sure connection. %s", str(ex))
@@ -269,80 +698,417 @@ class EppCommunicator:
                 "Could not setup a sec sure connection"
             ) from ex
 
-    def execute(self, cmd: str) -> EppResultData:
+    def execute(
+        self,
+        cmd: str,
+        raw_response_policy: Optional[RawResponsePolicy] = None,
+        render_time: float = 0.0,
+    ) -> EppResultData:
         """
         Execute the command. Sending the request to the server and receive the response.
 
         :param str cmd: XML Command
+        :param raw_response_policy: Retention policy of the raw response. The policy of the communicator is used if
+            it is None.
+        :param render_time: Time spent rendering the command, in seconds. It is reported to the observers.
 
         :return: Result object
         :rtype: EppResultData
 
         :raises EppCommunicatorException: When there is any errors.
         """
+        metrics = self._create_metrics(cmd, render_time)
+        traced = self._wire_trace is not None and self._wire_trace.sample()
+        raw_response = result = None
         try:
             if not self.greeting and not self._dry_run:
-                raise EppCommunicatorException(
-                    "The connection to the server has not been established yet!"
+                if not self._can_reconnect():
+                    raise EppCommunicatorException(
+                        "The connection to the server has not been established yet!"
+                    )
+                self._reconnect()
+
+            try:
+                raw_response = self._execute_command(cmd, metrics)
+            except (EppCommunicatorException, OSError) as ex:
+                if (
+                    not self._can_reconnect()
+                    or helper.get_command_type(cmd) not in IDEMPOTENT_COMMANDS
+                ):
+                    raise
+                logging.warning("Lost the connection to the server. %s", str(ex))
+                self._reconnect()
+                raw_response = self._execute_command(cmd, metrics)
+
+            parse_start = time.perf_counter()
+            result = parse_response(raw_response)
+            if metrics is not None:
+                metrics.parse_time = time.perf_counter() - parse_start
+                metrics.result_code = result.code
+
+            if result.code in CLOSING_CONNECTION_CODES:
+                logging.warning(
+                    "Server closed the connection. Code: %s - Message: %s",
+                    result.code,
+                    result.message,
                 )
+                self.close()
+
+            return self._retain_raw_response(result, raw_response_policy)
+        except EppCommunicatorException as epp_ex:
+            if metrics is not None:
+                metrics.error = epp_ex
+            raise epp_ex
+        except Exception as ex:
+            epp_ex = EppCommunicatorException(ex)
+            if metrics is not None:
+                metrics.error = epp_ex
+            raise epp_ex from ex
+        finally:
+            notify_observers(self._observers, metrics)
+            if traced:
+                self._trace(cmd, raw_response, result)
+
+    def _trace(
+        self,
+        cmd: str,
+        raw_response: Optional[Union[bytes, bytearray]],
+        result: Optional[EppResultData],
+    ) -> None:
+        """
+        Log a sampled command and its response to the wire trace.
+
+        :param str cmd: XML command
+        :param raw_response: Response. None if no response has been received.
+        :param result: Result object. None if the response has not been parsed.
+        """
+        self._wire_trace.trace(
+            self.session_id,
+            cmd,
+            raw_response,
+            result.code if result is not None else None,
+            get_client_transaction_id(cmd),
+        )
+
+    def _retain_raw_response(
+        self, result: EppResultData, policy: Optional[RawResponsePolicy] = None
+    ) -> EppResultData:
+        """
+        Apply the retention policy to the raw response of a result.
 
-            raw_response = self._execute_command(cmd)
-            xml_response = BeautifulSoup(raw_response, "xml")
+        :param result: Result object
+        :param policy: Retention policy. The policy of the communicator is used if it is None.
+
+        :return: The result object
+        :rtype: EppResultData
+        """
+        return retain_raw_response(
+            result, policy or self._raw_response_policy, self._raw_response_limit
+        )
 
-            response = xml_response.find("response")
-            result = xml_response.find("result")
-            message = result.find("msg").string
+    def _can_reconnect(self) -> bool:
+        """
+        Check whether a lost connection can be recovered automatically.
 
+        :return: True if auto reconnect is enabled and the user has logged in
+        :rtype: bool
+        """
+        return (
+            self._auto_reconnect
+            and self._password is not None
+            and not self._reconnecting
+        )
+
+    def _reconnect(self) -> None:
+        """
+        Connect to the server again and login with the credentials of the last login. The attempts are spaced with
+        an exponential backoff.
+
+        :raises EppCommunicatorException: When all the attempts have failed
+        """
+        with self._lock:
+            self._reconnecting = True
             try:
-                code = int(result.get("code"))
-            except AttributeError as exc:
-                raise EppCommunicatorException("Could not get result code.") from exc
-
-            reason = None
-            if code not in (
-                EppResultCode.SUCCESS.value,
-                EppResultCode.SUCCESS_END_SESSION.value,
-            ):
-                reason = result.find("reason").string if result.find("reason") else None
+                last_exception = None
+                for attempt in range(self._reconnect_attempts):
+                    self.close()
+                    if attempt:
+                        time.sleep(self._reconnect_backoff * 2 ** (attempt - 1))
+
+                    logging.info(
+                        "Reconnecting to %s:%s. Attempt %s/%s",
+                        self._server,
+                        self._port,
+                        attempt + 1,
+                        self._reconnect_attempts,
+                    )
+                    try:
+                        self.connect()
+                        self.login(self._user, self._password, self._extensions)
+                        notify_session_event(
+                            self._observers, "reconnected", self.session_id
+                        )
+                        return
+                    except EppCommunicatorException as ex:
+                        logging.warning("Could not reconnect. %s", str(ex))
+                        last_exception = ex
+
+                self.close()
+                raise EppCommunicatorException(
+                    "Cannot reconnect to server. Please re-login!"
+                ) from last_exception
+            finally:
+                self._reconnecting = False
 
-            client_transaction_id = (
-                response.find("clTRID").text if response.find("clTRID") else None
-            )
-            server_transaction_id = (
-                response.find("svTRID").text if response.find("svTRID") else None
-            )
-            repository_object_id = (
-                response.find("roid").text if response.find("roid") else None
-            )
+    def execute_pipelined(
+        self,
+        cmds: Iterable[str],
+        window: int = DEFAULT_PIPELINE_WINDOW,
+        raw_response_policy: Optional[RawResponsePolicy] = None,
+    ) -> Iterator[EppResultData]:
+        """
+        Execute commands in the pipelined mode. Up to ``window`` commands are written to the server before their
+        responses are read, which saves a round trip per command on high latency links. The responses are matched to
+        the commands by their client transaction ids, so every command must have a unique ``clTRID``.
+
+        .. code:: python
+
+            for result in epp.execute_pipelined(commands, window=5):
+                print(result.client_transaction_id, result.code)
+
+        :param cmds: XML commands. They are consumed lazily.
+        :param int window: Maximum number of commands waiting for their responses
+        :param raw_response_policy: Retention policy of the raw responses. The policy of the communicator is used if
+            it is None.
 
-            logging.debug("Command executed:\n%s", xml_response)
-
-            return EppResultData(
-                code=code,
-                message=message,
-                reason=reason,
-                raw_response=raw_response,
-                client_transaction_id=client_transaction_id,
-                server_transaction_id=server_transaction_id,
-                repository_object_id=repository_object_id,
-                result_data=None,
+        :return: Result objects in the order of the commands
+        :rtype: Iterator[EppResultData]
+
+        :raises EppCommunicatorException: When there is any errors.
+        """
+        if window < 1:
+            raise ValueError("Pipeline window must be at least 1.")
+
+        if not self.greeting and not self._dry_run:
+            raise EppCommunicatorException(
+                "The connection to the server has not been established yet!"
             )
+
+        commands = iter(cmds)
+        try:
+            # The pipeline is closed explicitly, so the connection is cleaned up while the lock is held even when the
+            # consumer stops early.
+            with (
+                self._lock,
+                closing(self._execute_pipelined(commands, window)) as pipeline,
+            ):
+                for result in pipeline:
+                    yield self._retain_raw_response(result, raw_response_policy)
         except EppCommunicatorException as epp_ex:
             raise epp_ex
         except Exception as ex:
             raise EppCommunicatorException(ex) from ex
 
-    def hello(self) -> bytes:
+    def _execute_pipelined(
+        self, commands: Iterator[str], window: int
+    ) -> Iterator[EppResultData]:
+        """
+        Write the commands and read their responses in the pipelined mode. If the pipeline stops with commands in
+        flight, because of an error or because the consumer stops early, the connection is closed. Their responses
+        would otherwise be read as the responses of the next commands.
+
+        :param commands: XML commands
+        :param int window: Maximum number of commands waiting for their responses
+
+        :return: Result objects in the order of the commands
+        :rtype: Iterator[EppResultData]
+        """
+        in_flight: deque[str] = deque()
+        received: dict[str, EppResultData] = {}
+        # Metrics of the commands in flight and the time they have been written, when there are observers
+        measured: dict[str, tuple[CommandMetrics, float]] = {}
+
+        try:
+            while True:
+                while len(in_flight) < window:
+                    # The commands are usually rendered while they are consumed.
+                    render_start = time.perf_counter()
+                    cmd = next(commands, None)
+                    if cmd is None:
+                        break
+                    metrics = self._create_metrics(
+                        cmd, time.perf_counter() - render_start, pipelined=True
+                    )
+                    in_flight.append(
+                        self._send_pipelined(cmd, in_flight, metrics, measured)
+                    )
+
+                if not in_flight:
+                    return
+
+                while in_flight[0] not in received:
+                    self._receive_pipelined(in_flight, received, measured)
+
+                result = received.pop(in_flight.popleft())
+
+                if result.code in CLOSING_CONNECTION_CODES:
+                    logging.warning(
+                        "Server closed the connection. Code: %s - Message: %s",
+                        result.code,
+                        result.message,
+                    )
+                    self.close()
+                    yield result
+                    if in_flight:
+                        raise EppCommunicatorException(
+                            "Server closed the connection while commands were in flight!"
+                        )
+                    return
+
+                yield result
+        finally:
+            if in_flight and self.is_connected:
+                logging.warning(
+                    "Closing the connection with %s pipelined commands in flight.",
+                    len(in_flight),
+                )
+                self.close()
+
+    def _send_pipelined(
+        self,
+        cmd: str,
+        in_flight: deque,
+        metrics: Optional[CommandMetrics] = None,
+        measured: Optional[dict[str, tuple[CommandMetrics, float]]] = None,
+    ) -> str:
+        """
+        Write a command of the pipelined mode without waiting for its response.
+
+        :param str cmd: XML command
+        :param in_flight: Client transaction ids of the commands waiting for their responses
+        :param metrics: Metrics of the command
+        :param measured: Metrics of the commands in flight and the time they have been written, which the metrics of
+            the command are added to
+
+        :return: Client transaction id of the command
+        :rtype: str
+        """
+        client_transaction_id = get_client_transaction_id(cmd)
+        if not client_transaction_id:
+            raise EppCommunicatorException(
+                "Pipelined commands must have a client transaction id!"
+            )
+        if client_transaction_id in in_flight:
+            raise EppCommunicatorException(
+                f"Duplicate client transaction id in the pipeline: {client_transaction_id}"
+            )
+
+        # Print the xml command and exit the app
+        if self._dry_run:
+            print(cmd)
+            sys.exit()
+
+        rate_limit_wait = self._wait_for_rate_limit(cmd)
+
+        logging.debug("Sending pipelined xml to server :\n%s", cmd)
+        start = time.perf_counter()
+        sent = self._write(cmd)
+        written = time.perf_counter()
+
+        if metrics is not None and measured is not None:
+            metrics.rate_limit_wait = rate_limit_wait
+            metrics.write_time = written - start
+            metrics.bytes_sent = LENGTH_FIELD_SIZE + sent
+            measured[client_transaction_id] = (metrics, written)
+
+        return client_transaction_id
+
+    def _receive_pipelined(
+        self,
+        in_flight: deque,
+        received: dict[str, EppResultData],
+        measured: Optional[dict[str, tuple[CommandMetrics, float]]] = None,
+    ) -> None:
+        """
+        Read a response of the pipelined mode and match it to its command.
+
+        :param in_flight: Client transaction ids of the commands waiting for their responses
+        :param received: Results which have been received, keyed by client transaction id
+        :param measured: Metrics of the commands in flight and the time they have been written. The observers are
+            notified of the metrics of the command.
+        """
+        response = self._read()
+        read = time.perf_counter()
+        if response is None:
+            raise EppCommunicatorException("Cannot connect to server. Please re-login!")
+
+        logging.debug("Received xml response from server :\n%s", response)
+        result = parse_response(response)
+        parsed = time.perf_counter()
+
+        client_transaction_id = result.client_transaction_id
+        if client_transaction_id is None:
+            # Responses to commands which could not be parsed may miss the client transaction id. The server
+            # processes the commands in order, so it belongs to the oldest command without a response.
+            client_transaction_id = next(
+                (trid for trid in in_flight if trid not in received), None
+            )
+
+        if client_transaction_id not in in_flight or client_transaction_id in received:
+            raise EppCommunicatorException(
+                f"Unexpected response with client transaction id: {client_transaction_id}"
+            )
+
+        received[client_transaction_id] = result
+
+        if measured and client_transaction_id in measured:
+            metrics, written = measured.pop(client_transaction_id)
+            metrics.server_time = self._response_started - written
+            metrics.read_time = read - self._response_started
+            metrics.parse_time = parsed - read
+            metrics.bytes_received = LENGTH_FIELD_SIZE + len(response)
+            metrics.result_code = result.code
+            notify_observers(self._observers, metrics)
+
+    def hello(self) -> bytearray:
         """
         Send Hello command the server.
 
         :return: Greeting response
-        :rtype: bytes
+        :rtype: bytearray
         """
         logging.debug("Send Hello command to the server!")
         greeting = self._execute_command(HELLO_XML)
         return greeting
 
+    def keep_alive(self, max_idle: float) -> bool:
+        """
+        Send a Hello command if the session has been idle for at least ``max_idle`` seconds. Nothing is sent while
+        another command is in flight, as the session is not idle then.
+
+        :param max_idle: Number of idle seconds after which the Hello command is sent
+
+        :return: True if the Hello command has been sent
+        :rtype: bool
+
+        :raises EppCommunicatorException: When the Hello command fails
+        """
+        if not self.is_connected or self.idle_time < max_idle:
+            return False
+
+        if not self._lock.acquire(
+            blocking=False
+        ):  # pylint: disable=consider-using-with
+            return False
+        try:
+            # Another command may have been executed while acquiring the lock.
+            if not self.is_connected or self.idle_time < max_idle:
+                return False
+            self.hello()
+            return True
+        finally:
+            self._lock.release()
+
     def login(
         self, user: str, password: str, extensions: Optional[list[str]] = None
     ) -> EppResultData:
@@ -363,26 +1129,22 @@ class EppCommunicator:
 
         self._user = user
 
-        command_template = template_engine.from_string(LOGIN_XML)
+        command_template = get_template(LOGIN_XML)
         command = command_template.render(
             user=user, password=password, extensions=extensions
         )
 
         result = self.execute(command)
+        check_login_result(result)
 
-        if result.code == EppResultCode.SUCCESS.value:
-            logging.info(
-                "User %s logged in to %s:%s", self._user, self._server, self._port
-            )
-        elif result.code == EppResultCode.PARAMETER_RANGE_ERROR.value:
-            raise EppCommunicatorException(
-                "Incorrect user name or password. Please try again!"
-            )
-        else:
-            raise EppCommunicatorException(
-                f"Something went wrong! Code: {result.code} - Message: "
-                f"{result.message} - Reason {result.reason}"
-            )
+        self._logged_in = True
+        notify_session_event(self._observers, "session_opened", self.session_id)
+
+        if self._auto_reconnect:
+            self._password = password
+            self._extensions = extensions
+
+        logging.info("User %s logged in to %s:%s", self._user, self._server, self._port)
 
         return result
 
@@ -394,10 +1156,33 @@ class EppCommunicator:
         :rtype: EppResultData
         """
 
+        self._password = None
         logout = self.execute(LOGOUT_XML)
-        self._socket.close()
+        self.close()
         logging.info(
             "User %s logged out from %s:%s", self._user, self._server, self._port
         )
 
         return logout
+
+    def close(self) -> None:
+        """
+        Close the connection to the server without logging out. It is safe to call this on a connection which
+        has already been closed.
+        """
+        sockets = (self._ssl_socket, self._socket)
+        self._ssl_socket = None
+        self._socket = None
+        self.greeting = None
+
+        if self._logged_in:
+            self._logged_in = False
+            notify_session_event(self._observers, "session_closed", self.session_id)
+
+        for sock in sockets:
+            if sock is None:
+                continue
+            try:
+                sock.close()
+            except OSError as ex:
+                logging.debug("Error while closing the socket. %s", str(ex))
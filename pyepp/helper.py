@@ -3,10 +3,17 @@ Helper functions
 """
 
 import random
+import re
 import string
+from itertools import islice
+from typing import Iterable, Iterator, Optional, TypeVar, Union
 
 from bs4 import BeautifulSoup
 
+T = TypeVar("T")
+
+_COMMAND_TYPE = re.compile(r"<(hello)\s*/>|<command>\s*<(\w+)")
+
 
 def generate_password(length: int) -> str:
     """Generate a random password including letters and digits.
@@ -24,7 +31,7 @@ def generate_password(length: int) -> str:
     )
 
 
-def xml_pretty(bxml: bytes) -> str:
+def xml_pretty(bxml: Union[bytes, bytearray]) -> str:
     """
     Convert bytes xml to string and prettify it.
 
@@ -32,5 +39,41 @@ def xml_pretty(bxml: bytes) -> str:
 
     :return: xml in string
     """
+    # The responses are received into a bytearray, which BeautifulSoup does not accept.
+    if isinstance(bxml, bytearray):
+        bxml = bytes(bxml)
     xml_str = BeautifulSoup(bxml, "xml")
     return xml_str.decode(pretty_print=True)
+
+
+def get_command_type(xml: str) -> Optional[str]:
+    """
+    Get the type of an XML command, e.g. ``check``, ``info``, ``poll`` or ``hello``.
+
+    :param xml: XML command
+
+    :return: Command type if the XML is an EPP command
+    :rtype: Optional[str]
+    """
+    match = _COMMAND_TYPE.search(xml)
+    if match is None:
+        return None
+    return match.group(1) or match.group(2)
+
+
+def batched(iterable: Iterable[T], size: int) -> Iterator[list[T]]:
+    """
+    Split an iterable into lists of at most ``size`` items. The iterable is consumed lazily, one batch at a time.
+
+    :param iterable: Items
+    :param int size: Maximum number of items per batch
+
+    :return: Batches of items
+    :rtype: Iterator[list]
+    """
+    if size < 1:
+        raise ValueError("Batch size must be at least 1.")
+
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
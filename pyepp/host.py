@@ -3,11 +3,10 @@ Host Mapping Module. This module is used to manage host objects in Registry.
 A host object represents a Domain Name System (DNS) server that resolves domain names into IP addresses.
 """
 
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from typing import Optional
 
-from bs4 import BeautifulSoup
-
+from pyepp import parser
 from pyepp.epp import EppResultData
 from pyepp.base_command import BaseCommand
 from pyepp.command_templates import (
@@ -19,8 +18,21 @@ from pyepp.command_templates import (
 )
 from pyepp.epp import EppResultCode
 
+_CHECK_DATA = parser.xpath("/epp:epp/epp:response/epp:resData/host:chkData/host:cd")
+_CHECK_NAME = parser.xpath("host:name")
+_CHECK_REASON = parser.xpath("host:reason")
+
+_INFO_DATA = parser.xpath("/epp:epp/epp:response/epp:resData/host:infData")
+_INFO_NAME = parser.xpath("host:name")
+_INFO_STATUS = parser.xpath("host:status/@s")
+_INFO_ADDRESSES = parser.xpath("host:addr")
+_INFO_CREATE_DATE = parser.xpath("host:crDate")
+_INFO_CREATE_CLIENT_ID = parser.xpath("host:crID")
+_INFO_UPDATE_CLIENT_ID = parser.xpath("host:upID")
+_INFO_UPDATE_DATE = parser.xpath("host:upDate")
 
-@dataclass
+
+@dataclass(slots=True)
 class IPAddressData:
     """IP Address data class."""
 
@@ -29,7 +41,7 @@ class IPAddressData:
     ip: str
 
 
-@dataclass
+@dataclass(slots=True)
 class HostData:
     """Host object data class."""
 
@@ -54,17 +66,7 @@ class Host(BaseCommand):
     for two unique name servers that are accessible by IPv4 and two unique name servers that are accessible by IPv6.
     """
 
-    def _data_to_dict(self, data: HostData) -> dict:
-        """Convert a host dataclass to a dictionary.
-
-        :param data: Host name details
-
-        :return: Host name details
-        :rtype: dict
-        """
-        data_dict = asdict(data)
-
-        return data_dict
+    OBJECT_TYPE = "host"
 
     def check(
         self, host_names: list[str], client_transaction_id: Optional[str] = None
@@ -84,25 +86,32 @@ class Host(BaseCommand):
             client_transaction_id=client_transaction_id,
         )
 
-        if int(result.code) != int(EppResultCode.SUCCESS.value):
-            return result
+        return self._parse_check(result)
+
+    def _parse_check(self, result: EppResultData) -> EppResultData:
+        """Parse the host check response into the result data.
 
-        raw_response = BeautifulSoup(result.raw_response, "xml")
-        domains_check_data = raw_response.find_all("cd")
+        :param result: Result object
+
+        :return: Result object
+        :rtype: EppResultData
+        """
+        if int(result.code) != int(EppResultCode.SUCCESS.value):
+            return self._release_tree(result)
 
         result_data = {}
-        for domain_cd in domains_check_data:
-            domain = domain_cd.find("name")
-            available = domain.get("avail") in ("true", "1")
-            reason = domain_cd.find("reason").text if not available else None
-            result_data[domain.text] = {
+        for host_cd in _CHECK_DATA(parser.get_tree(result)):
+            host = parser.find(_CHECK_NAME, host_cd)
+            available = host.get("avail") in ("true", "1")
+            reason = parser.find_text(_CHECK_REASON, host_cd) if not available else None
+            result_data[parser.text(host)] = {
                 "avail": available,
                 "reason": reason,
             }
 
         result["result_data"] = result_data
 
-        return result
+        return self._release_tree(result)
 
     def info(
         self, host_name: str, client_transaction_id: Optional[str] = None
@@ -115,49 +124,52 @@ class Host(BaseCommand):
         :return: Result object
         :rtype: EppResultData
         """
+        if client_transaction_id is None:
+            cached = self._get_cached_info(host_name)
+            if cached is not None:
+                return cached
+
         result = self.execute(
             HOST_INFO_XML,
             host_name=host_name,
             client_transaction_id=client_transaction_id,
         )
 
+        result = self._parse_info(result)
+        self._cache_info(host_name, result)
+
+        return result
+
+    def _parse_info(self, result: EppResultData) -> EppResultData:
+        """Parse the host info response into the result data.
+
+        :param result: Result object
+
+        :return: Result object
+        :rtype: EppResultData
+        """
         if int(result.code) != int(EppResultCode.SUCCESS.value):
-            return result
+            return self._release_tree(result)
 
-        raw_response = BeautifulSoup(result.raw_response, "xml")
+        info_data = parser.find(_INFO_DATA, parser.get_tree(result))
 
         result_data = {
-            "host_name": raw_response.find("name").text,
-            "status": [status.get("s") for status in raw_response.find_all("status")],
-            "address": (
-                [
-                    IPAddressData(address=addr.text, ip=addr.get("ip"))
-                    for addr in raw_response.find_all("addr")
-                ]
-                if raw_response.find("addr")
-                else None
-            ),
-            "create_date": (
-                raw_response.find("crDate").text
-                if raw_response.find("crDate")
-                else None
-            ),
-            "creat_client_id": (
-                raw_response.find("crID").text if raw_response.find("crID") else None
-            ),
-            "update_client_id": (
-                raw_response.find("upID").text if raw_response.find("upID") else None
-            ),
-            "update_date": (
-                raw_response.find("upDate").text
-                if raw_response.find("upDate")
-                else None
-            ),
+            "host_name": parser.find_text(_INFO_NAME, info_data),
+            "status": _INFO_STATUS(info_data),
+            "address": [
+                IPAddressData(address=parser.text(addr), ip=addr.get("ip"))
+                for addr in _INFO_ADDRESSES(info_data)
+            ]
+            or None,
+            "create_date": parser.find_text(_INFO_CREATE_DATE, info_data),
+            "creat_client_id": parser.find_text(_INFO_CREATE_CLIENT_ID, info_data),
+            "update_client_id": parser.find_text(_INFO_UPDATE_CLIENT_ID, info_data),
+            "update_date": parser.find_text(_INFO_UPDATE_DATE, info_data),
         }
 
         result["result_data"] = HostData(**result_data)
 
-        return result
+        return self._release_tree(result)
 
     def create(
         self, host: HostData, client_transaction_id: Optional[str] = None
@@ -189,7 +201,8 @@ class Host(BaseCommand):
         :return: Result object
         :rtype: EppResultData
         """
-        result = self.execute(
+        result = self._execute_change(
+            (host_name,),
             HOST_DELETE_XML,
             host_name=host_name,
             client_transaction_id=client_transaction_id,
@@ -227,7 +240,8 @@ class Host(BaseCommand):
         remove = bool(remove_ip_address or remove_status)
         change = bool(new_host_name)
 
-        result = self.execute(
+        result = self._execute_change(
+            (host_name, new_host_name),
             HOST_UPDATE_XML,
             host_name=host_name,
             add=add,
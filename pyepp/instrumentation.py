@@ -0,0 +1,254 @@
+"""
+EPP Instrumentation Module. The communicators notify their observers of every command they execute, with the time
+spent in each stage of the command, so it can be told whether the latency is on the client or on the registry side.
+The observers are notified of the sessions being opened, closed and reconnected as well.
+
+The wire trace logs the XML of a sample of the commands and their responses, which is cheap enough to be left on in
+production.
+
+.. code:: python
+
+    class LatencyObserver(CommandObserver):
+        def command_executed(self, metrics: CommandMetrics) -> None:
+            print(metrics.command_type, metrics.result_code, metrics.server_time)
+
+    epp = EppCommunicator("epp.test.net.nz", "700", observers=[LatencyObserver()])
+"""
+
+import itertools
+import logging
+import re
+from dataclasses import dataclass
+from typing import Callable, Iterable, Optional, Union
+
+from pyepp.helper import get_command_type
+
+# Passwords in the commands, e.g. in the login command and in the authInfo elements
+_PASSWORD = re.compile(
+    r"(<(?:\w+:)?(?:pw|newPW)\b[^>]*>).*?(</(?:\w+:)?(?:pw|newPW)>)", re.DOTALL
+)
+
+
+# pylint: disable=too-many-instance-attributes
+@dataclass(slots=True)
+class CommandMetrics:
+    """
+    Metrics of an executed command. The times are in seconds and the sizes in bytes, including the length fields.
+
+    The server time runs from the command being written to the first bytes of the response being received, so it is
+    the network round trip and the processing time of the registry. For pipelined commands it includes waiting for
+    the responses of the commands sent before.
+    """
+
+    command_type: str
+    session_id: str
+    client_transaction_id: Optional[str] = None
+    render_time: float = 0.0
+    rate_limit_wait: float = 0.0
+    write_time: float = 0.0
+    server_time: float = 0.0
+    read_time: float = 0.0
+    parse_time: float = 0.0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    result_code: Optional[int] = None
+    error: Optional[Exception] = None
+    pipelined: bool = False
+
+    @property
+    def total_time(self) -> float:
+        """Time spent on the command, from rendering it to parsing its response."""
+        return (
+            self.render_time
+            + self.rate_limit_wait
+            + self.write_time
+            + self.server_time
+            + self.read_time
+            + self.parse_time
+        )
+
+
+class CommandObserver:
+    """
+    Base class of the command observers. The observers are called in the thread executing the command, while the
+    session is not available to other commands, so they should return quickly.
+    """
+
+    def command_executed(self, metrics: CommandMetrics) -> None:
+        """
+        Called after a command has been executed, whether it has been successful or not. The result code is None and
+        the error is set when no response has been received.
+
+        :param metrics: Command metrics
+        """
+
+    def session_opened(self, session_id: str) -> None:
+        """
+        Called after a session has logged in.
+
+        :param session_id: Session id of the communicator
+        """
+
+    def session_closed(self, session_id: str) -> None:
+        """
+        Called after the connection of a logged-in session has been closed.
+
+        :param session_id: Session id of the communicator
+        """
+
+    def reconnected(self, session_id: str) -> None:
+        """
+        Called after a lost connection has been recovered automatically.
+
+        :param session_id: Session id of the communicator
+        """
+
+
+# pylint: disable=too-few-public-methods
+class CallbackObserver(CommandObserver):
+    """
+    Command observer calling a function.
+
+    .. code:: python
+
+        epp = EppCommunicator("epp.test.net.nz", "700", observers=[CallbackObserver(print)])
+    """
+
+    def __init__(self, callback: Callable[[CommandMetrics], None]) -> None:
+        """
+        :param callback: Function called with the metrics of every command
+        """
+        self._callback = callback
+
+    def command_executed(self, metrics: CommandMetrics) -> None:
+        self._callback(metrics)
+
+
+def notify_observers(
+    observers: Iterable[CommandObserver], metrics: Optional[CommandMetrics]
+) -> None:
+    """
+    Notify the observers of an executed command. A failing observer is logged and does not fail the command.
+
+    :param observers: Command observers
+    :param metrics: Command metrics. Nothing is notified if it is None.
+    """
+    if metrics is None:
+        return
+
+    for observer in observers:
+        try:
+            observer.command_executed(metrics)
+        except Exception:  # pylint: disable=broad-exception-caught
+            logging.exception("Command observer %r failed.", observer)
+
+
+def notify_session_event(
+    observers: Iterable[CommandObserver], event: str, session_id: str
+) -> None:
+    """
+    Notify the observers of a session event. A failing observer is logged and does not fail the session.
+
+    :param observers: Command observers
+    :param event: Name of the observer method, i.e. ``session_opened``, ``session_closed`` or ``reconnected``
+    :param session_id: Session id of the communicator
+    """
+    for observer in observers:
+        try:
+            getattr(observer, event)(session_id)
+        except Exception:  # pylint: disable=broad-exception-caught
+            logging.exception("Command observer %r failed.", observer)
+
+
+def _mask_passwords(xml: str) -> str:
+    """
+    Mask the passwords in an XML command or response.
+
+    :param xml: XML
+
+    :return: XML without the passwords
+    :rtype: str
+    """
+    return _PASSWORD.sub(r"\1*****\2", xml)
+
+
+class WireTrace:
+    """
+    Log the XML of one in every ``sample_rate`` commands and of its response, with the passwords masked. The session
+    id, the command type, the client transaction id and the result code are added to the log records as the
+    ``epp_session_id``, ``epp_command_type``, ``epp_client_transaction_id`` and ``epp_result_code`` attributes, so
+    structured log formatters can pick them up.
+
+    Nothing is formatted for the commands which are not sampled or while the logger is disabled for the level.
+
+    .. code:: python
+
+        epp = EppCommunicator("epp.test.net.nz", "700", wire_trace=WireTrace(sample_rate=1000))
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = 100,
+        logger: Optional[logging.Logger] = None,
+        level: int = logging.INFO,
+    ) -> None:
+        """
+        :param sample_rate: One in every this number of commands is logged
+        :param logger: Logger of the traces. Defaults to the ``pyepp.wire`` logger.
+        :param level: Log level of the traces
+        """
+        if sample_rate < 1:
+            raise ValueError("Sample rate must be at least 1.")
+
+        self._sample_rate = sample_rate
+        self._logger = logger or logging.getLogger("pyepp.wire")
+        self._level = level
+        self._commands = itertools.count()
+
+    def sample(self) -> bool:
+        """
+        Check whether the next command is traced.
+
+        :return: True if the command is traced
+        :rtype: bool
+        """
+        return next(
+            self._commands
+        ) % self._sample_rate == 0 and self._logger.isEnabledFor(self._level)
+
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    def trace(
+        self,
+        session_id: str,
+        command: str,
+        response: Optional[Union[bytes, bytearray]],
+        result_code: Optional[int] = None,
+        client_transaction_id: Optional[str] = None,
+    ) -> None:
+        """
+        Log a command and its response.
+
+        :param session_id: Session id of the communicator
+        :param command: XML command
+        :param response: XML response. None if no response has been received.
+        :param result_code: Result code of the response
+        :param client_transaction_id: Client transaction id of the command
+        """
+        command_type = get_command_type(command)
+        self._logger.log(
+            self._level,
+            "EPP wire trace. Session: %s - Command: %s - Code: %s\n>>> %s\n<<< %s",
+            session_id,
+            command_type,
+            result_code,
+            _mask_passwords(command),
+            _mask_passwords(response.decode("utf-8", errors="replace"))
+            if response
+            else None,
+            extra={
+                "epp_session_id": session_id,
+                "epp_command_type": command_type,
+                "epp_client_transaction_id": client_transaction_id,
+                "epp_result_code": result_code,
+            },
+        )
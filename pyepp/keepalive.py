@@ -0,0 +1,121 @@
+"""
+EPP Keep-Alive Module. Registries drop the sessions which have been idle for a few minutes. A background thread sends
+a Hello command on the idle sessions before the server times them out, so they are still logged in for the next
+command.
+"""
+
+import logging
+import threading
+from typing import Optional
+
+from pyepp.epp import EppCommunicator, EppCommunicatorException
+
+
+class KeepAlive:
+    """
+    Keep registered EPP sessions alive in a background thread.
+
+    A Hello command is sent on a session once it has been idle for ``interval`` seconds. Sessions executing a command
+    are skipped, so the Hello command never interleaves with the frames of another command.
+
+    .. code:: python
+
+        with KeepAlive(interval=240) as keep_alive:
+            keep_alive.register(epp)
+            ...
+    """
+
+    def __init__(
+        self, interval: float = 240, check_interval: Optional[float] = None
+    ) -> None:
+        """
+        :param interval: Number of idle seconds after which a Hello command is sent. It must be shorter than the idle
+            timeout of the server.
+        :param check_interval: Number of seconds between checking the sessions. Defaults to a tenth of ``interval``.
+        """
+        if interval <= 0:
+            raise ValueError("Keep-alive interval must be positive.")
+
+        self._interval = interval
+        self._check_interval = (
+            check_interval if check_interval is not None else interval / 10
+        )
+
+        self._sessions: set[EppCommunicator] = set()
+        self._sessions_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "KeepAlive":
+        self.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the keep-alive thread is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def register(self, epp: EppCommunicator) -> None:
+        """Keep a session alive.
+
+        :param epp: EPP communicator
+        """
+        with self._sessions_lock:
+            self._sessions.add(epp)
+
+    def unregister(self, epp: EppCommunicator) -> None:
+        """Stop keeping a session alive. It is safe to call this for a session which is not registered.
+
+        :param epp: EPP communicator
+        """
+        with self._sessions_lock:
+            self._sessions.discard(epp)
+
+    def start(self) -> None:
+        """Start the keep-alive thread."""
+        if self.is_running:
+            return
+
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="pyepp-keep-alive", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the keep-alive thread and wait for it to finish."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def check(self) -> int:
+        """Send a Hello command on every registered session which has been idle for too long. Sessions failing the
+        Hello command are unregistered and closed, since a timeout or a partial read leaves the framing of the
+        connection out of sync. A session pool discards the closed sessions instead of handing them out again.
+
+        :return: Number of Hello commands sent
+        :rtype: int
+        """
+        with self._sessions_lock:
+            sessions = list(self._sessions)
+
+        sent = 0
+        for epp in sessions:
+            try:
+                if epp.keep_alive(self._interval):
+                    sent += 1
+            except (EppCommunicatorException, OSError) as ex:
+                logging.warning("Could not keep the EPP session alive. %s", str(ex))
+                self.unregister(epp)
+                epp.close()
+
+        return sent
+
+    def _run(self) -> None:
+        """Keep-alive thread loop."""
+        while not self._stopped.wait(self._check_interval):
+            self.check()
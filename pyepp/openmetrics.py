@@ -0,0 +1,395 @@
+"""
+EPP OpenMetrics Module. A command observer keeping counters and histograms of the EPP client in process, which can be
+rendered in the OpenMetrics text format or served on a local HTTP endpoint to be scraped by Prometheus.
+
+.. code:: python
+
+    collector = MetricsCollector()
+    epp = EppCommunicator("epp.test.net.nz", "700", observers=[collector])
+
+    with MetricsServer(collector, port=9464):
+        ...
+"""
+
+import bisect
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator, Optional
+
+from pyepp.instrumentation import CommandMetrics, CommandObserver
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# Upper bounds of the latency histogram buckets, in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Result code label of the commands which have not got a response
+ERROR_CODE = "error"
+
+
+def _escape_label(value: str) -> str:
+    """
+    Escape a label value.
+
+    :param value: Label value
+
+    :return: Escaped label value
+    :rtype: str
+    """
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_sample(
+    name: str, value: float, labels: Optional[dict[str, str]] = None
+) -> str:
+    """
+    Format a sample.
+
+    :param name: Sample name
+    :param value: Sample value
+    :param labels: Labels
+
+    :return: Sample line
+    :rtype: str
+    """
+    label_text = (
+        "{"
+        + ",".join(f'{key}="{_escape_label(label)}"' for key, label in labels.items())
+        + "}"
+        if labels
+        else ""
+    )
+    return f"{name}{label_text} {value!r}"
+
+
+# pylint: disable=too-few-public-methods
+class _Histogram:
+    """
+    A histogram of a label set. The bucket counts are not cumulative until rendered.
+    """
+
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self, size: int) -> None:
+        """
+        :param size: Number of buckets, including the +Inf bucket
+        """
+        self.counts = [0] * size
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, buckets: tuple[float, ...], value: float) -> None:
+        """
+        Observe a value.
+
+        :param buckets: Upper bounds of the buckets
+        :param value: Value
+        """
+        self.counts[bisect.bisect_left(buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+# pylint: disable=too-many-instance-attributes
+class MetricsCollector(CommandObserver):
+    """
+    Collect the metrics of the communicators it observes. A collector can be shared by several communicators, e.g.
+    all the sessions of a pool.
+
+    The metrics are:
+
+    * ``pyepp_commands_total``: Commands by type and result code. The code is ``error`` when no response has been
+      received.
+    * ``pyepp_command_duration_seconds``: Histogram of the command latency by type, from rendering the command to
+      parsing its response.
+    * ``pyepp_server_wait_seconds``: Histogram of the time waiting for the server by command type.
+    * ``pyepp_rate_limit_wait_seconds_total`` and ``pyepp_rate_limited_commands_total``: Time the commands have been
+      delayed by the rate limiter and the number of delayed commands.
+    * ``pyepp_sent_bytes_total`` and ``pyepp_received_bytes_total``: Bytes transferred.
+    * ``pyepp_sessions_open``: Logged-in sessions.
+    * ``pyepp_reconnects_total``: Lost connections which have been recovered.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        """
+        :param buckets: Upper bounds of the latency histogram buckets, in seconds
+        """
+        self._buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+
+        self._commands: dict[tuple[str, str], int] = {}
+        self._durations: dict[str, _Histogram] = {}
+        self._server_waits: dict[str, _Histogram] = {}
+        self._rate_limit_wait = 0.0
+        self._rate_limited = 0
+        self._bytes_sent = 0
+        self._bytes_received = 0
+        self._sessions_open = 0
+        self._reconnects = 0
+
+    def command_executed(self, metrics: CommandMetrics) -> None:
+        code = ERROR_CODE if metrics.result_code is None else str(metrics.result_code)
+        command_type = metrics.command_type
+
+        with self._lock:
+            key = (command_type, code)
+            self._commands[key] = self._commands.get(key, 0) + 1
+            self._histogram(self._durations, command_type).observe(
+                self._buckets, metrics.total_time
+            )
+            if metrics.result_code is not None:
+                self._histogram(self._server_waits, command_type).observe(
+                    self._buckets, metrics.server_time
+                )
+            if metrics.rate_limit_wait:
+                self._rate_limit_wait += metrics.rate_limit_wait
+                self._rate_limited += 1
+            self._bytes_sent += metrics.bytes_sent
+            self._bytes_received += metrics.bytes_received
+
+    def session_opened(self, session_id: str) -> None:
+        with self._lock:
+            self._sessions_open += 1
+
+    def session_closed(self, session_id: str) -> None:
+        with self._lock:
+            self._sessions_open -= 1
+
+    def reconnected(self, session_id: str) -> None:
+        with self._lock:
+            self._reconnects += 1
+
+    def _histogram(
+        self, histograms: dict[str, _Histogram], command_type: str
+    ) -> _Histogram:
+        """
+        Get the histogram of a command type, which is created on first use.
+
+        :param histograms: Histograms by command type
+        :param command_type: Command type
+
+        :return: Histogram
+        :rtype: _Histogram
+        """
+        histogram = histograms.get(command_type)
+        if histogram is None:
+            histogram = histograms[command_type] = _Histogram(len(self._buckets) + 1)
+        return histogram
+
+    def render(self) -> str:
+        """
+        Render the metrics in the OpenMetrics text format.
+
+        :return: Metrics
+        :rtype: str
+        """
+        with self._lock:
+            return "\n".join(self._render_lines()) + "\n"
+
+    def _render_lines(self) -> Iterator[str]:
+        """
+        Render the metrics line by line. The lock must be held.
+
+        :return: Lines
+        :rtype: Iterator[str]
+        """
+        yield "# TYPE pyepp_commands counter"
+        yield "# HELP pyepp_commands EPP commands executed."
+        for (command_type, code), count in sorted(self._commands.items()):
+            yield _format_sample(
+                "pyepp_commands_total", count, {"command": command_type, "code": code}
+            )
+
+        yield from self._render_histogram(
+            "pyepp_command_duration_seconds",
+            "Latency of the EPP commands.",
+            self._durations,
+        )
+        yield from self._render_histogram(
+            "pyepp_server_wait_seconds",
+            "Time waiting for the EPP server to respond.",
+            self._server_waits,
+        )
+
+        for name, metric_type, unit, help_text, value in (
+            (
+                "pyepp_rate_limit_wait_seconds",
+                "counter",
+                "seconds",
+                "Time the commands have been delayed by the rate limiter.",
+                self._rate_limit_wait,
+            ),
+            (
+                "pyepp_rate_limited_commands",
+                "counter",
+                "",
+                "Commands delayed by the rate limiter.",
+                self._rate_limited,
+            ),
+            (
+                "pyepp_sent_bytes",
+                "counter",
+                "bytes",
+                "Bytes sent to the EPP servers.",
+                self._bytes_sent,
+            ),
+            (
+                "pyepp_received_bytes",
+                "counter",
+                "bytes",
+                "Bytes received from the EPP servers.",
+                self._bytes_received,
+            ),
+            (
+                "pyepp_sessions_open",
+                "gauge",
+                "",
+                "Logged-in EPP sessions.",
+                self._sessions_open,
+            ),
+            (
+                "pyepp_reconnects",
+                "counter",
+                "",
+                "Lost connections which have been recovered.",
+                self._reconnects,
+            ),
+        ):
+            yield f"# TYPE {name} {metric_type}"
+            if unit:
+                yield f"# UNIT {name} {unit}"
+            yield f"# HELP {name} {help_text}"
+            yield _format_sample(
+                f"{name}_total" if metric_type == "counter" else name, value
+            )
+
+        yield "# EOF"
+
+    def _render_histogram(
+        self, name: str, help_text: str, histograms: dict[str, _Histogram]
+    ) -> Iterator[str]:
+        """
+        Render histograms by command type.
+
+        :param name: Metric name
+        :param help_text: Metric description
+        :param histograms: Histograms by command type
+
+        :return: Lines
+        :rtype: Iterator[str]
+        """
+        yield f"# TYPE {name} histogram"
+        yield f"# UNIT {name} seconds"
+        yield f"# HELP {name} {help_text}"
+        for command_type, histogram in sorted(histograms.items()):
+            cumulative = 0
+            for bound, count in zip(
+                (*(repr(bucket) for bucket in self._buckets), "+Inf"),
+                histogram.counts,
+            ):
+                cumulative += count
+                yield _format_sample(
+                    f"{name}_bucket", cumulative, {"command": command_type, "le": bound}
+                )
+            yield _format_sample(
+                f"{name}_count", histogram.count, {"command": command_type}
+            )
+            yield _format_sample(
+                f"{name}_sum", histogram.total, {"command": command_type}
+            )
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """
+    Serve the metrics of the collector of the server.
+    """
+
+    server: "_MetricsHttpServer"
+
+    # pylint: disable=invalid-name
+    def do_GET(self) -> None:
+        """Respond with the metrics."""
+        if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+
+        body = self.server.collector.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    # pylint: disable=redefined-builtin
+    def log_message(self, format: str, *args) -> None:
+        logging.debug(
+            "Metrics request from %s. " + format, self.address_string(), *args
+        )
+
+
+class _MetricsHttpServer(ThreadingHTTPServer):
+    """
+    HTTP server holding the collector for its handlers.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], collector: MetricsCollector) -> None:
+        super().__init__(address, _MetricsHandler)
+        self.collector = collector
+
+
+class MetricsServer:
+    """
+    Serve the metrics of a collector on ``/metrics`` from a background thread.
+    """
+
+    def __init__(
+        self, collector: MetricsCollector, host: str = "127.0.0.1", port: int = 0
+    ) -> None:
+        """
+        :param collector: Metrics collector
+        :param host: Address to listen on. The metrics are only served locally by default.
+        :param port: Port to listen on. A free port is picked if it is 0.
+        """
+        self._collector = collector
+        self._host = host
+        self._port = port
+        self._server: Optional[_MetricsHttpServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "MetricsServer":
+        self.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    @property
+    def address(self) -> tuple[str, int]:
+        """Host and port the server listens on."""
+        return self._host, self._port
+
+    def start(self) -> None:
+        """Start serving the metrics."""
+        if self._server is not None:
+            return
+
+        self._server = _MetricsHttpServer((self._host, self._port), self._collector)
+        self._port = self._server.server_address[1]
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="pyepp-metrics", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop serving the metrics."""
+        if self._server is None:
+            return
+
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        self._server = None
+        self._thread = None
@@ -0,0 +1,126 @@
+"""
+EPP response parser. A response is parsed once with lxml and the parsed tree is shared by the result parsing of the
+communicator and the object mappings. Lookups use namespace aware XPath expressions which are compiled once at import
+time.
+"""
+
+import threading
+from typing import Any, Optional, Union
+
+from lxml import etree
+
+NAMESPACES = {
+    "epp": "urn:ietf:params:xml:ns:epp-1.0",
+    "domain": "urn:ietf:params:xml:ns:domain-1.0",
+    "contact": "urn:ietf:params:xml:ns:contact-1.0",
+    "host": "urn:ietf:params:xml:ns:host-1.0",
+    "secDNS": "urn:ietf:params:xml:ns:secDNS-1.1",
+    "rgp": "urn:ietf:params:xml:ns:rgp-1.0",
+}
+
+# lxml parsers must not be shared between threads.
+_local = threading.local()
+
+
+def xpath(expression: str) -> etree.XPath:
+    """
+    Compile an XPath expression which can use the prefixes of ``NAMESPACES``.
+
+    :param expression: XPath expression
+
+    :return: Compiled XPath
+    :rtype: etree.XPath
+    """
+    return etree.XPath(expression, namespaces=NAMESPACES, smart_strings=False)
+
+
+RESULT = xpath("/epp:epp/epp:response/epp:result[1]")
+RESULT_MESSAGE = xpath("epp:msg")
+RESULT_REASON = xpath(".//epp:reason")
+CLIENT_TRANSACTION_ID = xpath("/epp:epp/epp:response/epp:trID/epp:clTRID")
+SERVER_TRANSACTION_ID = xpath("/epp:epp/epp:response/epp:trID/epp:svTRID")
+REPOSITORY_OBJECT_ID = xpath(
+    "/epp:epp/epp:response/epp:resData/*/*[local-name()='roid']"
+)
+
+
+def _get_parser() -> etree.XMLParser:
+    """
+    Get the XML parser of the current thread.
+
+    :return: XML parser
+    :rtype: etree.XMLParser
+    """
+    parser = getattr(_local, "parser", None)
+    if parser is None:
+        parser = etree.XMLParser(resolve_entities=False, no_network=True)
+        _local.parser = parser
+    return parser
+
+
+def parse_xml(raw_xml: Union[bytes, bytearray, str]) -> etree._Element:
+    """
+    Parse an XML document.
+
+    :param raw_xml: XML document
+
+    :return: Root element
+    :rtype: etree._Element
+    """
+    if isinstance(raw_xml, str):
+        raw_xml = raw_xml.encode("utf-8")
+    return etree.fromstring(raw_xml, _get_parser())
+
+
+def get_tree(result: Any) -> etree._Element:
+    """
+    Get the parsed response of a result object. The raw response is only parsed if it has not been parsed yet.
+
+    :param result: Result object
+
+    :return: Root element of the response
+    :rtype: etree._Element
+    """
+    if result.xml_tree is None:
+        result.xml_tree = parse_xml(result.raw_response)
+    return result.xml_tree
+
+
+def find(expression: etree.XPath, node: etree._Element) -> Optional[etree._Element]:
+    """
+    Find the first node matching an XPath expression.
+
+    :param expression: Compiled XPath
+    :param node: Context node
+
+    :return: The first matching node if any
+    :rtype: Optional[etree._Element]
+    """
+    found = expression(node)
+    return found[0] if found else None
+
+
+def find_text(expression: etree.XPath, node: etree._Element) -> Optional[str]:
+    """
+    Get the text of the first element matching an XPath expression.
+
+    :param expression: Compiled XPath
+    :param node: Context node
+
+    :return: Text of the element, an empty string if the element has no text or None if there is no such element
+    :rtype: Optional[str]
+    """
+    found = expression(node)
+    return text(found[0]) if found else None
+
+
+def text(element: etree._Element) -> str:
+    """
+    Get all the text content of an element.
+
+    :param element: Element
+
+    :return: Text content
+    :rtype: str
+    """
+    return "".join(element.itertext())
@@ -3,16 +3,18 @@ EPP Poll Module
 """
 
 from dataclasses import asdict, dataclass
-from typing import List, Optional
+from typing import Any, Callable, Iterator, List, Optional
 
-from bs4 import BeautifulSoup
-
-from pyepp import EppResultCode, EppResultData
-from pyepp.base_command import BaseCommand
+from pyepp import EppResultCode, EppResultData, parser
+from pyepp.base_command import BaseCommand, ErrorCodeInResultException
 from pyepp.command_templates import POLL_REQUEST_XML, POLL_ACK_XML
 
+_MESSAGE_QUEUE = parser.xpath("/epp:epp/epp:response/epp:msgQ")
+_QUEUE_DATE = parser.xpath("epp:qDate")
+_MESSAGES = parser.xpath("epp:msg")
+
 
-@dataclass
+@dataclass(slots=True)
 class ServiceMessageData:
     """Service message data class."""
 
@@ -20,7 +22,7 @@ class ServiceMessageData:
     message: str
 
 
-@dataclass
+@dataclass(slots=True)
 class ServiceMessageQueueData:
     """Service message queue data class."""
 
@@ -60,30 +62,36 @@ class Poll(BaseCommand):
             POLL_REQUEST_XML, client_transaction_id=client_transaction_id
         )
 
+        return self._parse_request(result)
+
+    def _parse_request(self, result: EppResultData) -> EppResultData:
+        """Parse the poll request response into the result data.
+
+        :param result: Result object
+
+        :return: Result object
+        :rtype: EppResultData
+        """
         if int(result.code) != int(EppResultCode.SUCCESS_ACK_TO_DEQUEUE.value):
-            return result
+            return self._release_tree(result)
 
-        message_queue = BeautifulSoup(result.raw_response, "xml")
+        message_queue = parser.find(_MESSAGE_QUEUE, parser.get_tree(result))
 
         result_date = {
-            "message_count": int(message_queue.find("msgQ").get("count")),
-            "message_id": int(message_queue.find("msgQ").get("id")),
-            "queue_date": message_queue.find("qDate").text,
-            "messages": (
-                [
-                    ServiceMessageData(
-                        language=message.get("lang"), message=message.text
-                    )
-                    for message in message_queue.find_all("msg")[1:]
-                ]
-                if message_queue.find("msg")
-                else None
-            ),
+            "message_count": int(message_queue.get("count")),
+            "message_id": int(message_queue.get("id")),
+            "queue_date": parser.find_text(_QUEUE_DATE, message_queue),
+            "messages": [
+                ServiceMessageData(
+                    language=message.get("lang"), message=parser.text(message)
+                )
+                for message in _MESSAGES(message_queue)
+            ],
         }
 
         result.result_data = ServiceMessageQueueData(**result_date)
 
-        return result
+        return self._release_tree(result)
 
     def acknowledge(
         self, message_id: int, client_transaction_id: Optional[str] = None
@@ -103,16 +111,91 @@ class Poll(BaseCommand):
             client_transaction_id=client_transaction_id,
         )
 
+        return self._parse_acknowledge(result)
+
+    def _parse_acknowledge(self, result: EppResultData) -> EppResultData:
+        """Parse the poll acknowledge response into the result data.
+
+        :param result: Result object
+
+        :return: Result object
+        :rtype: EppResultData
+        """
         if int(result.code) != int(EppResultCode.SUCCESS.value):
-            return result
+            return self._release_tree(result)
 
-        message_queue = BeautifulSoup(result.raw_response, "xml")
+        message_queue = parser.find(_MESSAGE_QUEUE, parser.get_tree(result))
+        if message_queue is None:
+            return self._release_tree(result)
 
         result_date = {
-            "message_count": int(message_queue.find("msgQ").get("count")),
-            "message_id": int(message_queue.find("msgQ").get("id")),
+            "message_count": int(message_queue.get("count")),
+            "message_id": int(message_queue.get("id")),
         }
 
         result.result_data = ServiceMessageQueueData(**result_date)
 
-        return result
+        return self._release_tree(result)
+
+    def drain(
+        self,
+        callback: Optional[Callable[[ServiceMessageQueueData], Any]] = None,
+        pipelined: bool = False,
+    ) -> Iterator[ServiceMessageQueueData]:
+        """Retrieve and acknowledge all the messages of the poll queue, until the queue is empty.
+
+        A message is acknowledged once the consumer asks for the next one, and after the callback has succeeded if
+        there is any. A message is left in the queue when its callback raises an exception or when the consumer stops
+        before asking for the next message.
+
+        .. code:: python
+
+            for message in Poll(epp).drain(pipelined=True):
+                print(message.message_id, message.messages)
+
+        :param callback: Called with every message before it is acknowledged
+        :param pipelined: Send the acknowledgement of a message and the request for the next message together
+
+        :return: Messages
+        :rtype: Iterator[ServiceMessageQueueData]
+
+        :raises ErrorCodeInResultException: When a poll command is not successful
+        """
+        result = self.request()
+
+        while int(result.code) != int(EppResultCode.SUCCESS_NO_MESSAGE.value):
+            if int(result.code) != int(EppResultCode.SUCCESS_ACK_TO_DEQUEUE.value):
+                raise ErrorCodeInResultException(
+                    f"Poll request failed with code {result.code}: {result.message}"
+                )
+
+            message = result.result_data
+            if callback is not None:
+                callback(message)
+            yield message
+
+            if pipelined:
+                acknowledge, result = self.execute_pipelined(
+                    [
+                        (POLL_ACK_XML, {"message_id": message.message_id}),
+                        (POLL_REQUEST_XML, {}),
+                    ],
+                    window=2,
+                )
+                self._check_acknowledge(self._parse_acknowledge(acknowledge))
+                result = self._parse_request(result)
+            else:
+                self._check_acknowledge(self.acknowledge(message.message_id))
+                result = self.request()
+
+    def _check_acknowledge(self, result: EppResultData) -> None:
+        """Check the result of a poll acknowledge command.
+
+        :param result: Result object
+
+        :raises ErrorCodeInResultException: When the message has not been acknowledged
+        """
+        if int(result.code) != int(EppResultCode.SUCCESS.value):
+            raise ErrorCodeInResultException(
+                f"Poll acknowledge failed with code {result.code}: {result.message}"
+            )
@@ -0,0 +1,304 @@
+"""
+EPP Session Pool Module. Keeps a number of logged-in EPP sessions alive and hands them out to the callers, so the
+TLS handshake and the login round trip are paid once per session instead of once per command.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from pyepp.epp import (
+    EppCommunicator,
+    EppCommunicatorException,
+    EppSessionLimitExceededException,
+    RawResponsePolicy,
+)
+from pyepp.instrumentation import CommandObserver, WireTrace
+from pyepp.keepalive import KeepAlive
+from pyepp.ratelimit import RateLimiter
+
+
+class SessionPoolException(EppCommunicatorException):
+    """
+    Session pool exception.
+    """
+
+
+# pylint: disable=too-many-instance-attributes
+class SessionPool:
+    """
+    A thread safe pool of logged-in EPP sessions.
+
+    Sessions are opened lazily up to ``size`` and reused afterwards. When the server refuses a login with
+    ``SESSION_LIMIT_EXCEEDED_CLOSING_CONNECTION`` (2502), the pool lowers its size to the number of sessions which are
+    already open and makes the callers wait for one of them instead. Sessions which have been closed by the server or
+    failed with a communication error are replaced transparently.
+
+    .. code:: python
+
+        with SessionPool("epp.test.net.nz", "700", "user", "password", size=4) as pool:
+            with pool.session() as epp:
+                Domain(epp).check(["example.nz"])
+    """
+
+    # pylint: disable=too-many-arguments,too-many-locals
+    def __init__(
+        self,
+        server: str,
+        port: str,
+        user: str,
+        password: str,
+        client_cert: Optional[str] = None,
+        client_key: Optional[str] = None,
+        extensions: Optional[list[str]] = None,
+        size: int = 1,
+        timeout: Optional[float] = None,
+        max_idle: Optional[float] = None,
+        keep_alive_interval: Optional[float] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        raw_response_policy: RawResponsePolicy = RawResponsePolicy.KEEP,
+        observers: Optional[list[CommandObserver]] = None,
+        wire_trace: Optional[WireTrace] = None,
+    ) -> None:
+        """
+        :param server: EPP server to connect to.
+        :param port: EPP port to connect to.
+        :param user: username
+        :param password: password
+        :param client_cert: Path to client certificate
+        :param client_key: Path to client key
+        :param extensions: A list of supported extension URIs
+        :param size: Maximum number of sessions to be kept open
+        :param timeout: Maximum number of seconds to wait for a free session. Waits forever if it is None.
+        :param max_idle: Sessions idle for longer than this number of seconds are checked with a hello command
+            before being handed out. Sessions are not checked if it is None.
+        :param keep_alive_interval: Send a Hello command on the sessions which have been idle for this number of
+            seconds, from a background thread. Sessions are not kept alive if it is None.
+        :param rate_limiter: Rate limiter shared by all the sessions of the pool
+        :param raw_response_policy: Retention policy of the raw responses in the result objects
+        :param observers: Observers notified of the metrics of every command executed by the sessions
+        :param wire_trace: Wire trace logging the XML of a sample of the commands of all the sessions
+        """
+        if size < 1:
+            raise ValueError("Pool size must be at least 1.")
+
+        self._server = server
+        self._port = port
+        self._user = user
+        self._password = password
+        self._client_cert = client_cert
+        self._client_key = client_key
+        self._extensions = extensions
+        self._rate_limiter = rate_limiter
+        self._raw_response_policy = raw_response_policy
+        self._observers = observers
+        self._wire_trace = wire_trace
+
+        self._size = size
+        self._timeout = timeout
+        self._max_idle = max_idle
+
+        self._condition = threading.Condition()
+        self._idle: deque[tuple[EppCommunicator, float]] = deque()
+        self._open = 0
+        self._closed = False
+
+        self._keep_alive = None
+        if keep_alive_interval is not None:
+            self._keep_alive = KeepAlive(keep_alive_interval)
+            self._keep_alive.start()
+
+    @property
+    def size(self) -> int:
+        """Maximum number of sessions. It may be lowered when the server enforces a smaller session limit."""
+        return self._size
+
+    @property
+    def open_sessions(self) -> int:
+        """Number of sessions which are currently open, either idle or in use."""
+        return self._open
+
+    def __enter__(self) -> "SessionPool":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def _new_session(self) -> EppCommunicator:
+        """Open a new session and log in.
+
+        :return: Logged-in EPP communicator
+        :rtype: EppCommunicator
+        """
+        epp = EppCommunicator(
+            self._server,
+            self._port,
+            self._client_cert,
+            self._client_key,
+            rate_limiter=self._rate_limiter,
+            raw_response_policy=self._raw_response_policy,
+            observers=self._observers,
+            wire_trace=self._wire_trace,
+        )
+        epp.connect()
+        try:
+            epp.login(self._user, self._password, extensions=self._extensions)
+        except EppCommunicatorException:
+            epp.close()
+            raise
+
+        if self._keep_alive is not None:
+            self._keep_alive.register(epp)
+
+        return epp
+
+    def _is_usable(self, epp: EppCommunicator, last_used: float) -> bool:
+        """Check whether an idle session can be handed out.
+
+        :param epp: EPP communicator
+        :param last_used: The time the session was released to the pool
+
+        :return: True if the session is still alive
+        :rtype: bool
+        """
+        if not epp.is_connected:
+            return False
+
+        if self._max_idle is not None and time.monotonic() - last_used > self._max_idle:
+            try:
+                epp.hello()
+            except (EppCommunicatorException, OSError) as ex:
+                logging.info("Idle EPP session is not alive anymore. %s", str(ex))
+                return False
+
+        return True
+
+    def acquire(self) -> EppCommunicator:
+        """Get a logged-in session from the pool. The session must be given back by calling ``release``.
+
+        :return: Logged-in EPP communicator
+        :rtype: EppCommunicator
+
+        :raises SessionPoolException: When no session becomes available in time or the pool is closed
+        """
+        deadline = None if self._timeout is None else time.monotonic() + self._timeout
+
+        while True:
+            with self._condition:
+                epp, last_used = self._wait_for_session(deadline)
+
+            if epp is not None:
+                if self._is_usable(epp, last_used):
+                    return epp
+                self._discard(epp)
+                continue
+
+            try:
+                return self._new_session()
+            except EppSessionLimitExceededException:
+                with self._condition:
+                    self._open -= 1
+                    if self._open == 0:
+                        raise
+                    self._size = self._open
+                    logging.warning(
+                        "Session limit exceeded. Pool size is lowered to %s.", self._size
+                    )
+            except Exception:
+                with self._condition:
+                    self._open -= 1
+                    self._condition.notify()
+                raise
+
+    def _wait_for_session(
+        self, deadline: Optional[float]
+    ) -> tuple[Optional[EppCommunicator], float]:
+        """Wait until there is an idle session or room for a new one. Must be called holding the condition lock.
+
+        :param deadline: Monotonic time to give up waiting
+
+        :return: An idle session and its last used time, or None if a new session must be opened
+        :rtype: tuple
+        """
+        while True:
+            if self._closed:
+                raise SessionPoolException("Session pool is closed!")
+
+            if self._idle:
+                return self._idle.pop()
+
+            if self._open < self._size:
+                self._open += 1
+                return None, 0.0
+
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                raise SessionPoolException("Timed out waiting for a free EPP session!")
+            self._condition.wait(remaining)
+
+    def release(self, epp: EppCommunicator, discard: bool = False) -> None:
+        """Give a session back to the pool.
+
+        :param epp: EPP communicator obtained from ``acquire``
+        :param discard: Close the session instead of reusing it
+        """
+        if discard or self._closed or not epp.is_connected:
+            self._discard(epp)
+            return
+
+        with self._condition:
+            self._idle.append((epp, time.monotonic()))
+            self._condition.notify()
+
+    def _discard(self, epp: EppCommunicator) -> None:
+        """Close a session and free its slot in the pool.
+
+        :param epp: EPP communicator
+        """
+        if self._keep_alive is not None:
+            self._keep_alive.unregister(epp)
+
+        epp.close()
+        with self._condition:
+            self._open -= 1
+            self._condition.notify()
+
+    @contextmanager
+    def session(self) -> Iterator[EppCommunicator]:
+        """Borrow a logged-in session for the duration of the ``with`` block. A session which fails with a
+        communication error is closed and replaced on the next request.
+
+        :return: Logged-in EPP communicator
+        :rtype: Iterator[EppCommunicator]
+        """
+        epp = self.acquire()
+        try:
+            yield epp
+        except (EppCommunicatorException, OSError):
+            self.release(epp, discard=True)
+            raise
+        except BaseException:
+            self.release(epp)
+            raise
+        self.release(epp)
+
+    def close(self) -> None:
+        """Log out all the idle sessions and close the pool. Sessions in use are closed when they are released."""
+        if self._keep_alive is not None:
+            self._keep_alive.stop()
+
+        with self._condition:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._condition.notify_all()
+
+        for epp, _ in idle:
+            try:
+                epp.logout()
+            except EppCommunicatorException as ex:
+                logging.debug("Could not log out the session. %s", str(ex))
+            self._discard(epp)
@@ -0,0 +1,151 @@
+"""
+EPP Rate Limit Module. Registries enforce a maximum command rate per registrar and throttle or disconnect the clients
+exceeding it. The rate limiter delays the commands just enough to stay within the allowed rates.
+"""
+
+import math
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import Optional
+
+# Command type used for the commands whose type is unknown
+OTHER_COMMANDS = "other"
+
+
+@dataclass
+class RateLimitMetrics:
+    """Rate limiter metrics of a command type."""
+
+    commands: int = 0
+    throttled: int = 0
+    wait_time: float = 0.0
+
+
+class TokenBucket:
+    """
+    A thread safe token bucket. Tokens are added at ``rate`` per second up to ``capacity``. Every command takes a
+    token and waits for it if the bucket is empty. Callers are served in the order they arrive.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[int] = None) -> None:
+        """
+        :param rate: Number of tokens added per second
+        :param capacity: Maximum number of tokens, which is the size of the allowed bursts. Defaults to the number of
+            tokens added in one second.
+        """
+        if rate <= 0:
+            raise ValueError("Rate must be positive.")
+
+        self._rate = rate
+        self._capacity = capacity if capacity is not None else max(1, math.ceil(rate))
+        if self._capacity < 1:
+            raise ValueError("Capacity must be at least 1.")
+
+        self._tokens = float(self._capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self) -> float:
+        """Number of tokens added per second."""
+        return self._rate
+
+    def reserve(self) -> float:
+        """Take a token. The bucket may go into debt, which the following callers have to wait for.
+
+        :return: Number of seconds to wait before the token can be used
+        :rtype: float
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self._capacity, self._tokens + (now - self._updated) * self._rate
+            )
+            self._updated = now
+
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self._rate
+
+
+class RateLimiter:
+    """
+    Limit the rate of the EPP commands. A limiter can be shared by several communicators and threads, e.g. all the
+    sessions of a pool, to enforce the rate limit of the registrar.
+
+    A command waits for the overall limit and for the limit of its type, e.g. ``check``, ``create`` or ``info``.
+
+    .. code:: python
+
+        rate_limiter = RateLimiter(rate=50, command_rates={"check": 20, "create": 5})
+        epp = EppCommunicator("epp.test.net.nz", "700", rate_limiter=rate_limiter)
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        burst: Optional[int] = None,
+        command_rates: Optional[dict[str, float]] = None,
+    ) -> None:
+        """
+        :param rate: Maximum number of commands per second. The overall rate is not limited if it is None.
+        :param burst: Maximum number of commands sent at once after being idle. Defaults to one second of commands.
+        :param command_rates: Maximum number of commands per second by command type
+        """
+        self._bucket = TokenBucket(rate, burst) if rate is not None else None
+        self._command_buckets = {
+            command_type: TokenBucket(command_rate)
+            for command_type, command_rate in (command_rates or {}).items()
+        }
+
+        self._metrics: dict[str, RateLimitMetrics] = {}
+        self._metrics_lock = threading.Lock()
+
+    def acquire(self, command_type: Optional[str] = None) -> float:
+        """Wait until a command can be sent.
+
+        :param command_type: Type of the command, e.g. ``check`` or ``create``
+
+        :return: Number of seconds waited
+        :rtype: float
+        """
+        command_type = command_type or OTHER_COMMANDS
+
+        wait_time = 0.0
+        if self._bucket is not None:
+            wait_time = self._bucket.reserve()
+        bucket = self._command_buckets.get(command_type)
+        if bucket is not None:
+            wait_time = max(wait_time, bucket.reserve())
+
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+        with self._metrics_lock:
+            metrics = self._metrics.setdefault(command_type, RateLimitMetrics())
+            metrics.commands += 1
+            if wait_time > 0:
+                metrics.throttled += 1
+                metrics.wait_time += wait_time
+
+        return wait_time
+
+    def get_metrics(self) -> dict[str, RateLimitMetrics]:
+        """Get the number of commands, the number of throttled commands and the time spent waiting by command type.
+
+        :return: Metrics by command type
+        :rtype: dict[str, RateLimitMetrics]
+        """
+        with self._metrics_lock:
+            return {
+                command_type: replace(metrics)
+                for command_type, metrics in self._metrics.items()
+            }
+
+    @property
+    def wait_time(self) -> float:
+        """Total number of seconds the commands have waited."""
+        with self._metrics_lock:
+            return sum(metrics.wait_time for metrics in self._metrics.values())
@@ -0,0 +1,816 @@
+"""
+EPP Testing Module. A local EPP server speaking the RFC 5734 framing over TLS, with canned or scripted responses to
+the commands of pyepp. It is used by the benchmarks and lets the clients be exercised without a registry, including
+their handling of failed logins, slow responses and dropped connections.
+"""
+
+import logging
+import os
+import re
+import shutil
+import socket
+import ssl
+import struct
+import subprocess  # nosec B404
+import tempfile
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Optional, Union
+from xml.sax.saxutils import escape
+
+from lxml import etree
+
+from pyepp import parser
+from pyepp.epp import (
+    CLOSING_CONNECTION_CODES,
+    LENGTH_FIELD_SIZE,
+    EppResultCode,
+    get_format_32,
+)
+
+_EPP = "urn:ietf:params:xml:ns:epp-1.0"
+_COMMAND = parser.xpath("/epp:epp/epp:command/*[1]")
+_CLIENT_TRANSACTION_ID = parser.xpath("/epp:epp/epp:command/epp:clTRID")
+_HELLO = parser.xpath("/epp:epp/epp:hello")
+_LOGIN_CLIENT_ID = parser.xpath("/epp:epp/epp:command/epp:login/epp:clID")
+_LOGIN_PASSWORD = parser.xpath("/epp:epp/epp:command/epp:login/epp:pw")
+_RESULT_CODE = re.compile(r'<result\s+code="(\d+)"')
+# The connection is closed after responding with any of these codes
+_CLOSING_CODES = (EppResultCode.SUCCESS_END_SESSION.value, *CLOSING_CONNECTION_CODES)
+
+# Object type by the namespace of the object commands
+_OBJECT_TYPES = {
+    "urn:ietf:params:xml:ns:domain-1.0": "domain",
+    "urn:ietf:params:xml:ns:contact-1.0": "contact",
+    "urn:ietf:params:xml:ns:host-1.0": "host",
+}
+
+GREETING_XML = f"""<?xml version="1.0" encoding="UTF-8" standalone="no"?>
+<epp xmlns="{_EPP}">
+  <greeting>
+    <svID>pyepp mock server</svID>
+    <svDate>2024-01-01T00:00:00.0Z</svDate>
+    <svcMenu>
+      <version>1.0</version>
+      <lang>en</lang>
+      <objURI>urn:ietf:params:xml:ns:domain-1.0</objURI>
+      <objURI>urn:ietf:params:xml:ns:contact-1.0</objURI>
+      <objURI>urn:ietf:params:xml:ns:host-1.0</objURI>
+      <svcExtension>
+        <extURI>urn:ietf:params:xml:ns:secDNS-1.1</extURI>
+      </svcExtension>
+    </svcMenu>
+  </greeting>
+</epp>"""
+
+# Response data of the object commands by object type and command. Formatted with the object name.
+_INFO_DATA = {
+    "domain": """<domain:infData xmlns:domain="urn:ietf:params:xml:ns:domain-1.0">
+        <domain:name>{name}</domain:name>
+        <domain:roid>1-MOCK</domain:roid>
+        <domain:status s="ok"/>
+        <domain:registrant>registrant</domain:registrant>
+        <domain:contact type="admin">admin</domain:contact>
+        <domain:contact type="tech">tech</domain:contact>
+        <domain:ns>
+          <domain:hostObj>ns1.example.nz</domain:hostObj>
+          <domain:hostObj>ns2.example.nz</domain:hostObj>
+        </domain:ns>
+        <domain:clID>registrar</domain:clID>
+        <domain:crID>registrar</domain:crID>
+        <domain:crDate>2024-01-01T00:00:00.0Z</domain:crDate>
+        <domain:exDate>2025-01-01T00:00:00.0Z</domain:exDate>
+        <domain:authInfo>
+          <domain:pw>password</domain:pw>
+        </domain:authInfo>
+      </domain:infData>""",
+    "contact": """<contact:infData xmlns:contact="urn:ietf:params:xml:ns:contact-1.0">
+        <contact:id>{name}</contact:id>
+        <contact:roid>1-MOCK</contact:roid>
+        <contact:status s="ok"/>
+        <contact:postalInfo type="int">
+          <contact:name>Mock Contact</contact:name>
+          <contact:org>InternetNZ</contact:org>
+          <contact:addr>
+            <contact:street>18 Willis Street</contact:street>
+            <contact:city>Wellington</contact:city>
+            <contact:pc>6011</contact:pc>
+            <contact:cc>NZ</contact:cc>
+          </contact:addr>
+        </contact:postalInfo>
+        <contact:voice>+64.41234567</contact:voice>
+        <contact:email>contact@example.nz</contact:email>
+        <contact:clID>registrar</contact:clID>
+        <contact:crID>registrar</contact:crID>
+        <contact:crDate>2024-01-01T00:00:00.0Z</contact:crDate>
+      </contact:infData>""",
+    "host": """<host:infData xmlns:host="urn:ietf:params:xml:ns:host-1.0">
+        <host:name>{name}</host:name>
+        <host:roid>1-MOCK</host:roid>
+        <host:status s="ok"/>
+        <host:addr ip="v4">192.0.2.1</host:addr>
+        <host:clID>registrar</host:clID>
+        <host:crID>registrar</host:crID>
+        <host:crDate>2024-01-01T00:00:00.0Z</host:crDate>
+      </host:infData>""",
+}
+
+_CREATE_DATA = {
+    "domain": """<domain:creData xmlns:domain="urn:ietf:params:xml:ns:domain-1.0">
+        <domain:name>{name}</domain:name>
+        <domain:crDate>2024-01-01T00:00:00.0Z</domain:crDate>
+        <domain:exDate>2025-01-01T00:00:00.0Z</domain:exDate>
+      </domain:creData>""",
+    "contact": """<contact:creData xmlns:contact="urn:ietf:params:xml:ns:contact-1.0">
+        <contact:id>{name}</contact:id>
+        <contact:crDate>2024-01-01T00:00:00.0Z</contact:crDate>
+      </contact:creData>""",
+    "host": """<host:creData xmlns:host="urn:ietf:params:xml:ns:host-1.0">
+        <host:name>{name}</host:name>
+        <host:crDate>2024-01-01T00:00:00.0Z</host:crDate>
+      </host:creData>""",
+}
+
+_MESSAGE_QUEUE = """<msgQ count="1" id="1">
+      <qDate>2024-01-01T00:00:00.0Z</qDate>
+      <msg lang="en">Mock service message</msg>
+    </msgQ>"""
+
+
+# A scripted response. Either the XML response, a function creating it from the XML command or None to close the
+# connection without responding.
+MockResponse = Union[str, Callable[[bytes], Optional[str]], None]
+
+
+@dataclass(slots=True)
+class MockSession:
+    """State of a connection to the mock EPP server."""
+
+    logged_in: bool = False
+    user: Optional[str] = None
+    commands: int = 0
+
+
+def _get_result_code(response: str) -> Optional[int]:
+    """
+    Get the result code of a response.
+
+    :param response: XML response
+
+    :return: Result code if any
+    :rtype: Optional[int]
+    """
+    match = _RESULT_CODE.search(response)
+    return int(match.group(1)) if match else None
+
+
+class MockEppServerException(Exception):
+    """
+    Mock EPP server exception.
+    """
+
+
+def generate_certificate(directory: str) -> tuple[str, str]:
+    """
+    Generate a self-signed certificate for ``localhost`` and ``127.0.0.1`` with the ``openssl`` command.
+
+    :param directory: Directory the certificate and key files are written to
+
+    :return: Paths of the certificate and key files
+    :rtype: tuple[str, str]
+
+    :raises MockEppServerException: When the certificate cannot be generated
+    """
+    openssl = shutil.which("openssl")
+    if openssl is None:
+        raise MockEppServerException(
+            "The openssl command is required to generate a certificate."
+        )
+
+    certfile = os.path.join(directory, "cert.pem")
+    keyfile = os.path.join(directory, "key.pem")
+    try:
+        subprocess.run(  # nosec B603
+            [
+                openssl,
+                "req",
+                "-x509",
+                "-newkey",
+                "ec",
+                "-pkeyopt",
+                "ec_paramgen_curve:prime256v1",
+                "-nodes",
+                "-days",
+                "1",
+                "-subj",
+                "/CN=localhost",
+                "-addext",
+                "subjectAltName=DNS:localhost,IP:127.0.0.1",
+                "-keyout",
+                keyfile,
+                "-out",
+                certfile,
+            ],
+            check=True,
+            capture_output=True,
+        )
+    except subprocess.CalledProcessError as ex:
+        raise MockEppServerException(
+            f"Could not generate a certificate. {ex.stderr.decode(errors='replace')}"
+        ) from ex
+
+    return certfile, keyfile
+
+
+def create_client_ssl_context(certfile: str) -> ssl.SSLContext:
+    """
+    Create a TLS context for the clients, which trusts a server certificate.
+
+    :param certfile: Path to the server certificate
+
+    :return: SSL context
+    :rtype: ssl.SSLContext
+    """
+    return ssl.create_default_context(cafile=certfile)
+
+
+def create_response(
+    code: int,
+    message: str,
+    client_transaction_id: Optional[str] = None,
+    res_data: str = "",
+    message_queue: str = "",
+) -> str:
+    """
+    Create an EPP response.
+
+    :param code: Result code
+    :param message: Result message
+    :param client_transaction_id: Client transaction id of the command
+    :param res_data: Content of the resData element
+    :param message_queue: msgQ element
+
+    :return: XML response
+    :rtype: str
+    """
+    res_data = f"<resData>{res_data}</resData>" if res_data else ""
+    client_transaction_id = (
+        f"<clTRID>{escape(client_transaction_id)}</clTRID>"
+        if client_transaction_id
+        else ""
+    )
+
+    return f"""<?xml version="1.0" encoding="UTF-8" standalone="no"?>
+<epp xmlns="{_EPP}">
+  <response>
+    <result code="{code}">
+      <msg>{escape(message)}</msg>
+    </result>
+    {message_queue}
+    {res_data}
+    <trID>
+      {client_transaction_id}
+      <svTRID>MOCK-1</svTRID>
+    </trID>
+  </response>
+</epp>"""
+
+
+def _check_data(object_type: str, names: list[str]) -> str:
+    """
+    Create the check data of an object check response. All the objects are available.
+
+    :param object_type: Object type
+    :param names: Object names or ids
+
+    :return: chkData element
+    :rtype: str
+    """
+    namespace = next(
+        namespace for namespace, name in _OBJECT_TYPES.items() if name == object_type
+    )
+    name_tag = "id" if object_type == "contact" else "name"
+    check_data = "".join(
+        f'<{object_type}:cd><{object_type}:{name_tag} avail="true">{escape(name)}'
+        f"</{object_type}:{name_tag}></{object_type}:cd>"
+        for name in names
+    )
+    return f'<{object_type}:chkData xmlns:{object_type}="{namespace}">{check_data}</{object_type}:chkData>'
+
+
+def command_key(tree: etree._Element) -> Optional[str]:
+    """
+    Get the key of a command, which responses are scripted by. It is ``hello``, ``login``, ``logout``, ``poll:req``,
+    ``poll:ack`` or the object type and the command type of the object commands, e.g. ``domain:check``.
+
+    :param tree: XML command
+
+    :return: Command key. None if it is not a command.
+    :rtype: Optional[str]
+    """
+    if parser.find(_HELLO, tree) is not None:
+        return "hello"
+
+    command_node = parser.find(_COMMAND, tree)
+    if command_node is None:
+        return None
+
+    command_type = etree.QName(command_node).localname
+    if command_type == "poll":
+        return f"poll:{command_node.get('op')}"
+
+    object_type = (
+        _OBJECT_TYPES.get(etree.QName(command_node[0]).namespace)
+        if len(command_node)
+        else None
+    )
+    return f"{object_type}:{command_type}" if object_type else command_type
+
+
+class MockEppServer:
+    """
+    A local EPP server running in background threads. The framing is the same as the EPP servers, so the network code
+    of the clients is exercised as well. By default it accepts any login and answers the object commands with canned
+    successful responses. The greeting, the accepted credentials, the session limit, the responses to every command
+    and the latency are configurable, and the connections can be dropped, so failures can be tested too.
+
+    .. code:: python
+
+        with MockEppServer(users={"user": "password"}) as server:
+            server.script("domain:info", create_response(2303, "Object does not exist"))
+            epp = EppCommunicator(*server.address, ssl_context=server.client_ssl_context())
+            epp.connect()
+            epp.login("user", "password")
+            Domain(epp).info("example.nz")
+    """
+
+    # pylint: disable=too-many-instance-attributes,too-many-arguments,too-many-positional-arguments
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        certfile: Optional[str] = None,
+        keyfile: Optional[str] = None,
+        greeting: str = GREETING_XML,
+        users: Optional[dict[str, str]] = None,
+        max_sessions: Optional[int] = None,
+        responses: Optional[dict[str, MockResponse]] = None,
+        latency: float = 0.0,
+    ) -> None:
+        """
+        :param host: Address to listen on
+        :param port: Port to listen on. A free port is picked if it is 0.
+        :param certfile: Path to the server certificate. A self-signed certificate is generated if it is None.
+        :param keyfile: Path to the server key
+        :param greeting: XML greeting sent on connection and in response to the Hello command
+        :param users: Passwords by client id. Any login is accepted if it is None.
+        :param max_sessions: Maximum number of logged-in sessions. Unlimited if it is None.
+        :param responses: Responses by command key, used for every command instead of the canned ones
+        :param latency: Delay before every response, in seconds
+        """
+        self._host = host
+        self._port = port
+        self._certfile = certfile
+        self._keyfile = keyfile
+        self._greeting = greeting
+        self._users = users
+        self._max_sessions = max_sessions
+        self._responses = dict(responses or {})
+        self._scripts: dict[str, deque[MockResponse]] = {}
+        self.latency = latency
+
+        self._format_32 = get_format_32()
+        self._temporary_directory: Optional[tempfile.TemporaryDirectory] = None
+        self._listener: Optional[socket.socket] = None
+        self._stopped = threading.Event()
+        self._threads: list[threading.Thread] = []
+        self._connections: set[socket.socket] = set()
+        self._lock = threading.Lock()
+
+        # Number of connections accepted, commands answered and sessions logged in
+        self.connections = 0
+        self.commands = 0
+        self.sessions = 0
+
+    def __enter__(self) -> "MockEppServer":
+        self.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    @property
+    def address(self) -> tuple[str, int]:
+        """Host and port the server listens on."""
+        return self._host, self._port
+
+    @property
+    def certfile(self) -> Optional[str]:
+        """Path to the server certificate."""
+        return self._certfile
+
+    def client_ssl_context(self) -> ssl.SSLContext:
+        """
+        Create a TLS context for the clients, which trusts the server certificate.
+
+        :return: SSL context
+        :rtype: ssl.SSLContext
+        """
+        return create_client_ssl_context(self._certfile)
+
+    def start(self) -> None:
+        """Start listening and serving the connections in background threads."""
+        if self._certfile is None:
+            # pylint: disable=consider-using-with
+            self._temporary_directory = tempfile.TemporaryDirectory()
+            self._certfile, self._keyfile = generate_certificate(
+                self._temporary_directory.name
+            )
+
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.minimum_version = ssl.TLSVersion.TLSv1_2
+        context.load_cert_chain(certfile=self._certfile, keyfile=self._keyfile)
+
+        self._stopped.clear()
+        self._listener = socket.create_server((self._host, self._port))
+        self._listener.settimeout(0.1)
+        self._port = self._listener.getsockname()[1]
+
+        thread = threading.Thread(
+            target=self._serve, args=(context,), name="pyepp-mock-server", daemon=True
+        )
+        thread.start()
+        self._threads.append(thread)
+
+    def stop(self) -> None:
+        """Stop the server and close all the connections."""
+        self._stopped.set()
+        self.drop_connections()
+
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+        if self._listener is not None:
+            self._listener.close()
+            self._listener = None
+
+        if self._temporary_directory is not None:
+            self._temporary_directory.cleanup()
+            self._temporary_directory = None
+            self._certfile = self._keyfile = None
+
+    def script(self, key: str, *responses: MockResponse) -> None:
+        """
+        Queue responses to the next commands with a key. They are used once each, in order, before the responses
+        given to the constructor and the canned ones.
+
+        .. code:: python
+
+            # The next check fails and the connection is dropped on the check after it
+            server.script("domain:check", create_response(2400, "Command failed"), None)
+
+        :param key: Command key, e.g. ``domain:check``. See :func:`command_key`.
+        :param responses: XML responses, functions creating them from the XML command or None to close the
+            connection without responding
+        """
+        with self._lock:
+            self._scripts.setdefault(key, deque()).extend(responses)
+
+    def drop_connections(self) -> int:
+        """
+        Close all the connections without ending their sessions. The server keeps accepting new ones.
+
+        :return: Number of connections closed
+        :rtype: int
+        """
+        with self._lock:
+            for connection in self._connections:
+                self._shutdown(connection)
+            return len(self._connections)
+
+    def respond(
+        self, command: bytes, session: Optional[MockSession] = None
+    ) -> Optional[str]:
+        """
+        Create the response to a command.
+
+        :param command: XML command
+        :param session: State of the connection. A logged-in session is assumed if it is None.
+
+        :return: XML response. None to close the connection without responding.
+        :rtype: Optional[str]
+        """
+        if session is None:
+            session = MockSession(logged_in=True)
+
+        try:
+            tree = parser.parse_xml(command)
+        except etree.XMLSyntaxError:
+            return create_response(2001, "Command syntax error")
+
+        key = command_key(tree)
+        if key is None:
+            return create_response(2001, "Command syntax error")
+
+        scripted, response = self._scripted_response(key)
+        if not scripted:
+            return self._default_response(key, tree, session)
+
+        response = response(command) if callable(response) else response
+        if (
+            key == "login"
+            and response is not None
+            and _get_result_code(response) == EppResultCode.SUCCESS.value
+        ):
+            with self._lock:
+                self.sessions += 1
+            session.logged_in = True
+            session.user = parser.find_text(_LOGIN_CLIENT_ID, tree)
+
+        return response
+
+    def greeting(self) -> str:
+        """
+        Get the greeting sent on connection and in response to the Hello command.
+
+        :return: XML greeting
+        :rtype: str
+        """
+        return self._greeting
+
+    def _scripted_response(self, key: str) -> tuple[bool, MockResponse]:
+        """
+        Get the scripted response to a command.
+
+        :param key: Command key
+
+        :return: Whether the response is scripted, and the response
+        :rtype: tuple[bool, MockResponse]
+        """
+        with self._lock:
+            script = self._scripts.get(key)
+            if script:
+                return True, script.popleft()
+
+        if key in self._responses:
+            return True, self._responses[key]
+
+        return False, None
+
+    # pylint: disable=too-many-return-statements
+    def _default_response(
+        self, key: str, tree: etree._Element, session: MockSession
+    ) -> str:
+        """
+        Create the canned response to a command.
+
+        :param key: Command key
+        :param tree: XML command
+        :param session: State of the connection
+
+        :return: XML response
+        :rtype: str
+        """
+        if key == "hello":
+            return self.greeting()
+
+        client_transaction_id = parser.find_text(_CLIENT_TRANSACTION_ID, tree)
+        if key == "login":
+            return self._login(tree, session, client_transaction_id)
+        if not session.logged_in:
+            return create_response(2002, "Command use error", client_transaction_id)
+        if key == "logout":
+            return create_response(
+                1500,
+                "Command completed successfully; ending session",
+                client_transaction_id,
+            )
+        if key == "poll:ack":
+            return create_response(
+                1000, "Command completed successfully", client_transaction_id
+            )
+        if key == "poll:req":
+            return create_response(
+                1301,
+                "Command completed successfully; ack to dequeue",
+                client_transaction_id,
+                message_queue=_MESSAGE_QUEUE,
+            )
+
+        return self._respond_object(
+            parser.find(_COMMAND, tree), key, client_transaction_id
+        )
+
+    def _login(
+        self,
+        tree: etree._Element,
+        session: MockSession,
+        client_transaction_id: Optional[str],
+    ) -> str:
+        """
+        Log a session in if the credentials are accepted and the session limit is not reached.
+
+        :param tree: XML login command
+        :param session: State of the connection
+        :param client_transaction_id: Client transaction id of the command
+
+        :return: XML response
+        :rtype: str
+        """
+        if session.logged_in:
+            return create_response(2002, "Command use error", client_transaction_id)
+
+        user = parser.find_text(_LOGIN_CLIENT_ID, tree)
+        if self._users is not None and self._users.get(user) != parser.find_text(
+            _LOGIN_PASSWORD, tree
+        ):
+            return create_response(2200, "Authentication error", client_transaction_id)
+
+        with self._lock:
+            if self._max_sessions is not None and self.sessions >= self._max_sessions:
+                return create_response(
+                    2502,
+                    "Session limit exceeded; server closing connection",
+                    client_transaction_id,
+                )
+            self.sessions += 1
+
+        session.logged_in = True
+        session.user = user
+        return create_response(
+            1000, "Command completed successfully", client_transaction_id
+        )
+
+    @staticmethod
+    def _respond_object(
+        command_node: etree._Element,
+        key: str,
+        client_transaction_id: Optional[str],
+    ) -> str:
+        """
+        Create the response to an object command.
+
+        :param command_node: Command element, e.g. ``check``
+        :param key: Command key
+        :param client_transaction_id: Client transaction id of the command
+
+        :return: XML response
+        :rtype: str
+        """
+        object_type, _, command_type = key.rpartition(":")
+        if not object_type:
+            return create_response(2101, "Unimplemented command", client_transaction_id)
+
+        names = [
+            parser.text(node)
+            for node in command_node[0]
+            if etree.QName(node).localname in ("name", "id")
+        ]
+
+        res_data = ""
+        if command_type == "check":
+            res_data = _check_data(object_type, names)
+        elif command_type == "info":
+            res_data = _INFO_DATA[object_type].format(name=escape(names[0]))
+        elif command_type == "create":
+            res_data = _CREATE_DATA[object_type].format(name=escape(names[0]))
+
+        return create_response(
+            1000, "Command completed successfully", client_transaction_id, res_data
+        )
+
+    def _serve(self, context: ssl.SSLContext) -> None:
+        """
+        Accept the connections until the server is stopped.
+
+        :param context: Server TLS context
+        """
+        while not self._stopped.is_set():
+            try:
+                connection, _ = self._listener.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+
+            thread = threading.Thread(
+                target=self._handle,
+                args=(connection, context),
+                name="pyepp-mock-connection",
+                daemon=True,
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def _handle(self, connection: socket.socket, context: ssl.SSLContext) -> None:
+        """
+        Serve a connection. The greeting is sent first and then every command is answered in order.
+
+        :param connection: Accepted connection
+        :param context: Server TLS context
+        """
+        try:
+            connection.settimeout(None)
+            connection = context.wrap_socket(connection, server_side=True)
+        except (OSError, ssl.SSLError) as ex:
+            logging.debug("Mock EPP server handshake failed. %s", str(ex))
+            connection.close()
+            return
+
+        with self._lock:
+            self._connections.add(connection)
+            self.connections += 1
+
+        session = MockSession()
+        try:
+            self._write(connection, self.greeting())
+            while not self._stopped.is_set():
+                command = self._read(connection)
+                if command is None:
+                    return
+
+                session.commands += 1
+                if self.latency and self._stopped.wait(self.latency):
+                    return
+
+                response = self.respond(command, session)
+                with self._lock:
+                    self.commands += 1
+                if response is None:
+                    return
+
+                self._write(connection, response)
+                if _get_result_code(response) in _CLOSING_CODES:
+                    return
+        except (OSError, ssl.SSLError) as ex:
+            logging.debug("Mock EPP server connection closed. %s", str(ex))
+        finally:
+            with self._lock:
+                self._connections.discard(connection)
+                if session.logged_in:
+                    self.sessions -= 1
+            connection.close()
+
+    def _read(self, connection: socket.socket) -> Optional[bytes]:
+        """
+        Read a frame.
+
+        :param connection: Connection
+
+        :return: XML payload. None if the connection has been closed.
+        :rtype: Optional[bytes]
+        """
+        header = self._recv_exactly(connection, LENGTH_FIELD_SIZE)
+        if header is None:
+            return None
+
+        frame_size = struct.unpack(self._format_32, header)[0]
+        return self._recv_exactly(connection, frame_size - LENGTH_FIELD_SIZE)
+
+    @staticmethod
+    def _recv_exactly(connection: socket.socket, size: int) -> Optional[bytes]:
+        """
+        Read a number of bytes.
+
+        :param connection: Connection
+        :param size: Number of bytes
+
+        :return: Data. None if the connection has been closed.
+        :rtype: Optional[bytes]
+        """
+        buffer = bytearray(size)
+        view = memoryview(buffer)
+        received = 0
+        while received < size:
+            count = connection.recv_into(view[received:])
+            if not count:
+                return None
+            received += count
+
+        return bytes(buffer)
+
+    def _write(self, connection: socket.socket, response: str) -> None:
+        """
+        Write a frame.
+
+        :param connection: Connection
+        :param response: XML response
+        """
+        data = response.encode("utf-8")
+        connection.sendall(
+            struct.pack(self._format_32, len(data) + LENGTH_FIELD_SIZE) + data
+        )
+
+    @staticmethod
+    def _shutdown(connection: socket.socket) -> None:
+        """
+        Shut down a connection, which wakes up the thread reading from it.
+
+        :param connection: Connection
+        """
+        try:
+            connection.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
@@ -0,0 +1,327 @@
+"""
+Asyncio EPP client unit tests
+"""
+import asyncio
+import struct
+import unittest
+from datetime import date
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from pyepp.aio import AsyncContact, AsyncDomain, AsyncEppCommunicator, AsyncHost, AsyncPoll
+from pyepp.base_command import ErrorCodeInResultException
+from pyepp.cache import TTLCache
+from pyepp.command_templates import HELLO_XML
+from pyepp.domain import DomainData
+from pyepp.epp import EppCommunicatorException, EppResultData, EppSessionLimitExceededException
+from pyepp.instrumentation import CallbackObserver
+from pyepp.poll import ServiceMessageQueueData
+
+
+def frame(xml: bytes) -> bytes:
+    return struct.pack(">I", len(xml) + 4) + xml
+
+
+def response(code: int, message: str = "Command completed successfully") -> bytes:
+    return (
+        b'<?xml version="1.0" encoding="UTF-8"?>'
+        b'<epp xmlns="urn:ietf:params:xml:ns:epp-1.0"><response>'
+        + f'<result code="{code}"><msg>{message}</msg></result>'.encode()
+        + b"<trID><clTRID>ABC-12345</clTRID><svTRID>54321-XYZ</svTRID></trID>"
+        b"</response></epp>"
+    )
+
+
+GREETING = b'<?xml version="1.0" encoding="UTF-8"?><epp xmlns="urn:ietf:params:xml:ns:epp-1.0"><greeting/></epp>'
+
+
+class AsyncEppCommunicatorTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self) -> None:
+        self.reader = asyncio.StreamReader()
+        self.writer = MagicMock(drain=AsyncMock(), wait_closed=AsyncMock())
+        self.open_connection = patch(
+            "pyepp.aio.asyncio.open_connection",
+            AsyncMock(return_value=(self.reader, self.writer)),
+        ).start()
+        patch("pyepp.aio.create_ssl_context").start()
+        self.addCleanup(patch.stopall)
+
+        self.epp = AsyncEppCommunicator("localhost", "700", timeout=1)
+
+    async def connect(self) -> None:
+        self.reader.feed_data(frame(GREETING))
+        await self.epp.connect()
+
+    async def test_connect(self) -> None:
+        self.reader.feed_data(frame(GREETING))
+
+        greeting = await self.epp.connect()
+
+        self.assertEqual(greeting, GREETING)
+        self.assertTrue(self.epp.is_connected)
+        self.assertEqual(self.epp.bytes_received, len(GREETING) + 4)
+        self.open_connection.assert_awaited_once()
+
+    async def test_connect_exception(self) -> None:
+        self.open_connection.side_effect = OSError("Connection refused")
+
+        with self.assertRaises(EppCommunicatorException):
+            await self.epp.connect()
+
+    async def test_write(self) -> None:
+        await self.connect()
+
+        result = await self.epp._write(HELLO_XML)
+
+        data = (HELLO_XML + "\r\n").encode("utf-8")
+        self.assertEqual(result, len(data))
+        self.writer.write.assert_called_once_with(struct.pack(">I", len(data) + 4) + data)
+        self.assertEqual(self.epp.bytes_sent, len(data) + 4)
+
+    async def test_execute(self) -> None:
+        await self.connect()
+        self.reader.feed_data(frame(response(1000)))
+
+        result = await self.epp.execute(HELLO_XML)
+
+        self.assertEqual(result.code, 1000)
+        self.assertEqual(result.client_transaction_id, "ABC-12345")
+        self.assertEqual(result.server_transaction_id, "54321-XYZ")
+
+    async def test_execute_observers(self) -> None:
+        metrics = []
+        self.epp.add_observer(CallbackObserver(metrics.append))
+        await self.connect()
+        self.reader.feed_data(frame(response(1000)))
+
+        await self.epp.execute(HELLO_XML, render_time=0.5)
+
+        self.assertEqual(metrics[0].command_type, "hello")
+        self.assertEqual(metrics[0].session_id, self.epp.session_id)
+        self.assertEqual(metrics[0].render_time, 0.5)
+        self.assertEqual(metrics[0].result_code, 1000)
+        self.assertEqual(metrics[0].bytes_received, len(response(1000)) + 4)
+        self.assertEqual(metrics[0].bytes_sent, self.epp.bytes_sent)
+
+    async def test_execute_not_connected(self) -> None:
+        with self.assertRaises(EppCommunicatorException):
+            await self.epp.execute(HELLO_XML)
+
+    async def test_execute_connection_lost(self) -> None:
+        await self.connect()
+        self.reader.feed_eof()
+
+        with self.assertRaises(EppCommunicatorException) as context:
+            await self.epp.execute(HELLO_XML)
+        self.assertIn("Cannot connect to server. Please re-login!", str(context.exception))
+
+    async def test_execute_frame_too_large(self) -> None:
+        await self.connect()
+        self.epp._max_frame_size = 1024
+        self.reader.feed_data(struct.pack(">I", 1025))
+
+        with self.assertRaises(EppCommunicatorException):
+            await self.epp.execute(HELLO_XML)
+        self.assertFalse(self.epp.is_connected)
+
+    async def test_execute_timeout(self) -> None:
+        await self.connect()
+        self.epp._timeout = 0.01
+
+        with self.assertRaises(EppCommunicatorException):
+            await self.epp.execute(HELLO_XML)
+        self.assertFalse(self.epp.is_connected)
+
+    async def test_execute_cancelled(self) -> None:
+        """A command cancelled by the caller must not leave its response to the next command."""
+        await self.connect()
+        self.reader.feed_data(frame(response(1000))[:10])
+
+        with self.assertRaises(asyncio.TimeoutError):
+            await asyncio.wait_for(self.epp.execute(HELLO_XML), 0.01)
+
+        self.assertFalse(self.epp.is_connected)
+        self.writer.close.assert_called_once()
+        with self.assertRaises(EppCommunicatorException):
+            await self.epp.execute(HELLO_XML)
+
+    async def test_execute_closing_connection(self) -> None:
+        await self.connect()
+        self.reader.feed_data(frame(response(2500, "Command failed; server closing connection")))
+
+        result = await self.epp.execute(HELLO_XML)
+
+        self.assertEqual(result.code, 2500)
+        self.assertFalse(self.epp.is_connected)
+        self.writer.close.assert_called_once()
+
+    async def test_login_logout(self) -> None:
+        await self.connect()
+        self.reader.feed_data(frame(response(1000)))
+        self.reader.feed_data(frame(response(1500, "Command completed successfully; ending session")))
+
+        login = await self.epp.login("user", "password", extensions=["rgp-1.0"])
+        logout = await self.epp.logout()
+
+        self.assertEqual(login.code, 1000)
+        self.assertEqual(self.epp.user, "user")
+        self.assertEqual(logout.code, 1500)
+        self.assertFalse(self.epp.is_connected)
+
+    async def test_login_session_limit(self) -> None:
+        await self.connect()
+        self.reader.feed_data(frame(response(2502, "Session limit exceeded; server closing connection")))
+
+        with self.assertRaises(EppSessionLimitExceededException):
+            await self.epp.login("user", "password")
+
+    async def test_hello(self) -> None:
+        await self.connect()
+        self.reader.feed_data(frame(GREETING))
+
+        self.assertEqual(await self.epp.hello(), GREETING)
+
+    async def test_concurrent_commands_are_serialised(self) -> None:
+        await self.connect()
+        self.reader.feed_data(frame(response(1000)) + frame(response(1001)))
+
+        results = await asyncio.gather(self.epp.execute(HELLO_XML), self.epp.execute(HELLO_XML))
+
+        self.assertEqual([result.code for result in results], [1000, 1001])
+
+
+class AsyncCommandTest(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self) -> None:
+        self.epp = MagicMock(AsyncEppCommunicator)
+
+    async def test_domain_check(self) -> None:
+        self.epp.execute = AsyncMock(return_value=EppResultData(
+            code=1000,
+            message="Command completed successfully",
+            raw_response=b'<epp xmlns="urn:ietf:params:xml:ns:epp-1.0"><response>'
+                         b'<result code="1000"><msg>Command completed successfully</msg></result>'
+                         b'<resData><domain:chkData xmlns:domain="urn:ietf:params:xml:ns:domain-1.0">'
+                         b'<domain:cd><domain:name avail="1">inz1.nz</domain:name></domain:cd>'
+                         b'<domain:cd><domain:name avail="0">inz2.nz</domain:name>'
+                         b'<domain:reason>Registered</domain:reason></domain:cd>'
+                         b'</domain:chkData></resData></response></epp>',
+            result_data=None,
+        ))
+
+        result = await AsyncDomain(self.epp).check(["inz1.nz", "inz2.nz"])
+
+        self.assertDictEqual(result.result_data, {
+            "inz1.nz": {"avail": True, "reason": None},
+            "inz2.nz": {"avail": False, "reason": "Registered"},
+        })
+        self.assertIn("<domain:name>inz1.nz</domain:name>", self.epp.execute.await_args.args[0])
+
+    async def test_domain_check_many(self) -> None:
+        self.epp.execute = AsyncMock(side_effect=lambda cmd, **kwargs: EppResultData(
+            code=1000,
+            message="Command completed successfully",
+            raw_response=b'<epp xmlns="urn:ietf:params:xml:ns:epp-1.0"><response>'
+                         b'<result code="1000"><msg>Command completed successfully</msg></result>'
+                         b'<resData><domain:chkData xmlns:domain="urn:ietf:params:xml:ns:domain-1.0">'
+                         b'<domain:cd><domain:name avail="1">inz1.nz</domain:name></domain:cd>'
+                         b'</domain:chkData></resData></response></epp>',
+            result_data=None,
+        ))
+
+        results = [result async for result in AsyncDomain(self.epp).check_many(["inz1.nz", "inz2.nz"], batch_size=1)]
+
+        self.assertEqual(results, [{"inz1.nz": {"avail": True, "reason": None}}] * 2)
+        self.assertEqual(self.epp.execute.await_count, 2)
+
+    async def test_domain_create(self) -> None:
+        expected_result = EppResultData(code=1000, message="Command completed successfully",
+                                        raw_response=b"", result_data=None)
+        self.epp.execute = AsyncMock(return_value=expected_result)
+
+        result = await AsyncDomain(self.epp).create(DomainData(domain_name="inz1.nz", period=1, registrant="c-1"))
+
+        self.assertEqual(result, expected_result)
+        self.assertIn("<domain:name>inz1.nz</domain:name>", self.epp.execute.await_args.args[0])
+
+    async def test_changes_invalidate_cache_after_execute(self) -> None:
+        cache = TTLCache(ttl=60)
+        expected_result = EppResultData(code=1000, message="Command completed successfully",
+                                        raw_response=b"", result_data=None)
+
+        async def execute(cmd, **kwargs):
+            # An info result cached by a concurrent command while the change is in flight
+            await asyncio.sleep(0)
+            cache.set(object_key, EppResultData(code=1000, message="", raw_response=b"", result_data=None))
+            return expected_result
+
+        self.epp.execute = AsyncMock(side_effect=execute)
+        domain = AsyncDomain(self.epp, cache=cache)
+        contact = AsyncContact(self.epp, cache=cache)
+        host = AsyncHost(self.epp, cache=cache)
+
+        for object_key, change in (
+            (("domain", "inz1.nz"), lambda: domain.update("inz1.nz", registrant="c-2")),
+            (("domain", "inz1.nz"), lambda: domain.delete("inz1.nz")),
+            (("domain", "inz1.nz"), lambda: domain.renew("inz1.nz", date(2025, 1, 1))),
+            (("domain", "inz1.nz"), lambda: domain.transfer("inz1.nz", "password")),
+            (("domain", "inz1.nz"), lambda: domain.restore("inz1.nz")),
+            (("contact", "contact-1"), lambda: contact.delete("contact-1")),
+            (("host", "ns1.inz1.nz"), lambda: host.delete("ns1.inz1.nz")),
+        ):
+            with self.subTest(object_key=object_key):
+                self.assertEqual(await change(), expected_result)
+                self.assertIsNone(cache.get(object_key))
+
+    async def test_info_unsuccessful(self) -> None:
+        expected_result = EppResultData(code=2303, message="Object does not exist",
+                                        raw_response=b"", result_data=None)
+        self.epp.execute = AsyncMock(return_value=expected_result)
+
+        self.assertEqual(await AsyncDomain(self.epp).info("inz1.nz"), expected_result)
+        self.assertEqual(await AsyncContact(self.epp).info("contact-1"), expected_result)
+        self.assertEqual(await AsyncHost(self.epp).info("ns1.inz1.nz"), expected_result)
+
+    async def test_check_unsuccessful(self) -> None:
+        expected_result = EppResultData(code=2001, message="Command syntax error",
+                                        raw_response=b"", result_data=None)
+        self.epp.execute = AsyncMock(return_value=expected_result)
+
+        self.assertEqual(await AsyncContact(self.epp).check(["contact-1"]), expected_result)
+        self.assertEqual(await AsyncHost(self.epp).check(["ns1.inz1.nz"]), expected_result)
+
+    async def test_poll(self) -> None:
+        expected_result = EppResultData(code=1300, message="Command completed successfully; no messages",
+                                        raw_response=b"", result_data=None)
+        self.epp.execute = AsyncMock(return_value=expected_result)
+        poll = AsyncPoll(self.epp)
+
+        self.assertEqual(await poll.request(), expected_result)
+        self.assertEqual(await poll.acknowledge(12345), expected_result)
+        self.assertIn('msgID="12345"', self.epp.execute.await_args.args[0])
+
+    async def test_poll_drain(self) -> None:
+        def poll_result(code: int, message_id: int = None) -> EppResultData:
+            return EppResultData(
+                code=code, message="message", raw_response=b"",
+                result_data=ServiceMessageQueueData(message_count=1, message_id=message_id) if message_id else None,
+            )
+
+        poll = AsyncPoll(self.epp)
+        poll.request = AsyncMock(side_effect=[poll_result(1301, 1), poll_result(1301, 2), poll_result(1300)])
+        poll.acknowledge = AsyncMock(return_value=poll_result(1000))
+        callback = AsyncMock()
+
+        messages = [message async for message in poll.drain(callback)]
+
+        self.assertEqual([message.message_id for message in messages], [1, 2])
+        self.assertEqual([call.args[0] for call in poll.acknowledge.await_args_list], [1, 2])
+        self.assertEqual(callback.await_count, 2)
+
+    async def test_poll_drain_errors(self) -> None:
+        poll = AsyncPoll(self.epp)
+        poll.request = AsyncMock(return_value=EppResultData(code=2400, message="Command failed",
+                                                            raw_response=b"", result_data=None))
+
+        with self.assertRaises(ErrorCodeInResultException):
+            [message async for message in poll.drain()]
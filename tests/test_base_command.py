@@ -7,6 +7,7 @@ from uuid import UUID
 
 from pyepp.base_command import BaseCommand
 from pyepp.epp import EppCommunicator
+from pyepp.host import HostData
 
 
 class BaseCommandTest(unittest.TestCase):
@@ -64,50 +65,24 @@ class BaseCommandTest(unittest.TestCase):
 
         self.assertEqual(expected_result, result)
 
-    def test_escape_list(self) -> None:
-        test_list = [
-            ['hi&', '<world>'],
-            {'key': '<hello&world>'},
-            '<hello&world>',
-            0,
-            False,
-            None
-        ]
-        expected_result = [
-            ['hi&amp;', '&lt;world&gt;'],
-            {'key': '&lt;hello&amp;world&gt;'},
-            '&lt;hello&amp;world&gt;',
-            0,
-            False
-        ]
-
+    def test_prepare_command_escape(self) -> None:
+        """_prepare_command must escape the values once, including in nested lists, dicts and data classes."""
+        command = """<?xml version="1.0" encoding="UTF-8"?>
+<epp xmlns="urn:ietf:params:xml:ns:epp-1.0"><command>{% for value in values %}<v>{{ value }}</v>{% endfor %}\
+<d>{{ data.get('key') }}</d><h>{{ host.host_name }}</h><pw>{{ password }}</pw></command></epp>"""
+        expected_result = """<?xml version="1.0" encoding="UTF-8"?>
+<epp xmlns="urn:ietf:params:xml:ns:epp-1.0"><command><v>hi&amp;</v><v>&lt;world&gt;</v>\
+<d>&lt;hello&amp;world&gt;</d><h>&lt;hello&amp;world&gt;</h><pw>&lt;hello&amp;world&gt;</pw></command></epp>"""
         epp_communicator = MagicMock(EppCommunicator)
-        base_command = BaseCommand(epp_communicator)
-
-        result = base_command._BaseCommand__escape_list(test_list)
-
-        self.assertEqual(expected_result, result)
 
-    def test_escape_dict(self) -> None:
-        test_dict = {
-            'key1': ['hi&', '<world>'],
-            'key2': {'key': '<hello&world>'},
-            'key3': '<hello&world>',
-            'key4': 0,
-            'key5': False
-        }
-        expected_result = {
-            'key1': ['hi&amp;', '&lt;world&gt;'],
-            'key2': {'key': '&lt;hello&amp;world&gt;'},
-            'key3': '&lt;hello&amp;world&gt;',
-            'key4': 0,
-            'key5': False
-        }
-
-        epp_communicator = MagicMock(EppCommunicator)
         base_command = BaseCommand(epp_communicator)
-
-        result = base_command._BaseCommand__escape_dict(test_dict)
+        result = base_command._prepare_command(
+            command,
+            values=['hi&', '<world>'],
+            data={'key': '<hello&world>'},
+            host=HostData(host_name='<hello&world>'),
+            password='<hello&world>',
+        )
 
         self.assertEqual(expected_result, result)
 
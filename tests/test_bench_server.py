@@ -0,0 +1,68 @@
+"""
+Benchmark unit tests
+"""
+import argparse
+import shutil
+import unittest
+
+from benchmarks.bench_server import BENCHMARKS, BenchmarkResult, compare_results, positive_int, run_benchmark
+from pyepp.epp import EppCommunicator
+from pyepp.testing import MockEppServer
+
+
+def benchmark_result(name, commands_per_second, latency_p99):
+    return BenchmarkResult(
+        name=name,
+        commands=100,
+        commands_per_second=commands_per_second,
+        latency_p50=0.001,
+        latency_p99=latency_p99,
+        cpu_per_command=0.0002,
+        allocated_per_command=4096,
+    )
+
+
+class CompareResultsTest(unittest.TestCase):
+
+    def test_compare_results(self) -> None:
+        baseline = {
+            "domain-check": {"commands_per_second": 1000, "latency_p99": 0.002},
+            "domain-info": {"commands_per_second": 1000, "latency_p99": 0.002},
+        }
+        results = [
+            benchmark_result("domain-check", 950, 0.0021),
+            benchmark_result("domain-info", 800, 0.003),
+            benchmark_result("host-info", 10, 1),
+        ]
+
+        regressions = compare_results(results, baseline, max_regression=10)
+
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(all(regression.startswith("domain-info") for regression in regressions))
+
+
+    def test_positive_int(self) -> None:
+        self.assertEqual(positive_int("5"), 5)
+        for value in ("0", "-1", "many"):
+            self.assertRaises(argparse.ArgumentTypeError, positive_int, value)
+
+@unittest.skipUnless(shutil.which("openssl"), "openssl is required to generate a certificate")
+class RunBenchmarkTest(unittest.TestCase):
+
+    def test_run_benchmarks(self) -> None:
+        with MockEppServer() as server:
+            epp = EppCommunicator(*server.address, ssl_context=server.client_ssl_context())
+            epp.connect()
+            epp.login("user", "password")
+
+            for name in BENCHMARKS:
+                result = run_benchmark(name, epp, count=3, warmup=1)
+
+                self.assertEqual(result.commands, 3)
+                self.assertGreater(result.commands_per_second, 0)
+                self.assertLessEqual(result.latency_p50, result.latency_p99)
+                self.assertGreater(result.allocated_per_command, 0)
+
+            self.assertRaises(ValueError, run_benchmark, "domain-check", epp, count=0)
+
+            epp.logout()
@@ -0,0 +1,124 @@
+"""
+Bulk engine unit tests
+"""
+import queue
+import unittest
+from unittest.mock import patch
+
+from pyepp.bulk import BulkEngine, BulkException, BulkResult, _WorkerExit, _in_order, _run_worker
+from pyepp.domain import DomainData
+from pyepp.epp import EppCommunicatorException, EppResultData
+
+CONFIG = {
+    "server": "localhost",
+    "port": "700",
+    "client_cert": None,
+    "client_key": None,
+    "user": "user",
+    "password": "password",
+    "extensions": None,
+}
+
+
+def success(domain_data: DomainData) -> EppResultData:
+    return EppResultData(code=1000, message="Command completed successfully",
+                         raw_response=domain_data.domain_name.encode(), result_data=None)
+
+
+class BulkWorkerTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.epp_class = patch("pyepp.bulk.EppCommunicator").start()
+        self.domain_class = patch("pyepp.bulk.Domain").start()
+        self.domain_class.return_value.create.side_effect = success
+        self.addCleanup(patch.stopall)
+
+        self.tasks = queue.Queue()
+        self.results = queue.Queue()
+
+    def run_worker(self, items: list) -> list:
+        for task in enumerate(items):
+            self.tasks.put(task)
+        self.tasks.put(None)
+
+        _run_worker(1, CONFIG, "create", self.tasks, self.results)
+
+        return [self.results.get() for _ in range(self.results.qsize())]
+
+    def test_worker(self) -> None:
+        domains = [DomainData(domain_name="inz1.nz"), DomainData(domain_name="inz2.nz")]
+
+        messages = self.run_worker(domains)
+
+        epp = self.epp_class.return_value
+        self.epp_class.assert_called_once_with(auto_reconnect=True, server="localhost", port="700",
+                                               client_cert=None, client_key=None)
+        epp.login.assert_called_once_with("user", "password", extensions=None)
+        self.assertEqual([message.index for message in messages[:2]], [0, 1])
+        self.assertEqual(messages[1].result.raw_response, b"inz2.nz")
+        self.assertEqual(messages[1].worker, 1)
+        self.assertEqual(messages[2], _WorkerExit(1))
+        epp.logout.assert_called_once()
+
+    def test_worker_item_error(self) -> None:
+        self.domain_class.return_value.renew.side_effect = EppCommunicatorException("Cannot connect")
+        self.tasks.put((0, {"domain_name": "inz1.nz"}))
+        self.tasks.put(None)
+
+        _run_worker(1, CONFIG, "renew", self.tasks, self.results)
+
+        result = self.results.get()
+        self.domain_class.return_value.renew.assert_called_once_with(domain_name="inz1.nz")
+        self.assertFalse(result.is_successful)
+        self.assertEqual(result.error, "Cannot connect")
+
+    def test_worker_login_error(self) -> None:
+        self.epp_class.return_value.login.side_effect = EppCommunicatorException("Session limit exceeded!")
+
+        messages = self.run_worker([DomainData(domain_name="inz1.nz")])
+
+        self.assertEqual(messages, [_WorkerExit(1, "Session limit exceeded!")])
+        self.epp_class.return_value.close.assert_called_once()
+
+
+class BulkEngineTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.epp_class = patch("pyepp.bulk.EppCommunicator").start()
+        self.domain_class = patch("pyepp.bulk.Domain").start()
+        self.domain_class.return_value.create.side_effect = success
+        self.addCleanup(patch.stopall)
+
+    def engine(self, **kwargs) -> BulkEngine:
+        # The patches are inherited by forked worker processes.
+        return BulkEngine("localhost", "700", "user", "password", start_method="fork", **kwargs)
+
+    def test_invalid_arguments(self) -> None:
+        self.assertRaises(ValueError, BulkEngine, "localhost", "700", "user", "password", workers=0)
+        self.assertRaises(ValueError, BulkEngine, "localhost", "700", "user", "password", max_sessions=0)
+        self.assertRaises(ValueError, self.engine().run, "_parse_check", [])
+
+    def test_workers_are_capped_by_sessions(self) -> None:
+        self.assertEqual(self.engine(workers=8, max_sessions=3).workers, 3)
+        self.assertEqual(self.engine(workers=2, max_sessions=3).workers, 2)
+
+    def test_create_domains(self) -> None:
+        domains = (DomainData(domain_name=f"inz{i}.nz") for i in range(20))
+
+        results = list(self.engine(workers=3).create_domains(domains, ordered=True))
+
+        self.assertEqual([result.index for result in results], list(range(20)))
+        self.assertEqual([result.result.raw_response for result in results],
+                         [f"inz{i}.nz".encode() for i in range(20)])
+        self.assertTrue(all(result.is_successful for result in results))
+
+    def test_no_worker_can_login(self) -> None:
+        self.epp_class.return_value.login.side_effect = EppCommunicatorException("Session limit exceeded!")
+
+        with self.assertRaises(BulkException):
+            list(self.engine(workers=2).create_domains([DomainData(domain_name="inz1.nz")]))
+
+    def test_in_order(self) -> None:
+        results = [BulkResult(index, None) for index in (2, 0, 3, 1)]
+
+        self.assertEqual([result.index for result in _in_order(iter(results))], [0, 1, 2, 3])
@@ -0,0 +1,103 @@
+"""
+Cache unit tests
+"""
+import unittest
+from unittest.mock import patch
+
+from pyepp.cache import AvailabilityCache, TTLCache
+
+
+class TTLCacheTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.now = 100.0
+        patch("pyepp.cache.time.monotonic", side_effect=lambda: self.now).start()
+        self.addCleanup(patch.stopall)
+
+    def test_invalid_arguments(self) -> None:
+        self.assertRaises(ValueError, TTLCache, ttl=0)
+        self.assertRaises(ValueError, TTLCache, max_size=0)
+
+    def test_get_and_set(self) -> None:
+        cache = TTLCache(ttl=10)
+        cache.set("key", "value")
+
+        self.assertEqual(cache.get("key"), "value")
+        self.assertEqual(cache.get("missing", "default"), "default")
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_expiry(self) -> None:
+        cache = TTLCache(ttl=10)
+        cache.set("key", "value")
+        cache.set("short", "value", ttl=1)
+
+        self.now += 5
+        self.assertIsNone(cache.get("short"))
+        self.assertEqual(cache.get("key"), "value")
+
+        self.now += 5
+        self.assertIsNone(cache.get("key"))
+        self.assertEqual(len(cache), 0)
+
+    def test_least_recently_used_is_evicted(self) -> None:
+        cache = TTLCache(max_size=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), 3)
+
+    def test_invalidate_and_clear(self) -> None:
+        cache = TTLCache()
+        cache.set("a", 1)
+        cache.set("b", 2)
+
+        cache.invalidate("a")
+        cache.invalidate("missing")
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(len(cache), 1)
+
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+
+class AvailabilityCacheTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.now = 100.0
+        patch("pyepp.cache.time.monotonic", side_effect=lambda: self.now).start()
+        self.addCleanup(patch.stopall)
+
+    def test_invalid_arguments(self) -> None:
+        self.assertRaises(ValueError, AvailabilityCache, available_ttl=0)
+        self.assertRaises(ValueError, AvailabilityCache, unavailable_ttl=0)
+        self.assertRaises(ValueError, AvailabilityCache, max_size=0)
+
+    def test_separate_ttls(self) -> None:
+        cache = AvailabilityCache(available_ttl=5, unavailable_ttl=60)
+        cache.set("inz1.nz", {"avail": True, "reason": None})
+        cache.set("inz2.nz", {"avail": False, "reason": "Registered"})
+
+        self.now += 10
+        self.assertIsNone(cache.get("inz1.nz"))
+        self.assertEqual(cache.get("inz2.nz"), {"avail": False, "reason": "Registered"})
+
+        self.now += 60
+        self.assertIsNone(cache.get("inz2.nz"))
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+    def test_bounded(self) -> None:
+        cache = AvailabilityCache(max_size=2)
+        for name in ("inz1.nz", "inz2.nz", "inz3.nz"):
+            cache.set(name, {"avail": True, "reason": None})
+
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("inz1.nz"))
+
+        cache.invalidate("inz2.nz")
+        self.assertIsNone(cache.get("inz2.nz"))
+        cache.clear()
+        self.assertEqual(len(cache), 0)
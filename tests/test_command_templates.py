@@ -0,0 +1,34 @@
+"""
+Command templates unit tests
+"""
+import unittest
+from unittest.mock import ANY, MagicMock
+
+from pyepp.base_command import BaseCommand
+from pyepp.command_templates import HELLO_XML, get_template, get_template_source, register_template
+from pyepp.epp import EppCommunicator
+
+
+class CommandTemplatesTest(unittest.TestCase):
+
+    def test_templates_are_registered(self) -> None:
+        self.assertEqual(get_template_source("HELLO_XML"), HELLO_XML)
+        self.assertIs(get_template("HELLO_XML"), get_template(HELLO_XML))
+
+    def test_unregistered_template_is_compiled_once(self) -> None:
+        source = "<epp>{{ name }}</epp>"
+
+        self.assertIs(get_template(source), get_template(source))
+        self.assertEqual(get_template(source).render(name="inz.nz"), "<epp>inz.nz</epp>")
+
+    def test_register_template(self) -> None:
+        template = register_template("TEST_CUSTOM_XML", "<epp><clTRID>{{ client_transaction_id }}</clTRID></epp>")
+
+        self.assertIs(get_template("TEST_CUSTOM_XML"), template)
+
+        epp_communicator = MagicMock(EppCommunicator)
+        BaseCommand(epp_communicator).execute("TEST_CUSTOM_XML", client_transaction_id="ABC-12345")
+
+        epp_communicator.execute.assert_called_once_with(
+            "<epp><clTRID>ABC-12345</clTRID></epp>", render_time=ANY
+        )
@@ -5,6 +5,7 @@ Contact unit tests
 import unittest
 from unittest.mock import MagicMock
 
+from pyepp.cache import TTLCache
 from pyepp.contact import ContactData, PostalInfoData, AddressData, Contact
 from pyepp.epp import EppCommunicator, EppResultData
 
@@ -127,7 +128,8 @@ class ContactTest(unittest.TestCase):
                 "client_transaction_id": "eccb044f-a80f-4db3-a918-988f1ac918e3",
                 "code": 1000,
                 "message": "Command completed successfully",
-                "raw_response": "<response>\n"
+                "raw_response": '<epp xmlns="urn:ietf:params:xml:ns:epp-1.0" xmlns:contact="urn:ietf:params:xml:ns:contact-1.0" xmlns:domain="urn:ietf:params:xml:ns:domain-1.0" xmlns:host="urn:ietf:params:xml:ns:host-1.0">\n'
+                "<response>\n"
                 '<result code="1000">\n'
                 "<msg>Command completed successfully</msg>\n"
                 "</result>\n"
@@ -142,7 +144,8 @@ class ContactTest(unittest.TestCase):
                 "<clTRID>eccb044f-a80f-4db3-a918-988f1ac918e3</clTRID>\n"
                 "<svTRID>CIRA-000062206323-0000000003</svTRID>\n"
                 "</trID>\n"
-                "</response>",
+                "</response>\n"
+                "</epp>",
                 "reason": None,
                 "repository_object_id": None,
                 "result_data": {
@@ -188,7 +191,8 @@ class ContactTest(unittest.TestCase):
                 "client_transaction_id": "5123c3d4-79ce-4d87-ad7b-d234eb992474",
                 "code": 1000,
                 "message": "Command completed successfully",
-                "raw_response": "<response>\n"
+                "raw_response": '<epp xmlns="urn:ietf:params:xml:ns:epp-1.0" xmlns:contact="urn:ietf:params:xml:ns:contact-1.0" xmlns:domain="urn:ietf:params:xml:ns:domain-1.0" xmlns:host="urn:ietf:params:xml:ns:host-1.0">\n'
+                "<response>\n"
                 '<result code="1000">\n'
                 "<msg>Command completed successfully</msg>\n"
                 "</result>\n"
@@ -220,7 +224,8 @@ class ContactTest(unittest.TestCase):
                 "<clTRID>5123c3d4-79ce-4d87-ad7b-d234eb992474</clTRID>\n"
                 "<svTRID>CIRA-000062211375-0000000003</svTRID>\n"
                 "</trID>\n"
-                "</response>",
+                "</response>\n"
+                "</epp>",
                 "reason": None,
                 "repository_object_id": "9175701-INZ",
                 "server_transaction_id": "CIRA-000062211375-0000000003",
@@ -233,7 +238,8 @@ class ContactTest(unittest.TestCase):
                 "client_transaction_id": "5123c3d4-79ce-4d87-ad7b-d234eb992474",
                 "code": 1000,
                 "message": "Command completed successfully",
-                "raw_response": "<response>\n"
+                "raw_response": '<epp xmlns="urn:ietf:params:xml:ns:epp-1.0" xmlns:contact="urn:ietf:params:xml:ns:contact-1.0" xmlns:domain="urn:ietf:params:xml:ns:domain-1.0" xmlns:host="urn:ietf:params:xml:ns:host-1.0">\n'
+                "<response>\n"
                 '<result code="1000">\n'
                 "<msg>Command completed successfully</msg>\n"
                 "</result>\n"
@@ -265,7 +271,8 @@ class ContactTest(unittest.TestCase):
                 "<clTRID>5123c3d4-79ce-4d87-ad7b-d234eb992474</clTRID>\n"
                 "<svTRID>CIRA-000062211375-0000000003</svTRID>\n"
                 "</trID>\n"
-                "</response>",
+                "</response>\n"
+                "</epp>",
                 "reason": None,
                 "repository_object_id": "9175701-INZ",
                 "result_data": ContactData(
@@ -314,7 +321,8 @@ class ContactTest(unittest.TestCase):
                 "client_transaction_id": "caae2895-fe01-4f1c-a892-115b17315acc",
                 "code": 1000,
                 "message": "Command completed successfully",
-                "raw_response": "<response>\n"
+                "raw_response": '<epp xmlns="urn:ietf:params:xml:ns:epp-1.0" xmlns:contact="urn:ietf:params:xml:ns:contact-1.0" xmlns:domain="urn:ietf:params:xml:ns:domain-1.0" xmlns:host="urn:ietf:params:xml:ns:host-1.0">\n'
+                "<response>\n"
                 '<result code="1000">\n'
                 "<msg>Command completed successfully</msg>\n"
                 "</result>\n"
@@ -328,7 +336,8 @@ class ContactTest(unittest.TestCase):
                 "<clTRID>caae2895-fe01-4f1c-a892-115b17315acc</clTRID>\n"
                 "<svTRID>CIRA-000062214171-0000000003</svTRID>\n"
                 "</trID>\n"
-                "</response>",
+                "</response>\n"
+                "</epp>",
                 "reason": None,
                 "repository_object_id": None,
                 "server_transaction_id": "CIRA-000062214171-0000000003",
@@ -368,7 +377,8 @@ class ContactTest(unittest.TestCase):
                 "client_transaction_id": "a21a659d-5040-4848-9f5f-0cffa0ff62d1",
                 "code": 1000,
                 "message": "Command completed successfully",
-                "raw_response": "<response>\n"
+                "raw_response": '<epp xmlns="urn:ietf:params:xml:ns:epp-1.0" xmlns:contact="urn:ietf:params:xml:ns:contact-1.0" xmlns:domain="urn:ietf:params:xml:ns:domain-1.0" xmlns:host="urn:ietf:params:xml:ns:host-1.0">\n'
+                "<response>\n"
                 '<result code="1000">\n'
                 "<msg>Command completed successfully</msg>\n"
                 "</result>\n"
@@ -376,7 +386,8 @@ class ContactTest(unittest.TestCase):
                 "<clTRID>a21a659d-5040-4848-9f5f-0cffa0ff62d1</clTRID>\n"
                 "<svTRID>CIRA-000062220522-0000000004</svTRID>\n"
                 "</trID>\n"
-                "</response>",
+                "</response>\n"
+                "</epp>",
                 "reason": None,
                 "repository_object_id": None,
                 "server_transaction_id": "CIRA-000062220522-0000000004",
@@ -392,6 +403,21 @@ class ContactTest(unittest.TestCase):
 
         self.assertEqual(result, expected_result)
 
+    def test_info_cache(self) -> None:
+        cache = TTLCache()
+        contact = Contact(MagicMock(EppCommunicator), cache=cache)
+        contact.execute = MagicMock(
+            return_value=EppResultData(code=1000, message="", raw_response="", result_data=None)
+        )
+        contact._parse_info = MagicMock(side_effect=lambda result: result)
+
+        contact.info("contact-1")
+        contact.info("contact-1")
+        self.assertEqual(contact.execute.call_count, 1)
+
+        contact.delete("contact-1")
+        self.assertEqual(len(cache), 0)
+
     def test_update(self) -> None:
         update_params = ContactData(
             id="inz-contact-1",
@@ -404,7 +430,8 @@ class ContactTest(unittest.TestCase):
                 "client_transaction_id": "0e872842-b77b-4800-9572-c72e46e068de",
                 "code": 1000,
                 "message": "Command completed successfully",
-                "raw_response": "<response>\n"
+                "raw_response": '<epp xmlns="urn:ietf:params:xml:ns:epp-1.0" xmlns:contact="urn:ietf:params:xml:ns:contact-1.0" xmlns:domain="urn:ietf:params:xml:ns:domain-1.0" xmlns:host="urn:ietf:params:xml:ns:host-1.0">\n'
+                "<response>\n"
                 '<result code="1000">\n'
                 "<msg>Command completed successfully</msg>\n"
                 "</result>\n"
@@ -412,7 +439,8 @@ class ContactTest(unittest.TestCase):
                 "<clTRID>0e872842-b77b-4800-9572-c72e46e068de</clTRID>\n"
                 "<svTRID>CIRA-000062223355-0000000004</svTRID>\n"
                 "</trID>\n"
-                "</response>",
+                "</response>\n"
+                "</epp>",
                 "reason": None,
                 "repository_object_id": None,
                 "server_transaction_id": "CIRA-000062223355-0000000004",
@@ -443,7 +471,8 @@ class ContactTest(unittest.TestCase):
                 "client_transaction_id": "0e872842-b77b-4800-9572-c72e46e068d2",
                 "code": 1000,
                 "message": "Command completed successfully",
-                "raw_response": "<response>\n"
+                "raw_response": '<epp xmlns="urn:ietf:params:xml:ns:epp-1.0" xmlns:contact="urn:ietf:params:xml:ns:contact-1.0" xmlns:domain="urn:ietf:params:xml:ns:domain-1.0" xmlns:host="urn:ietf:params:xml:ns:host-1.0">\n'
+                "<response>\n"
                 '<result code="1000">\n'
                 "<msg>Command completed successfully</msg>\n"
                 "</result>\n"
@@ -451,7 +480,8 @@ class ContactTest(unittest.TestCase):
                 "<clTRID>0e872842-b77b-4800-9572-c72e46e068d2</clTRID>\n"
                 "<svTRID>CIRA-000062223355-0000000004</svTRID>\n"
                 "</trID>\n"
-                "</response>",
+                "</response>\n"
+                "</epp>",
                 "reason": None,
                 "repository_object_id": None,
                 "server_transaction_id": "CIRA-000062223355-0000000004",
@@ -575,7 +605,8 @@ class ContactTest(unittest.TestCase):
                 "client_transaction_id": "5123c3d4-79ce-4d87-ad7b-d234eb992474",
                 "code": 1000,
                 "message": "Command completed successfully",
-                "raw_response": "<response>\n"
+                "raw_response": '<epp xmlns="urn:ietf:params:xml:ns:epp-1.0" xmlns:contact="urn:ietf:params:xml:ns:contact-1.0" xmlns:domain="urn:ietf:params:xml:ns:domain-1.0" xmlns:host="urn:ietf:params:xml:ns:host-1.0">\n'
+                "<response>\n"
                 '<result code="1000">\n'
                 "<msg>Command completed successfully</msg>\n"
                 "</result>\n"
@@ -604,7 +635,8 @@ class ContactTest(unittest.TestCase):
                 "<clTRID>5123c3d4-79ce-4d87-ad7b-d234eb992474</clTRID>\n"
                 "<svTRID>CIRA-000062211375-0000000003</svTRID>\n"
                 "</trID>\n"
-                "</response>",
+                "</response>\n"
+                "</epp>",
                 "reason": None,
                 "repository_object_id": "9175701-INZ",
                 "server_transaction_id": "CIRA-000062211375-0000000003",
@@ -2,18 +2,25 @@
 Domain unit tests
 """
 
+import pickle
 import unittest
+from dataclasses import asdict, replace
 from datetime import date, datetime
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 from pyepp.domain import (
     Domain,
     DomainData,
+    LazyDomainData,
     DSRecordData,
     DNSSECAlgorithm,
     DigestTypeEnum,
+    DNSKeyFlagEnum,
+    DSRecordKeyData,
 )
-from pyepp.epp import EppCommunicator, EppResultData
+from pyepp.base_command import ErrorCodeInResultException
+from pyepp.cache import AvailabilityCache, TTLCache
+from pyepp.epp import EppCommunicator, EppResultData, RawResponsePolicy, parse_response, retain_raw_response
 
 
 class DomainTest(unittest.TestCase):
@@ -50,7 +57,8 @@ class DomainTest(unittest.TestCase):
                 "client_transaction_id": "8d537a88-b18c-4f74-903e-aff9be1f902d",
                 "code": 1000,
                 "message": "Command completed successfully",
-                "raw_response": "<response>\n"
+                "raw_response": '<epp xmlns="urn:ietf:params:xml:ns:epp-1.0" xmlns:contact="urn:ietf:params:xml:ns:contact-1.0" xmlns:domain="urn:ietf:params:xml:ns:domain-1.0" xmlns:host="urn:ietf:params:xml:ns:host-1.0">\n'
+                "<response>\n"
                 '<result code="1000">\n'
                 "<msg>Command completed successfully</msg>\n"
                 "</result>\n"
@@ -72,7 +80,8 @@ class DomainTest(unittest.TestCase):
                 "<clTRID>8d537a88-b18c-4f74-903e-aff9be1f902d</clTRID>\n"
                 "<svTRID>CIRA-000062431732-0000000003</svTRID>\n"
                 "</trID>\n"
-                "</response>",
+                "</response>\n"
+                "</epp>",
                 "reason": None,
                 "repository_object_id": None,
                 "result_data": {
@@ -90,6 +99,285 @@ class DomainTest(unittest.TestCase):
 
         self.assertEqual(result, expected_result)
 
+    def test_check_releases_tree(self) -> None:
+        raw_response = (
+            b'<epp xmlns="urn:ietf:params:xml:ns:epp-1.0"><response><result code="1000">'
+            b'<msg>Command completed successfully</msg></result><resData>'
+            b'<domain:chkData xmlns:domain="urn:ietf:params:xml:ns:domain-1.0"><domain:cd>'
+            b'<domain:name avail="true">inz1.nz</domain:name></domain:cd></domain:chkData></resData>'
+            b'<trID><svTRID>SV-1</svTRID></trID></response></epp>'
+        )
+
+        for policy in RawResponsePolicy:
+            with self.subTest(policy=policy):
+                epp_communicator = MagicMock(EppCommunicator)
+                domain = Domain(epp_communicator)
+                domain.execute = MagicMock(
+                    return_value=retain_raw_response(parse_response(raw_response), policy)
+                )
+
+                result = domain.check(["inz1.nz"])
+
+                self.assertEqual(result.result_data, {"inz1.nz": {"avail": True, "reason": None}})
+                if policy is RawResponsePolicy.KEEP:
+                    self.assertIsNotNone(result.xml_tree)
+                else:
+                    self.assertIsNone(result.xml_tree)
+
+    def test_info_releases_tree(self) -> None:
+        raw_response = (
+            b'<epp xmlns="urn:ietf:params:xml:ns:epp-1.0"><response><result code="1000">'
+            b'<msg>Command completed successfully</msg></result><resData>'
+            b'<domain:infData xmlns:domain="urn:ietf:params:xml:ns:domain-1.0">'
+            b'<domain:name>inz1.nz</domain:name><domain:registrant>inz-contact-1</domain:registrant>'
+            b'<domain:exDate>2024-02-23T21:56:22.713Z</domain:exDate></domain:infData></resData>'
+            b'<extension><secDNS:infData xmlns:secDNS="urn:ietf:params:xml:ns:secDNS-1.1"><secDNS:dsData>'
+            b'<secDNS:keyTag>17600</secDNS:keyTag><secDNS:alg>13</secDNS:alg><secDNS:digestType>1</secDNS:digestType>'
+            b'<secDNS:digest>4ffb0f3f</secDNS:digest></secDNS:dsData></secDNS:infData></extension>'
+            b'<trID><svTRID>SV-1</svTRID></trID></response></epp>'
+        )
+        epp_communicator = MagicMock(EppCommunicator)
+        domain = Domain(epp_communicator)
+        domain.execute = MagicMock(
+            return_value=retain_raw_response(parse_response(raw_response), RawResponsePolicy.DROP)
+        )
+
+        result = domain.info("inz1.nz")
+
+        self.assertIsNone(result.xml_tree)
+        self.assertIsNone(result.raw_response)
+        # The domain data is parsed in full, so it does not keep the released tree alive
+        self.assertIsNone(result.result_data._info_data)
+        self.assertEqual(result.result_data.registrant, "inz-contact-1")
+        self.assertEqual(result.result_data.expiry_date, "2024-02-23T21:56:22.713Z")
+        self.assertEqual(result.result_data.dns_sec[0].key_tag, "17600")
+
+    def test_info_keeps_tree(self) -> None:
+        """The domain data is parsed lazily when the tree is kept."""
+        raw_response = (
+            b'<epp xmlns="urn:ietf:params:xml:ns:epp-1.0"><response><result code="1000">'
+            b'<msg>Command completed successfully</msg></result><resData>'
+            b'<domain:infData xmlns:domain="urn:ietf:params:xml:ns:domain-1.0">'
+            b'<domain:name>inz1.nz</domain:name></domain:infData></resData>'
+            b'<trID><svTRID>SV-1</svTRID></trID></response></epp>'
+        )
+        epp_communicator = MagicMock(EppCommunicator)
+        domain = Domain(epp_communicator)
+        domain.execute = MagicMock(
+            return_value=retain_raw_response(parse_response(raw_response), RawResponsePolicy.KEEP)
+        )
+
+        result = domain.info("inz1.nz")
+
+        self.assertIsNotNone(result.xml_tree)
+        self.assertIsNotNone(result.result_data._info_data)
+        self.assertEqual(result.result_data.domain_name, "inz1.nz")
+
+    def test_info_without_info_data(self) -> None:
+        raw_response = (
+            b'<epp xmlns="urn:ietf:params:xml:ns:epp-1.0"><response><result code="1000">'
+            b'<msg>Command completed successfully</msg></result>'
+            b'<trID><svTRID>SV-1</svTRID></trID></response></epp>'
+        )
+        epp_communicator = MagicMock(EppCommunicator)
+        domain = Domain(epp_communicator)
+        domain.execute = MagicMock(return_value=parse_response(raw_response))
+
+        result = domain.info("inz1.nz")
+
+        self.assertEqual(result.code, 1000)
+        self.assertIsNone(result.result_data)
+
+    def test_check_many(self) -> None:
+        epp_communicator = MagicMock(EppCommunicator)
+        domain = Domain(epp_communicator)
+        domain.execute_pipelined = MagicMock(
+            side_effect=lambda commands, window: (
+                EppResultData(
+                    code=1000,
+                    message="Command completed successfully",
+                    raw_response="response",
+                    result_data=None,
+                )
+                for _ in commands
+            )
+        )
+        domain._parse_check = MagicMock(
+            side_effect=[
+                EppResultData(
+                    code=1000,
+                    message="",
+                    raw_response="",
+                    result_data={
+                        name: {"avail": True, "reason": None} for name in names
+                    },
+                )
+                for names in (
+                    ["inz0.nz", "inz1.nz"],
+                    ["inz2.nz", "inz3.nz"],
+                    ["inz4.nz"],
+                )
+            ]
+        )
+        domain_names = (f"inz{i}.nz" for i in range(5))
+
+        results = list(domain.check_many(domain_names, batch_size=2, pipeline_window=3))
+
+        self.assertEqual(
+            results[0],
+            {
+                "inz0.nz": {"avail": True, "reason": None},
+                "inz1.nz": {"avail": True, "reason": None},
+            },
+        )
+        self.assertEqual([len(result) for result in results], [2, 2, 1])
+        self.assertEqual(domain.execute_pipelined.call_args.kwargs["window"], 3)
+
+    def test_check_many_commands(self) -> None:
+        epp_communicator = MagicMock(EppCommunicator)
+        epp_communicator.execute_pipelined.side_effect = lambda cmds, window, **kwargs: (
+            EppResultData(code=1000, message="", raw_response="", result_data=None)
+            for _ in cmds
+        )
+        domain = Domain(epp_communicator)
+        domain._parse_check = MagicMock(side_effect=lambda result: result)
+
+        list(domain.check_many(["inz1.nz", "inz2.nz", "inz3.nz"], batch_size=2, pipeline_window=2))
+
+        self.assertEqual(domain._parse_check.call_count, 2)
+        epp_communicator.execute_pipelined.assert_called_once()
+        self.assertEqual(
+            epp_communicator.execute_pipelined.call_args.kwargs["window"], 2
+        )
+
+    def test_check_many_not_pipelined(self) -> None:
+        """Without pipelining the batches go through execute, which retries on a lost connection."""
+        epp_communicator = MagicMock(EppCommunicator)
+        epp_communicator.execute.return_value = EppResultData(
+            code=1000, message="", raw_response="", result_data=None
+        )
+        domain = Domain(epp_communicator)
+        domain._parse_check = MagicMock(side_effect=lambda result: result)
+
+        list(domain.check_many(["inz1.nz", "inz2.nz", "inz3.nz"], batch_size=2))
+
+        self.assertEqual(epp_communicator.execute.call_count, 2)
+        self.assertIn("<domain:name>inz3.nz</domain:name>", epp_communicator.execute.call_args.args[0])
+        epp_communicator.execute_pipelined.assert_not_called()
+
+    def test_check_many_unsuccessful(self) -> None:
+        epp_communicator = MagicMock(EppCommunicator)
+        domain = Domain(epp_communicator)
+        domain.execute = MagicMock(
+            return_value=EppResultData(
+                code=2306,
+                message="Parameter value policy error",
+                raw_response="response",
+                result_data=None,
+            )
+        )
+
+        with self.assertRaises(ErrorCodeInResultException):
+            list(domain.check_many(["inz1.nz"]))
+
+    def test_info_cache(self) -> None:
+        epp_communicator = MagicMock(EppCommunicator)
+        domain = Domain(epp_communicator, cache=TTLCache())
+        info_result = EppResultData(
+            code=1000, message="", raw_response="", result_data={}
+        )
+        domain.execute = MagicMock(return_value=info_result)
+        domain._parse_info = MagicMock(side_effect=lambda result: result)
+
+        self.assertIs(domain.info("internet.nz"), info_result)
+        self.assertIs(domain.info("internet.nz"), info_result)
+        self.assertEqual(domain.execute.call_count, 1)
+
+        domain.info("internet.nz", client_transaction_id="ABC-12345")
+        self.assertEqual(domain.execute.call_count, 2)
+
+        domain.renew("internet.nz", date(2025, 1, 1))
+        domain.info("internet.nz")
+        self.assertEqual(domain.execute.call_count, 4)
+
+    def test_info_cache_unsuccessful(self) -> None:
+        epp_communicator = MagicMock(EppCommunicator)
+        domain = Domain(epp_communicator, cache=TTLCache())
+        domain.execute = MagicMock(
+            return_value=EppResultData(
+                code=2303, message="", raw_response="", result_data=None
+            )
+        )
+
+        domain.info("internet.nz")
+        domain.info("internet.nz")
+
+        self.assertEqual(domain.execute.call_count, 2)
+
+    def test_check_availability_cache(self) -> None:
+        epp_communicator = MagicMock(EppCommunicator)
+        domain = Domain(epp_communicator, availability_cache=AvailabilityCache())
+        domain.execute = MagicMock(
+            side_effect=lambda cmd, **kwargs: EppResultData(
+                code=1000,
+                message="",
+                raw_response="",
+                result_data=kwargs.get("domain_names"),
+            )
+        )
+        domain._parse_check = MagicMock(
+            side_effect=lambda result: EppResultData(
+                code=1000,
+                message="",
+                raw_response="",
+                result_data={
+                    name: {"avail": name != "inz1.nz", "reason": None}
+                    for name in result.result_data
+                },
+            )
+        )
+
+        domain.check(["inz1.nz", "inz2.nz"])
+        result = domain.check(["inz1.nz", "inz3.nz", "inz2.nz"])
+
+        self.assertEqual(domain.execute.call_count, 2)
+        self.assertEqual(domain.execute.call_args.kwargs["domain_names"], ["inz3.nz"])
+        self.assertEqual(
+            result.result_data,
+            {
+                "inz1.nz": {"avail": False, "reason": None},
+                "inz2.nz": {"avail": True, "reason": None},
+                "inz3.nz": {"avail": True, "reason": None},
+            },
+        )
+
+        result = domain.check(["inz2.nz", "inz3.nz"])
+        self.assertEqual(domain.execute.call_count, 2)
+        self.assertEqual(result.code, 1000)
+        self.assertEqual(list(result.result_data), ["inz2.nz", "inz3.nz"])
+
+        domain.check(["inz2.nz"], client_transaction_id="ABC-12345")
+        self.assertEqual(domain.execute.call_count, 3)
+
+        domain.delete("inz1.nz")
+        domain.check(["inz1.nz"])
+        self.assertEqual(domain.execute.call_args.kwargs["domain_names"], ["inz1.nz"])
+
+    def test_check_availability_cache_unsuccessful(self) -> None:
+        epp_communicator = MagicMock(EppCommunicator)
+        availability_cache = AvailabilityCache()
+        domain = Domain(epp_communicator, availability_cache=availability_cache)
+        domain.execute = MagicMock(
+            return_value=EppResultData(
+                code=2400, message="", raw_response="", result_data=None
+            )
+        )
+
+        result = domain.check(["inz1.nz"])
+
+        self.assertEqual(result.code, 2400)
+        self.assertEqual(len(availability_cache), 0)
+
     def test_info_unsuccessful(self) -> None:
         epp_communicator = MagicMock(EppCommunicator)
         domain = Domain(epp_communicator)
@@ -116,7 +404,8 @@ class DomainTest(unittest.TestCase):
                 "client_transaction_id": None,
                 "code": 1000,
                 "message": "Command completed successfully",
-                "raw_response": "<response>\n"
+                "raw_response": '<epp xmlns="urn:ietf:params:xml:ns:epp-1.0" xmlns:contact="urn:ietf:params:xml:ns:contact-1.0" xmlns:domain="urn:ietf:params:xml:ns:domain-1.0" xmlns:host="urn:ietf:params:xml:ns:host-1.0">\n'
+                "<response>\n"
                 '<result code="1000">\n'
                 "<msg>Command completed successfully</msg>\n"
                 "</result>\n"
@@ -189,7 +478,8 @@ class DomainTest(unittest.TestCase):
                 "<trID>\n"
                 "<svTRID>CIRA-000063163743-0000000003</svTRID>\n"
                 "</trID>\n"
-                "</response>",
+                "</response>\n"
+                "</epp>",
                 "reason": None,
                 "repository_object_id": "9204701-INZ",
                 "server_transaction_id": "CIRA-000063163743-0000000003",
@@ -202,7 +492,8 @@ class DomainTest(unittest.TestCase):
                 "client_transaction_id": None,
                 "code": 1000,
                 "message": "Command completed successfully",
-                "raw_response": "<response>\n"
+                "raw_response": '<epp xmlns="urn:ietf:params:xml:ns:epp-1.0" xmlns:contact="urn:ietf:params:xml:ns:contact-1.0" xmlns:domain="urn:ietf:params:xml:ns:domain-1.0" xmlns:host="urn:ietf:params:xml:ns:host-1.0">\n'
+                "<response>\n"
                 '<result code="1000">\n'
                 "<msg>Command completed successfully</msg>\n"
                 "</result>\n"
@@ -275,7 +566,8 @@ class DomainTest(unittest.TestCase):
                 "<trID>\n"
                 "<svTRID>CIRA-000063163743-0000000003</svTRID>\n"
                 "</trID>\n"
-                "</response>",
+                "</response>\n"
+                "</epp>",
                 "repository_object_id": "9204701-INZ",
                 "result_data": DomainData(
                     domain_name="internet.nz",
@@ -348,7 +640,8 @@ class DomainTest(unittest.TestCase):
                 "client_transaction_id": "96aaf073-5741-47bd-b1eb-b5abcf4206fa",
                 "code": 1000,
                 "message": "Command completed successfully",
-                "raw_response": "<response>\n"
+                "raw_response": '<epp xmlns="urn:ietf:params:xml:ns:epp-1.0" xmlns:contact="urn:ietf:params:xml:ns:contact-1.0" xmlns:domain="urn:ietf:params:xml:ns:domain-1.0" xmlns:host="urn:ietf:params:xml:ns:host-1.0">\n'
+                "<response>\n"
                 '<result code="1000">\n'
                 "<msg>Command completed successfully</msg>\n"
                 "</result>\n"
@@ -363,7 +656,8 @@ class DomainTest(unittest.TestCase):
                 "<clTRID>96aaf073-5741-47bd-b1eb-b5abcf4206fa</clTRID>\n"
                 "<svTRID>CIRA-000064317159-0000000003</svTRID>\n"
                 "</trID>\n"
-                "</response>",
+                "</response>\n"
+                "</epp>",
                 "reason": None,
                 "repository_object_id": None,
                 "server_transaction_id": "CIRA-000064317159-0000000003",
@@ -403,7 +697,8 @@ class DomainTest(unittest.TestCase):
                 "client_transaction_id": "b9c0c77d-b2d9-47c7-9edb-b4d4988c2e7d",
                 "code": 1000,
                 "message": "Command completed successfully",
-                "raw_response": "<response>\n"
+                "raw_response": '<epp xmlns="urn:ietf:params:xml:ns:epp-1.0" xmlns:contact="urn:ietf:params:xml:ns:contact-1.0" xmlns:domain="urn:ietf:params:xml:ns:domain-1.0" xmlns:host="urn:ietf:params:xml:ns:host-1.0">\n'
+                "<response>\n"
                 '<result code="1000">\n'
                 "<msg>Command completed successfully</msg>\n"
                 "</result>\n"
@@ -411,7 +706,8 @@ class DomainTest(unittest.TestCase):
                 "<clTRID>b9c0c77d-b2d9-47c7-9edb-b4d4988c2e7d</clTRID>\n"
                 "<svTRID>CIRA-000064688525-0000000004</svTRID>\n"
                 "</trID>\n"
-                "</response>",
+                "</response>\n"
+                "</epp>",
                 "reason": None,
                 "repository_object_id": None,
                 "server_transaction_id": "CIRA-000064688525-0000000004",
@@ -433,7 +729,8 @@ class DomainTest(unittest.TestCase):
                 "client_transaction_id": "3fc04fc6-0b40-4979-99c0-fa91e9da573f",
                 "code": 1000,
                 "message": "Command completed successfully",
-                "raw_response": "<response>\n"
+                "raw_response": '<epp xmlns="urn:ietf:params:xml:ns:epp-1.0" xmlns:contact="urn:ietf:params:xml:ns:contact-1.0" xmlns:domain="urn:ietf:params:xml:ns:domain-1.0" xmlns:host="urn:ietf:params:xml:ns:host-1.0">\n'
+                "<response>\n"
                 '<result code="1000">\n'
                 "<msg>Command completed successfully</msg>\n"
                 "</result>\n"
@@ -447,7 +744,8 @@ class DomainTest(unittest.TestCase):
                 "<clTRID>3fc04fc6-0b40-4979-99c0-fa91e9da573f</clTRID>\n"
                 "<svTRID>CIRA-000065618145-0000000004</svTRID>\n"
                 "</trID>\n"
-                "</response>",
+                "</response>\n"
+                "</epp>",
                 "reason": None,
                 "repository_object_id": None,
                 "server_transaction_id": "CIRA-000065618145-0000000004",
@@ -471,7 +769,8 @@ class DomainTest(unittest.TestCase):
                 "client_transaction_id": "3fc04fc6-0b40-4979-99c0-fa91e9da573f",
                 "code": 1000,
                 "message": "Command completed successfully",
-                "raw_response": "<response>\n"
+                "raw_response": '<epp xmlns="urn:ietf:params:xml:ns:epp-1.0" xmlns:contact="urn:ietf:params:xml:ns:contact-1.0" xmlns:domain="urn:ietf:params:xml:ns:domain-1.0" xmlns:host="urn:ietf:params:xml:ns:host-1.0">\n'
+                "<response>\n"
                 '<result code="1000">\n'
                 "<msg>Command completed successfully</msg>\n"
                 "</result>\n"
@@ -489,7 +788,8 @@ class DomainTest(unittest.TestCase):
                 "<clTRID>3fc04fc6-0b40-4979-99c0-fa91e9da573f</clTRID>\n"
                 "<svTRID>CIRA-000065618145-0000000004</svTRID>\n"
                 "</trID>\n"
-                "</response>",
+                "</response>\n"
+                "</epp>",
                 "reason": None,
                 "repository_object_id": None,
                 "server_transaction_id": "CIRA-000065618145-0000000004",
@@ -513,7 +813,8 @@ class DomainTest(unittest.TestCase):
                 "client_transaction_id": "d2066d60-fc5e-4b7a-9001-893ca2957857",
                 "code": 1000,
                 "message": "Command completed successfully",
-                "raw_response": "<response>\n"
+                "raw_response": '<epp xmlns="urn:ietf:params:xml:ns:epp-1.0" xmlns:contact="urn:ietf:params:xml:ns:contact-1.0" xmlns:domain="urn:ietf:params:xml:ns:domain-1.0" xmlns:host="urn:ietf:params:xml:ns:host-1.0">\n'
+                "<response>\n"
                 '<result code="1000">\n'
                 "<msg>Command completed successfully</msg>\n"
                 "</result>\n"
@@ -521,7 +822,8 @@ class DomainTest(unittest.TestCase):
                 "<clTRID>d2066d60-fc5e-4b7a-9001-893ca2957857</clTRID>\n"
                 "<svTRID>CIRA-000068457178-0000000004</svTRID>\n"
                 "</trID>\n"
-                "</response>",
+                "</response>\n"
+                "</epp>",
                 "reason": None,
                 "repository_object_id": None,
                 "server_transaction_id": "CIRA-000068457178-0000000004",
@@ -563,7 +865,8 @@ class DomainTest(unittest.TestCase):
                 "client_transaction_id": "b9c0c77d-b2d9-47c7-9edb-b4d4988c2e7d",
                 "code": 1000,
                 "message": "Command completed successfully",
-                "raw_response": "<response>\n"
+                "raw_response": '<epp xmlns="urn:ietf:params:xml:ns:epp-1.0" xmlns:contact="urn:ietf:params:xml:ns:contact-1.0" xmlns:domain="urn:ietf:params:xml:ns:domain-1.0" xmlns:host="urn:ietf:params:xml:ns:host-1.0">\n'
+                "<response>\n"
                 '<result code="1000">\n'
                 "<msg>Command completed successfully</msg>\n"
                 "</result>\n"
@@ -576,7 +879,8 @@ class DomainTest(unittest.TestCase):
                 "<clTRID>b9c0c77d-b2d9-47c7-9edb-b4d4988c2e7d</clTRID>\n"
                 "<svTRID>CIRA-000064688525-0000000004</svTRID>\n"
                 "</trID>\n"
-                "</response>",
+                "</response>\n"
+                "</epp>",
                 "reason": None,
                 "repository_object_id": None,
                 "server_transaction_id": "CIRA-000064688525-0000000004",
@@ -598,7 +902,8 @@ class DomainTest(unittest.TestCase):
                 "client_transaction_id": "b9c0c77d-b2d9-47c7-9edb-b4d4988c2e7d",
                 "code": 1000,
                 "message": "Command completed successfully",
-                "raw_response": "<response>\n"
+                "raw_response": '<epp xmlns="urn:ietf:params:xml:ns:epp-1.0" xmlns:contact="urn:ietf:params:xml:ns:contact-1.0" xmlns:domain="urn:ietf:params:xml:ns:domain-1.0" xmlns:host="urn:ietf:params:xml:ns:host-1.0">\n'
+                "<response>\n"
                 '<result code="1000">\n'
                 "<msg>Command completed successfully</msg>\n"
                 "</result>\n"
@@ -606,7 +911,8 @@ class DomainTest(unittest.TestCase):
                 "<clTRID>b9c0c77d-b2d9-47c7-9edb-b4d4988c2e7d</clTRID>\n"
                 "<svTRID>CIRA-000064688525-0000000004</svTRID>\n"
                 "</trID>\n"
-                "</response>",
+                "</response>\n"
+                "</epp>",
                 "reason": None,
                 "repository_object_id": None,
                 "server_transaction_id": "CIRA-000064688525-0000000004",
@@ -729,6 +1035,37 @@ class DomainTest(unittest.TestCase):
         self.assertIn("<secDNS:keyTag>5678</secDNS:keyTag>", xml_command)
         self.assertEqual(xml_command.count("<secDNS:dsData>"), 2)
 
+    def test_create_renders_dns_sec_key_data(self) -> None:
+        """domain.create() must render the key data of the dns_sec records from the dataclasses."""
+        dns_sec = [
+            DSRecordData(
+                key_tag=1235,
+                algorithm=DNSSECAlgorithm.ECDSA_CURVE_P_256_WITH_SHA_256.value,
+                digest_type=DigestTypeEnum.SHA_256.value,
+                digest="digest1",
+                dns_key=DSRecordKeyData(
+                    flag=DNSKeyFlagEnum.FLAG_257.value,
+                    algorithm=DNSSECAlgorithm.ECDSA_CURVE_P_256_WITH_SHA_256.value,
+                    public_key="public&key",
+                ),
+            )
+        ]
+        create_params = DomainData(
+            domain_name="internet.nz",
+            registrant="inz-contact-3",
+            dns_sec=dns_sec,
+        )
+
+        epp_communicator = MagicMock(EppCommunicator)
+        domain = Domain(epp_communicator)
+        domain.create(create_params)
+
+        xml_command = epp_communicator.execute.call_args[0][0]
+        self.assertIn("<secDNS:flags>257</secDNS:flags>", xml_command)
+        self.assertIn("<secDNS:protocol>3</secDNS:protocol>", xml_command)
+        self.assertIn("<secDNS:pubKey>public&amp;key</secDNS:pubKey>", xml_command)
+        self.assertIs(domain._data_to_dict(create_params)["dns_sec"], dns_sec)
+
     def test_create_with_explicit_password(self) -> None:
         """domain.create() must use the explicit password when provided."""
         create_params = DomainData(
@@ -757,7 +1094,8 @@ class DomainTest(unittest.TestCase):
                 "client_transaction_id": None,
                 "code": 1000,
                 "message": "Command completed successfully",
-                "raw_response": "<response>\n"
+                "raw_response": '<epp xmlns="urn:ietf:params:xml:ns:epp-1.0" xmlns:contact="urn:ietf:params:xml:ns:contact-1.0" xmlns:domain="urn:ietf:params:xml:ns:domain-1.0" xmlns:host="urn:ietf:params:xml:ns:host-1.0">\n'
+                "<response>\n"
                 '<result code="1000">\n'
                 "<msg>Command completed successfully</msg>\n"
                 "</result>\n"
@@ -782,7 +1120,8 @@ class DomainTest(unittest.TestCase):
                 "<trID>\n"
                 "<svTRID>CIRA-000063163743-0000000003</svTRID>\n"
                 "</trID>\n"
-                "</response>",
+                "</response>\n"
+                "</epp>",
                 "reason": None,
                 "repository_object_id": "9204701-INZ",
                 "server_transaction_id": "CIRA-000063163743-0000000003",
@@ -793,3 +1132,61 @@ class DomainTest(unittest.TestCase):
         domain.execute = MagicMock(return_value=execute_result)
         result = domain.info("internet.nz")
         self.assertIsNone(result.result_data.dns_sec)
+
+    def test_info_is_parsed_lazily(self) -> None:
+        epp_communicator = MagicMock(EppCommunicator)
+        domain = Domain(epp_communicator)
+        domain.execute = MagicMock(
+            return_value=EppResultData(
+                code=1000,
+                message="Command completed successfully",
+                raw_response=b'<epp xmlns="urn:ietf:params:xml:ns:epp-1.0" '
+                b'xmlns:domain="urn:ietf:params:xml:ns:domain-1.0">'
+                b"<response><resData><domain:infData>"
+                b"<domain:name>internet.nz</domain:name>"
+                b'<domain:status s="ok"/>'
+                b'<domain:contact type="billing">inz-contact-2</domain:contact>'
+                b"<domain:exDate>2024-02-23T21:56:22.713Z</domain:exDate>"
+                b"</domain:infData></resData></response></epp>",
+                result_data=None,
+            )
+        )
+
+        result = domain.info("internet.nz")
+        domain_data = result.result_data
+
+        self.assertIsInstance(domain_data, LazyDomainData)
+        with patch.dict(
+            "pyepp.domain._INFO_FIELD_PARSERS",
+            {"status": MagicMock(side_effect=AssertionError)},
+        ):
+            self.assertEqual(domain_data.expiry_date, "2024-02-23T21:56:22.713Z")
+        with patch.dict(
+            "pyepp.domain._INFO_FIELD_PARSERS",
+            {"expiry_date": MagicMock(side_effect=AssertionError)},
+        ):
+            self.assertEqual(domain_data.expiry_date, "2024-02-23T21:56:22.713Z")
+
+        expected = DomainData(
+            domain_name="internet.nz",
+            registrant=None,
+            admin=None,
+            tech=None,
+            sponsoring_client_id=None,
+            billing=["inz-contact-2"],
+            status=["ok"],
+            create_date=None,
+            creat_client_id=None,
+            update_client_id=None,
+            update_date=None,
+            expiry_date="2024-02-23T21:56:22.713Z",
+            transfer_date=None,
+            password=None,
+        )
+        self.assertEqual(domain_data, expected)
+        self.assertEqual(result.to_dict()["result_data"], asdict(expected))
+
+        copied = pickle.loads(pickle.dumps(domain_data))
+        self.assertIs(type(copied), DomainData)
+        self.assertEqual(copied, expected)
+        self.assertEqual(replace(domain_data, period=1).period, 1)
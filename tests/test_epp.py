@@ -1,13 +1,28 @@
 """
 EPP Communicator unit tests
 """
+import io
+import pickle
 import unittest
 from unittest.mock import MagicMock, patch
 import sys
 import struct
+import threading
 import socket
 
-from pyepp.epp import EppCommunicator, EppResultData, EppCommunicatorException
+from pyepp.epp import EppCommunicator, EppResultData, EppCommunicatorException, RawResponsePolicy, \
+    retain_raw_response
+from pyepp.instrumentation import CommandObserver, WireTrace
+
+
+def recv_into_from(data, chunk_size=1024):
+    """Make a recv_into side effect which serves the data in chunks."""
+    stream = io.BytesIO(data)
+
+    def recv_into(buffer):
+        return stream.readinto(buffer[:chunk_size])
+    return recv_into
+
 
 class EppResultDataTest(unittest.TestCase):
     def test_dunder_methods_and_to_dict(self):
@@ -23,6 +38,63 @@ class EppResultDataTest(unittest.TestCase):
         self.assertEqual(d['code'], 1000)
         self.assertEqual(d['message'], 'Success')
 
+    def test_slots(self):
+        data = EppResultData(code=1000, message='Success', raw_response='raw', result_data=None)
+
+        self.assertFalse(hasattr(data, '__dict__'))
+        self.assertEqual(len(data), 8)
+        with self.assertRaises(KeyError):
+            _ = data['unknown']
+
+    def test_mapping_hides_parsed_response(self):
+        data = EppResultData(code=1000, message='Success', raw_response='raw', result_data=None, xml_tree=object())
+
+        self.assertEqual(list(data), ['code', 'message', 'raw_response', 'result_data', 'reason',
+                                      'client_transaction_id', 'server_transaction_id', 'repository_object_id'])
+        with self.assertRaises(KeyError):
+            _ = data['xml_tree']
+
+    def test_extra_items(self):
+        data = EppResultData(code=1000, message='Success', raw_response='raw', result_data=None)
+
+        data['unknown'] = 'value'
+
+        self.assertEqual(data['unknown'], 'value')
+        self.assertEqual(len(data), 9)
+        self.assertEqual(list(data)[-1], 'unknown')
+        self.assertNotIn('unknown', data.to_dict())
+        self.assertEqual(pickle.loads(pickle.dumps(data))['unknown'], 'value')
+
+    def test_pickle_drops_parsed_response(self):
+        data = EppResultData(code=1000, message='Success', raw_response=b'<epp/>', result_data=None,
+                             xml_tree=object())
+
+        result = pickle.loads(pickle.dumps(data))
+
+        self.assertEqual(result, data)
+        self.assertIsNone(result.xml_tree)
+
+
+class RetainRawResponseTest(unittest.TestCase):
+    def result(self, code):
+        return EppResultData(code=code, message='', raw_response=b'<epp>response</epp>', result_data=None)
+
+    def test_keep(self):
+        self.assertEqual(retain_raw_response(self.result(1000), RawResponsePolicy.KEEP).raw_response,
+                         b'<epp>response</epp>')
+
+    def test_drop(self):
+        self.assertIsNone(retain_raw_response(self.result(2303), RawResponsePolicy.DROP).raw_response)
+
+    def test_truncate(self):
+        self.assertEqual(retain_raw_response(self.result(1000), RawResponsePolicy.TRUNCATE, limit=5).raw_response,
+                         b'<epp>')
+
+    def test_keep_on_error(self):
+        self.assertIsNone(retain_raw_response(self.result(1000), RawResponsePolicy.KEEP_ON_ERROR).raw_response)
+        self.assertEqual(retain_raw_response(self.result(2303), RawResponsePolicy.KEEP_ON_ERROR).raw_response,
+                         b'<epp>response</epp>')
+
 
 class EppCommunicatorTest(unittest.TestCase):
     def setUp(self):
@@ -38,7 +110,7 @@ class EppCommunicatorTest(unittest.TestCase):
 
     def test_read_empty_length(self):
         self.epp._ssl_socket = MagicMock()
-        self.epp._ssl_socket.read.return_value = b''
+        self.epp._ssl_socket.recv_into.return_value = 0
         result = self.epp._read()
         self.assertIsNone(result)
 
@@ -63,19 +135,90 @@ class EppCommunicatorTest(unittest.TestCase):
             self.epp.execute("<xml/>")
         self.assertIn("The connection to the server has not been established yet!", str(context.exception))
 
-    @patch('pyepp.epp.BeautifulSoup')
-    def test_execute_attribute_error_missing_code(self, mock_bs):
+    def test_execute_attribute_error_missing_code(self):
         self.epp.greeting = b'greeting'
-        self.epp._execute_command = MagicMock(return_value='xml')
-        mock_xml = MagicMock()
-        mock_result = MagicMock()
-        mock_result.get.side_effect = AttributeError("Mock attribute error")
-        mock_xml.find.side_effect = lambda tag, *args, **kwargs: mock_result if tag == "result" else MagicMock()
-        mock_bs.return_value = mock_xml
+        self.epp._execute_command = MagicMock(
+            return_value=b'<epp xmlns="urn:ietf:params:xml:ns:epp-1.0"><response><result>'
+                         b'<msg>Command completed successfully</msg></result></response></epp>'
+        )
         with self.assertRaises(EppCommunicatorException) as context:
             self.epp.execute("<xml/>")
         self.assertIn("Could not get result code.", str(context.exception))
 
+    def test_execute_keeps_parsed_response(self):
+        self.epp.greeting = b'greeting'
+        self.epp._execute_command = MagicMock(
+            return_value=b'<epp xmlns="urn:ietf:params:xml:ns:epp-1.0"><response>'
+                         b'<result code="2303"><msg>Object does not exist</msg>'
+                         b'<extValue><value><domain:name xmlns:domain="urn:ietf:params:xml:ns:domain-1.0">'
+                         b'example.nz</domain:name></value><reason>Domain not found</reason></extValue>'
+                         b'</result><trID><clTRID>ABC-12345</clTRID><svTRID>54321-XYZ</svTRID></trID>'
+                         b'</response></epp>'
+        )
+
+        result = self.epp.execute("<xml/>")
+
+        self.assertEqual(result.code, 2303)
+        self.assertEqual(result.message, 'Object does not exist')
+        self.assertEqual(result.reason, 'Domain not found')
+        self.assertEqual(result.client_transaction_id, 'ABC-12345')
+        self.assertEqual(result.server_transaction_id, '54321-XYZ')
+        self.assertIsNone(result.repository_object_id)
+        self.assertEqual(result.xml_tree.tag, '{urn:ietf:params:xml:ns:epp-1.0}epp')
+        self.assertNotIn('xml_tree', result.to_dict())
+
+    def test_execute_raw_response_policy(self):
+        epp = EppCommunicator('localhost', '700', raw_response_policy=RawResponsePolicy.DROP)
+        epp.greeting = b'greeting'
+        epp._execute_command = MagicMock(
+            return_value=b'<epp xmlns="urn:ietf:params:xml:ns:epp-1.0"><response>'
+                         b'<result code="1000"><msg>Command completed successfully</msg></result>'
+                         b'</response></epp>'
+        )
+
+        result = epp.execute("<xml/>")
+        self.assertIsNone(result.raw_response)
+        self.assertEqual(result.xml_tree.tag, '{urn:ietf:params:xml:ns:epp-1.0}epp')
+
+        result = epp.execute("<xml/>", raw_response_policy=RawResponsePolicy.KEEP)
+        self.assertEqual(result.raw_response, epp._execute_command.return_value)
+
+    def test_release_tree_follows_the_applied_policy(self):
+        epp = EppCommunicator('localhost', '700')
+        epp.greeting = b'greeting'
+        epp._execute_command = MagicMock(
+            return_value=b'<epp xmlns="urn:ietf:params:xml:ns:epp-1.0"><response>'
+                         b'<result code="1000"><msg>Command completed successfully</msg></result>'
+                         b'</response></epp>'
+        )
+
+        result = epp.execute("<xml/>")
+        result.release_tree()
+        self.assertIsNotNone(result.xml_tree)
+
+        result = epp.execute("<xml/>", raw_response_policy=RawResponsePolicy.DROP)
+        result.release_tree()
+        self.assertIsNone(result.xml_tree)
+
+    def test_execute_wire_trace(self):
+        epp = EppCommunicator('localhost', '700', wire_trace=WireTrace(sample_rate=2))
+        epp.greeting = b'greeting'
+        epp._execute_command = MagicMock(
+            return_value=b'<epp xmlns="urn:ietf:params:xml:ns:epp-1.0"><response>'
+                         b'<result code="1000"><msg>Command completed successfully</msg></result>'
+                         b'</response></epp>'
+        )
+
+        with self.assertLogs('pyepp.wire', level='INFO') as logs:
+            for _ in range(3):
+                epp.execute("<epp><command><check/><clTRID>ABC</clTRID></command></epp>")
+
+        self.assertEqual(len(logs.records), 2)
+        self.assertEqual(logs.records[0].epp_session_id, epp.session_id)
+        self.assertEqual(logs.records[0].epp_command_type, 'check')
+        self.assertEqual(logs.records[0].epp_client_transaction_id, 'ABC')
+        self.assertEqual(logs.records[0].epp_result_code, 1000)
+
     def test_execute_generic_exception(self):
         self.epp.greeting = b'greeting'
         self.epp._execute_command = MagicMock(side_effect=ValueError("Some value error"))
@@ -120,11 +263,321 @@ class EppCommunicatorTest(unittest.TestCase):
         epp.connect()
         mock_context.load_cert_chain.assert_not_called()
 
+    @patch('pyepp.epp.helper.xml_pretty')
+    @patch('pyepp.epp.ssl.create_default_context')
+    def test_connect_greeting_is_prettified_for_debug_only(self, mock_ssl, mock_pretty):
+        epp = EppCommunicator('localhost', '700')
+        epp._read = MagicMock(return_value=b'greeting')
+        mock_pretty.return_value = 'pretty greeting'
+
+        epp.connect()
+        mock_pretty.assert_not_called()
+
+        with self.assertLogs(level='DEBUG') as logs:
+            epp.connect()
+        mock_pretty.assert_called_once_with(b'greeting')
+        self.assertIn('pretty greeting', logs.output[0])
+
     def test_read_empty_chunk(self):
         self.epp._ssl_socket = MagicMock()
         # Mock length to something that decodes to total_bytes > LENGTH_FIELD_SIZE (4)
         # Using format ">I" means big-endian unsigned int. 8 means length 8.
-        self.epp._ssl_socket.read.return_value = struct.pack(">I", 8)
-        self.epp._ssl_socket.recv.return_value = b''
+        self.epp._ssl_socket.recv_into.side_effect = recv_into_from(struct.pack(">I", 8))
         result = self.epp._read()
         self.assertIsNone(result)
+
+    def test_read_in_chunks(self):
+        self.epp._ssl_socket = MagicMock()
+        payload = b'<epp>' + b'x' * 100 + b'</epp>'
+        self.epp._ssl_socket.recv_into.side_effect = recv_into_from(struct.pack(">I", len(payload) + 4) + payload, 7)
+
+        with self.assertNoLogs(level='INFO'):
+            result = self.epp._read()
+
+        self.assertEqual(result, payload)
+        # The receive buffer is returned without copying it
+        self.assertIsInstance(result, bytearray)
+
+    def test_read_frame_too_large(self):
+        self.epp = EppCommunicator('localhost', '700', max_frame_size=1024)
+        self.epp._ssl_socket = MagicMock()
+        self.epp._ssl_socket.recv_into.side_effect = recv_into_from(struct.pack(">I", 1025))
+
+        with self.assertRaises(EppCommunicatorException):
+            self.epp._read()
+        self.assertIsNone(self.epp._ssl_socket)
+
+    def test_read_invalid_frame_size(self):
+        self.epp._ssl_socket = MagicMock()
+        self.epp._ssl_socket.recv_into.side_effect = recv_into_from(struct.pack(">I", 3))
+
+        self.assertRaises(EppCommunicatorException, self.epp._read)
+
+
+def pipelined_response(code, client_transaction_id=None):
+    trid = f"<trID><clTRID>{client_transaction_id}</clTRID></trID>" if client_transaction_id else ""
+    return (f'<epp xmlns="urn:ietf:params:xml:ns:epp-1.0"><response><result code="{code}"><msg>msg</msg></result>'
+            f'{trid}</response></epp>').encode()
+
+
+def pipelined_command(client_transaction_id):
+    return f"<epp><command><clTRID>{client_transaction_id}</clTRID></command></epp>"
+
+
+class EppCommunicatorKeepAliveTest(unittest.TestCase):
+    def setUp(self):
+        self.epp = EppCommunicator('localhost', '700')
+        self.epp.greeting = b'<greeting/>'
+        self.epp._ssl_socket = MagicMock()
+        self.epp.hello = MagicMock()
+
+    def test_keep_alive_idle_session(self):
+        self.epp._last_activity -= 60
+
+        self.assertTrue(self.epp.keep_alive(30))
+        self.epp.hello.assert_called_once()
+
+    def test_keep_alive_active_session(self):
+        self.assertFalse(self.epp.keep_alive(30))
+        self.epp.hello.assert_not_called()
+
+    def test_keep_alive_not_connected(self):
+        self.epp._last_activity -= 60
+        self.epp.greeting = None
+
+        self.assertFalse(self.epp.keep_alive(30))
+        self.epp.hello.assert_not_called()
+
+    def test_keep_alive_command_in_flight(self):
+        self.epp._last_activity -= 60
+        acquired = threading.Event()
+        release = threading.Event()
+
+        def command():
+            with self.epp._lock:
+                acquired.set()
+                release.wait(5)
+        thread = threading.Thread(target=command)
+        thread.start()
+        acquired.wait(5)
+
+        try:
+            self.assertFalse(self.epp.keep_alive(30))
+        finally:
+            release.set()
+            thread.join()
+        self.epp.hello.assert_not_called()
+
+    def test_activity_is_tracked(self):
+        self.epp._last_activity -= 60
+        self.epp._write("<epp/>")
+
+        self.assertLess(self.epp.idle_time, 60)
+
+
+class EppCommunicatorReconnectTest(unittest.TestCase):
+    CHECK = "<epp><command><check><domain:check/></check></command></epp>"
+    CREATE = "<epp><command><create><domain:create/></create></command></epp>"
+
+    def setUp(self):
+        self.epp = EppCommunicator('localhost', '700', auto_reconnect=True, reconnect_backoff=1)
+        self.epp._user = 'user'
+        self.epp._password = 'password'
+        self.epp._extensions = ['rgp-1.0']
+        self.epp.greeting = b'<greeting/>'
+        self.epp._ssl_socket = MagicMock()
+        self.epp.connect = MagicMock(side_effect=self.connect)
+        self.epp.login = MagicMock()
+        self.sleep = patch('pyepp.epp.time.sleep').start()
+        self.addCleanup(patch.stopall)
+
+    def connect(self):
+        self.epp.greeting = b'<greeting/>'
+        self.epp._ssl_socket = MagicMock()
+        return self.epp.greeting
+
+    def test_idempotent_command_is_retried(self):
+        self.epp._execute_command = MagicMock(side_effect=[
+            EppCommunicatorException("Cannot connect to server. Please re-login!"), pipelined_response(1000),
+        ])
+
+        result = self.epp.execute(self.CHECK)
+
+        self.assertEqual(result.code, 1000)
+        self.epp.connect.assert_called_once()
+        self.epp.login.assert_called_once_with('user', 'password', ['rgp-1.0'])
+        self.assertEqual(self.epp._execute_command.call_count, 2)
+
+    def test_reconnect_is_observed(self):
+        observer = MagicMock(CommandObserver)
+        self.epp.add_observer(observer)
+        self.epp._execute_command = MagicMock(side_effect=[OSError("Connection reset by peer"), pipelined_response(1000)])
+
+        self.epp.execute(self.CHECK)
+
+        observer.reconnected.assert_called_once_with(self.epp.session_id)
+        observer.command_executed.assert_called_once()
+
+    def test_other_command_is_not_retried(self):
+        self.epp._execute_command = MagicMock(side_effect=OSError("Connection reset by peer"))
+
+        self.assertRaises(EppCommunicatorException, self.epp.execute, self.CREATE)
+        self.epp.connect.assert_not_called()
+
+    def test_reconnect_before_command(self):
+        self.epp.close()
+        self.epp._execute_command = MagicMock(return_value=pipelined_response(1000))
+
+        result = self.epp.execute(self.CREATE)
+
+        self.assertEqual(result.code, 1000)
+        self.epp.login.assert_called_once_with('user', 'password', ['rgp-1.0'])
+
+    def test_reconnect_disabled(self):
+        self.epp._auto_reconnect = False
+        self.epp._execute_command = MagicMock(side_effect=EppCommunicatorException("Cannot connect"))
+
+        self.assertRaises(EppCommunicatorException, self.epp.execute, self.CHECK)
+        self.epp.connect.assert_not_called()
+
+    def test_reconnect_with_backoff(self):
+        self.epp.connect.side_effect = EppCommunicatorException("Could not setup a sec sure connection")
+        self.epp._execute_command = MagicMock(side_effect=EppCommunicatorException("Cannot connect"))
+
+        with self.assertRaises(EppCommunicatorException) as context:
+            self.epp.execute(self.CHECK)
+
+        self.assertIn("Cannot reconnect to server", str(context.exception))
+        self.assertEqual(self.epp.connect.call_count, 3)
+        self.assertEqual([call.args[0] for call in self.sleep.call_args_list], [1, 2])
+        self.assertFalse(self.epp.is_connected)
+
+    @patch.object(EppCommunicator, 'execute')
+    def test_credentials_are_kept_for_reconnect(self, mock_execute):
+        mock_execute.return_value = EppResultData(code=1000, message='', raw_response=b'', result_data=None)
+        epp = EppCommunicator('localhost', '700', auto_reconnect=True)
+
+        epp.login('user', 'password')
+        self.assertEqual(epp._password, 'password')
+
+        epp.logout()
+        self.assertIsNone(epp._password)
+
+    @patch.object(EppCommunicator, 'execute')
+    def test_credentials_are_not_kept_by_default(self, mock_execute):
+        mock_execute.return_value = EppResultData(code=1000, message='', raw_response=b'', result_data=None)
+        epp = EppCommunicator('localhost', '700')
+
+        epp.login('user', 'password')
+
+        self.assertIsNone(epp._password)
+
+
+class EppCommunicatorPipelineTest(unittest.TestCase):
+    def setUp(self):
+        self.epp = EppCommunicator('localhost', '700')
+        self.epp.greeting = b'<greeting/>'
+        self.epp._ssl_socket = MagicMock()
+        self.epp._write = MagicMock()
+
+    def test_responses_are_matched_by_client_transaction_id(self):
+        self.epp._read = MagicMock(side_effect=[
+            pipelined_response(1000, "B"), pipelined_response(1000, "A"), pipelined_response(2303, "C"),
+        ])
+
+        results = list(self.epp.execute_pipelined(map(pipelined_command, "ABC"), window=3))
+
+        self.assertEqual([result.client_transaction_id for result in results], ["A", "B", "C"])
+        self.assertEqual(results[2].code, 2303)
+
+    def test_raw_response_policy(self):
+        self.epp._read = MagicMock(side_effect=[pipelined_response(1000, "A"), pipelined_response(2303, "B")])
+
+        results = list(self.epp.execute_pipelined(map(pipelined_command, "AB"), window=2,
+                                                  raw_response_policy=RawResponsePolicy.KEEP_ON_ERROR))
+
+        self.assertIsNone(results[0].raw_response)
+        self.assertIsNotNone(results[1].raw_response)
+
+    def test_window_limits_commands_in_flight(self):
+        events = []
+        self.epp._write = MagicMock(side_effect=lambda cmd: events.append("write"))
+
+        def read():
+            events.append("read")
+            return pipelined_response(1000, "ABCD"[events.count("read") - 1])
+        self.epp._read = MagicMock(side_effect=read)
+
+        results = list(self.epp.execute_pipelined(map(pipelined_command, "ABCD"), window=2))
+
+        self.assertEqual(len(results), 4)
+        self.assertEqual(events, ["write", "write", "read", "write", "read", "write", "read", "read"])
+
+    def test_response_without_client_transaction_id(self):
+        self.epp._read = MagicMock(side_effect=[pipelined_response(2001), pipelined_response(1000, "B")])
+
+        results = list(self.epp.execute_pipelined(map(pipelined_command, "AB")))
+
+        self.assertEqual([result.code for result in results], [2001, 1000])
+
+    def test_command_without_client_transaction_id(self):
+        with self.assertRaises(EppCommunicatorException):
+            list(self.epp.execute_pipelined(["<epp><hello/></epp>"]))
+
+    def test_duplicate_client_transaction_id(self):
+        with self.assertRaises(EppCommunicatorException):
+            list(self.epp.execute_pipelined(map(pipelined_command, "AA")))
+
+    def test_unexpected_response(self):
+        self.epp._read = MagicMock(return_value=pipelined_response(1000, "X"))
+
+        with self.assertRaises(EppCommunicatorException):
+            list(self.epp.execute_pipelined(map(pipelined_command, "A")))
+
+    def test_connection_lost(self):
+        self.epp._read = MagicMock(return_value=None)
+
+        with self.assertRaises(EppCommunicatorException) as context:
+            list(self.epp.execute_pipelined(map(pipelined_command, "A")))
+        self.assertIn("Cannot connect to server. Please re-login!", str(context.exception))
+
+    def test_closing_connection(self):
+        self.epp._read = MagicMock(return_value=pipelined_response(2500, "A"))
+        results = self.epp.execute_pipelined(map(pipelined_command, "AB"))
+
+        self.assertEqual(next(results).code, 2500)
+        self.assertRaises(EppCommunicatorException, next, results)
+        self.assertFalse(self.epp.is_connected)
+
+    def test_completed_pipeline_keeps_connection(self):
+        self.epp._read = MagicMock(side_effect=[pipelined_response(1000, "A"), pipelined_response(1000, "B")])
+
+        list(self.epp.execute_pipelined(map(pipelined_command, "AB")))
+
+        self.assertTrue(self.epp.is_connected)
+
+    def test_early_close_closes_connection(self):
+        """The responses of the commands in flight must not be read as the responses of the next commands."""
+        self.epp._read = MagicMock(side_effect=[pipelined_response(1000, "A")])
+        results = self.epp.execute_pipelined(map(pipelined_command, "ABC"), window=3)
+
+        self.assertEqual(next(results).client_transaction_id, "A")
+        results.close()
+
+        self.assertFalse(self.epp.is_connected)
+
+    def test_error_with_commands_in_flight_closes_connection(self):
+        with self.assertRaises(EppCommunicatorException):
+            list(self.epp.execute_pipelined(map(pipelined_command, "AA")))
+
+        self.assertFalse(self.epp.is_connected)
+
+    def test_not_connected(self):
+        self.epp.greeting = None
+
+        with self.assertRaises(EppCommunicatorException):
+            list(self.epp.execute_pipelined(map(pipelined_command, "A")))
+
+    def test_invalid_window(self):
+        with self.assertRaises(ValueError):
+            list(self.epp.execute_pipelined([], window=0))
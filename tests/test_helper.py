@@ -11,4 +11,21 @@ class HelperTest(unittest.TestCase):
         xml_content = b"<test><node>1</node></test>"
         result = helper.xml_pretty(xml_content)
         self.assertIn("<?xml version=\"1.0\" encoding=\"utf-8\"?>", result)
-        self.assertIn("<test>\n", result)
\ No newline at end of file
+        self.assertIn("<test>\n", result)
+        self.assertEqual(helper.xml_pretty(bytearray(xml_content)), result)
+
+    def test_batched(self) -> None:
+        self.assertEqual(list(helper.batched(range(5), 2)), [[0, 1], [2, 3], [4]])
+        self.assertEqual(list(helper.batched([], 2)), [])
+
+    def test_batched_invalid_size(self) -> None:
+        self.assertRaises(ValueError, list, helper.batched([1], 0))
+
+    def test_get_command_type(self) -> None:
+        self.assertEqual(helper.get_command_type("<epp><hello/></epp>"), "hello")
+        self.assertEqual(
+            helper.get_command_type("<epp>\n  <command>\n    <check>\n<domain:check/></check></command></epp>"), "check"
+        )
+        self.assertEqual(helper.get_command_type("<epp><command>\n<info><domain:info/></info></command></epp>"), "info")
+        self.assertEqual(helper.get_command_type('<epp><command><poll op="req"/></command></epp>'), "poll")
+        self.assertIsNone(helper.get_command_type("<epp><greeting/></epp>"))
@@ -5,6 +5,7 @@ import unittest
 from datetime import date
 from unittest.mock import MagicMock
 
+from pyepp.cache import TTLCache
 from pyepp.host import Host, HostData, IPAddressData
 from pyepp.epp import EppCommunicator, EppResultData
 
@@ -35,7 +36,8 @@ class HostTest(unittest.TestCase):
         expected_result = EppResultData(**{'client_transaction_id': 'cc7d1dba-2c89-4934-9cd2-688f14aafc8c',
                            'code': 1000,
                            'message': 'Command completed successfully',
-                           'raw_response': '<response>\n'
+                           'raw_response': '<epp xmlns="urn:ietf:params:xml:ns:epp-1.0" xmlns:contact="urn:ietf:params:xml:ns:contact-1.0" xmlns:domain="urn:ietf:params:xml:ns:domain-1.0" xmlns:host="urn:ietf:params:xml:ns:host-1.0">\n'
+                                           '<response>\n'
                                            '<result code="1000">\n'
                                            '<msg>Command completed successfully</msg>\n'
                                            '</result>\n'
@@ -55,7 +57,8 @@ class HostTest(unittest.TestCase):
                                            '<clTRID>cc7d1dba-2c89-4934-9cd2-688f14aafc8c</clTRID>\n'
                                            '<svTRID>CIRA-000071511943-0000000003</svTRID>\n'
                                            '</trID>\n'
-                                           '</response>',
+                                           '</response>\n'
+                                           '</epp>',
                            'reason': None,
                            'repository_object_id': None,
                            'result_data': {'0qx.test-3gudmj2badfgwhaubrm8douuldtkz4.co.nz': {'avail': False,
@@ -91,7 +94,8 @@ class HostTest(unittest.TestCase):
             EppResultData(**{'client_transaction_id': 'fecb12df-bc07-4acf-bbc8-e2c5326f63e8',
                              'code': 1000,
                              'message': 'Command completed successfully',
-                             'raw_response': '<response>\n'
+                             'raw_response': '<epp xmlns="urn:ietf:params:xml:ns:epp-1.0" xmlns:contact="urn:ietf:params:xml:ns:contact-1.0" xmlns:domain="urn:ietf:params:xml:ns:domain-1.0" xmlns:host="urn:ietf:params:xml:ns:host-1.0">\n'
+                                             '<response>\n'
                                              '<result code="1000">\n'
                                              '<msg>Command completed successfully</msg>\n'
                                              '</result>\n'
@@ -114,7 +118,8 @@ class HostTest(unittest.TestCase):
                                              '<clTRID>fecb12df-bc07-4acf-bbc8-e2c5326f63e8</clTRID>\n'
                                              '<svTRID>CIRA-000073271502-0000000003</svTRID>\n'
                                              '</trID>\n'
-                                             '</response>',
+                                             '</response>\n'
+                                             '</epp>',
                              'reason': None,
                              'repository_object_id': '12313305-INZ',
                              'server_transaction_id': 'CIRA-000073271502-0000000003',
@@ -124,7 +129,8 @@ class HostTest(unittest.TestCase):
             EppResultData(**{'client_transaction_id': 'fecb12df-bc07-4acf-bbc8-e2c5326f63e8',
                              'code': 1000,
                              'message': 'Command completed successfully',
-                             'raw_response': '<response>\n'
+                             'raw_response': '<epp xmlns="urn:ietf:params:xml:ns:epp-1.0" xmlns:contact="urn:ietf:params:xml:ns:contact-1.0" xmlns:domain="urn:ietf:params:xml:ns:domain-1.0" xmlns:host="urn:ietf:params:xml:ns:host-1.0">\n'
+                                             '<response>\n'
                                              '<result code="1000">\n'
                                              '<msg>Command completed successfully</msg>\n'
                                              '</result>\n'
@@ -147,7 +153,8 @@ class HostTest(unittest.TestCase):
                                              '<clTRID>fecb12df-bc07-4acf-bbc8-e2c5326f63e8</clTRID>\n'
                                              '<svTRID>CIRA-000073271502-0000000003</svTRID>\n'
                                              '</trID>\n'
-                                             '</response>',
+                                             '</response>\n'
+                                             '</epp>',
                              'reason': None,
                              'repository_object_id': '12313305-INZ',
                              'result_data': HostData(host_name='0qx.test-3gudmj2badfgwhaubrm8douuldtkz4.co.nz',
@@ -172,7 +179,8 @@ class HostTest(unittest.TestCase):
             EppResultData(**{'client_transaction_id': 'b4450b14-4115-4185-8615-b77f7ad85dab',
                              'code': 1000,
                              'message': 'Command completed successfully',
-                             'raw_response': '<response>\n'
+                             'raw_response': '<epp xmlns="urn:ietf:params:xml:ns:epp-1.0" xmlns:contact="urn:ietf:params:xml:ns:contact-1.0" xmlns:domain="urn:ietf:params:xml:ns:domain-1.0" xmlns:host="urn:ietf:params:xml:ns:host-1.0">\n'
+                                             '<response>\n'
                                              '<result code="1000">\n'
                                              '<msg>Command completed successfully</msg>\n'
                                              '</result>\n'
@@ -186,7 +194,8 @@ class HostTest(unittest.TestCase):
                                              '<clTRID>b4450b14-4115-4185-8615-b77f7ad85dab</clTRID>\n'
                                              '<svTRID>CIRA-000074059948-0000000003</svTRID>\n'
                                              '</trID>\n'
-                                             '</response>',
+                                             '</response>\n'
+                                             '</epp>',
                              'reason': None,
                              'repository_object_id': None,
                              'server_transaction_id': 'CIRA-000074059948-0000000003',
@@ -207,7 +216,8 @@ class HostTest(unittest.TestCase):
             EppResultData(**{'client_transaction_id': 'b9c0c77d-b2d9-47c7-9edb-b4d4988c2e7d',
                              'code': 1000,
                              'message': 'Command completed successfully',
-                             'raw_response': '<response>\n'
+                             'raw_response': '<epp xmlns="urn:ietf:params:xml:ns:epp-1.0" xmlns:contact="urn:ietf:params:xml:ns:contact-1.0" xmlns:domain="urn:ietf:params:xml:ns:domain-1.0" xmlns:host="urn:ietf:params:xml:ns:host-1.0">\n'
+                                             '<response>\n'
                                              '<result code="1000">\n'
                                              '<msg>Command completed successfully</msg>\n'
                                              '</result>\n'
@@ -215,7 +225,8 @@ class HostTest(unittest.TestCase):
                                              '<clTRID>b9c0c77d-b2d9-47c7-9edb-b4d4988c2e7d</clTRID>\n'
                                              '<svTRID>CIRA-000064688525-0000000004</svTRID>\n'
                                              '</trID>\n'
-                                             '</response>',
+                                             '</response>\n'
+                                             '</epp>',
                              'reason': None,
                              'repository_object_id': None,
                              'server_transaction_id': 'CIRA-000064688525-0000000004',
@@ -229,12 +240,24 @@ class HostTest(unittest.TestCase):
 
         self.assertEqual(result, expected_result)
 
+    def test_update_invalidates_cache(self) -> None:
+        cache = TTLCache()
+        cache.set(("host", "ns1.internet.nz"), "old")
+        cache.set(("host", "ns2.internet.nz"), "old")
+        host = Host(MagicMock(EppCommunicator), cache=cache)
+        host.execute = MagicMock()
+
+        host.update("ns1.internet.nz", new_host_name="ns2.internet.nz")
+
+        self.assertEqual(len(cache), 0)
+
     def test_update(self) -> None:
         expected_result = (
             EppResultData(**{'client_transaction_id': '826aa351-2207-4582-846d-7839630f9c4f',
                              'code': 1000,
                              'message': 'Command completed successfully',
-                             'raw_response': '<response>\n'
+                             'raw_response': '<epp xmlns="urn:ietf:params:xml:ns:epp-1.0" xmlns:contact="urn:ietf:params:xml:ns:contact-1.0" xmlns:domain="urn:ietf:params:xml:ns:domain-1.0" xmlns:host="urn:ietf:params:xml:ns:host-1.0">\n'
+                                             '<response>\n'
                                              '<result code="1000">\n'
                                              '<msg>Command completed successfully</msg>\n'
                                              '</result>\n'
@@ -242,7 +265,8 @@ class HostTest(unittest.TestCase):
                                              '<clTRID>826aa351-2207-4582-846d-7839630f9c4f</clTRID>\n'
                                              '<svTRID>CIRA-000077350909-0000000003</svTRID>\n'
                                              '</trID>\n'
-                                             '</response>',
+                                             '</response>\n'
+                                             '</epp>',
                              'reason': None,
                              'repository_object_id': None,
                              'server_transaction_id': 'CIRA-000077350909-0000000003',
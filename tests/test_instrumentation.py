@@ -0,0 +1,167 @@
+"""
+Instrumentation unit tests
+"""
+import logging
+import shutil
+import unittest
+from unittest.mock import MagicMock
+
+from pyepp.domain import Domain
+from pyepp.epp import EppCommunicator
+from pyepp.instrumentation import CallbackObserver, CommandMetrics, CommandObserver, WireTrace, notify_observers
+from pyepp.testing import MockEppServer
+
+
+class CommandMetricsTest(unittest.TestCase):
+
+    def test_total_time(self) -> None:
+        metrics = CommandMetrics(
+            command_type="check",
+            session_id="session",
+            render_time=0.001,
+            rate_limit_wait=0.002,
+            write_time=0.003,
+            server_time=0.004,
+            read_time=0.005,
+            parse_time=0.006,
+        )
+
+        self.assertAlmostEqual(metrics.total_time, 0.021)
+
+
+class NotifyObserversTest(unittest.TestCase):
+
+    def test_observers_are_notified(self) -> None:
+        callback = MagicMock()
+        metrics = CommandMetrics(command_type="check", session_id="session")
+
+        notify_observers([CommandObserver(), CallbackObserver(callback)], metrics)
+
+        callback.assert_called_once_with(metrics)
+
+    def test_nothing_is_notified_without_metrics(self) -> None:
+        callback = MagicMock()
+
+        notify_observers([CallbackObserver(callback)], None)
+
+        callback.assert_not_called()
+
+    def test_failing_observer_is_ignored(self) -> None:
+        callback = MagicMock()
+        metrics = CommandMetrics(command_type="check", session_id="session")
+
+        with self.assertLogs(level="ERROR"):
+            notify_observers([CallbackObserver(MagicMock(side_effect=ValueError)), CallbackObserver(callback)],
+                             metrics)
+
+        callback.assert_called_once_with(metrics)
+
+
+class WireTraceTest(unittest.TestCase):
+
+    def test_sample(self) -> None:
+        wire_trace = WireTrace(sample_rate=3, level=logging.WARNING)
+
+        self.assertEqual([wire_trace.sample() for _ in range(7)], [True, False, False, True, False, False, True])
+
+    def test_sample_disabled_logger(self) -> None:
+        wire_trace = WireTrace(sample_rate=1, level=logging.DEBUG)
+
+        self.assertFalse(wire_trace.sample())
+
+    def test_invalid_sample_rate(self) -> None:
+        self.assertRaises(ValueError, WireTrace, sample_rate=0)
+
+    def test_trace(self) -> None:
+        wire_trace = WireTrace()
+        command = ('<epp><command><login><clID>user</clID><pw>secret</pw><newPW>newSecret</newPW></login>'
+                   '<clTRID>ABC</clTRID></command></epp>')
+        response = (b'<epp><response><result code="1000"/><resData><domain:authInfo>'
+                    b'<domain:pw roid="1">authSecret</domain:pw></domain:authInfo></resData></response></epp>')
+
+        with self.assertLogs("pyepp.wire", level="INFO") as logs:
+            wire_trace.trace("session", command, response, 1000, "ABC")
+
+        message = logs.records[0].getMessage()
+        self.assertIn("<pw>*****</pw>", message)
+        self.assertIn("<newPW>*****</newPW>", message)
+        self.assertIn('<domain:pw roid="1">*****</domain:pw>', message)
+        self.assertNotIn("ecret", message)
+        self.assertEqual(logs.records[0].epp_command_type, "login")
+        self.assertEqual(logs.records[0].epp_result_code, 1000)
+
+    def test_trace_without_response(self) -> None:
+        with self.assertLogs("pyepp.wire", level="INFO") as logs:
+            WireTrace().trace("session", "<epp><hello/></epp>", None)
+
+        self.assertIn("<<< None", logs.records[0].getMessage())
+
+
+@unittest.skipUnless(shutil.which("openssl"), "openssl is required to generate a certificate")
+class CommandObserverTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.server = MockEppServer()
+        self.server.start()
+        self.addCleanup(self.server.stop)
+
+        self.metrics = []
+        self.epp = EppCommunicator(*self.server.address, ssl_context=self.server.client_ssl_context(),
+                                   observers=[CallbackObserver(self.metrics.append)])
+        self.addCleanup(self.epp.close)
+        self.epp.connect()
+
+    def test_commands_are_measured(self) -> None:
+        self.epp.login("user", "password")
+        Domain(self.epp).check(["example.nz"], client_transaction_id="ABC-123")
+
+        login, check = self.metrics
+        self.assertEqual(login.command_type, "login")
+        self.assertEqual(login.result_code, 1000)
+        self.assertEqual(login.render_time, 0.0)
+
+        self.assertEqual(check.command_type, "check")
+        self.assertEqual(check.session_id, self.epp.session_id)
+        self.assertEqual(check.client_transaction_id, "ABC-123")
+        self.assertEqual(check.result_code, 1000)
+        self.assertIsNone(check.error)
+        self.assertFalse(check.pipelined)
+        self.assertGreater(check.render_time, 0)
+        self.assertGreater(check.server_time, 0)
+        self.assertGreater(check.parse_time, 0)
+        self.assertGreater(check.bytes_sent, 0)
+        self.assertGreater(check.bytes_received, 0)
+        self.assertEqual(self.epp.bytes_sent, login.bytes_sent + check.bytes_sent)
+
+    def test_pipelined_commands_are_measured(self) -> None:
+        self.epp.login("user", "password")
+        domain = Domain(self.epp)
+
+        results = list(domain.execute_pipelined(
+            [("DOMAIN_INFO_XML", {"domain_name": name}) for name in ("example1.nz", "example2.nz")], window=2
+        ))
+
+        metrics = self.metrics[1:]
+        self.assertEqual([item.client_transaction_id for item in metrics],
+                         [result.client_transaction_id for result in results])
+        self.assertTrue(all(item.pipelined and item.command_type == "info" for item in metrics))
+        self.assertTrue(all(item.result_code == 1000 and item.bytes_received > 0 for item in metrics))
+
+    def test_failed_command_is_measured(self) -> None:
+        self.server.script("login", None)
+
+        with self.assertRaises(Exception):
+            self.epp.login("user", "password")
+
+        self.assertIsNone(self.metrics[0].result_code)
+        self.assertIsNotNone(self.metrics[0].error)
+
+    def test_observer_can_be_removed(self) -> None:
+        observer = CommandObserver()
+        observer.command_executed = MagicMock()
+        self.epp.add_observer(observer)
+        self.epp.login("user", "password")
+        self.epp.remove_observer(observer)
+        Domain(self.epp).check(["example.nz"])
+
+        observer.command_executed.assert_called_once()
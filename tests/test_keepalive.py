@@ -0,0 +1,56 @@
+"""
+Keep-alive unit tests
+"""
+import threading
+import unittest
+from unittest.mock import MagicMock
+
+from pyepp.epp import EppCommunicator, EppCommunicatorException
+from pyepp.keepalive import KeepAlive
+
+
+class KeepAliveTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.epp = MagicMock(EppCommunicator)
+        self.epp.keep_alive.return_value = True
+
+    def test_invalid_interval(self) -> None:
+        self.assertRaises(ValueError, KeepAlive, 0)
+
+    def test_check(self) -> None:
+        keep_alive = KeepAlive(interval=60)
+        keep_alive.register(self.epp)
+
+        self.assertEqual(keep_alive.check(), 1)
+        self.epp.keep_alive.assert_called_once_with(60)
+
+    def test_unregister(self) -> None:
+        keep_alive = KeepAlive(interval=60)
+        keep_alive.register(self.epp)
+        keep_alive.unregister(self.epp)
+        keep_alive.unregister(self.epp)
+
+        self.assertEqual(keep_alive.check(), 0)
+        self.epp.keep_alive.assert_not_called()
+
+    def test_failed_session_is_unregistered(self) -> None:
+        self.epp.keep_alive.side_effect = EppCommunicatorException("Cannot connect to server. Please re-login!")
+        keep_alive = KeepAlive(interval=60)
+        keep_alive.register(self.epp)
+
+        self.assertEqual(keep_alive.check(), 0)
+        self.assertEqual(keep_alive.check(), 0)
+        self.epp.keep_alive.assert_called_once()
+        self.epp.close.assert_called_once()
+
+    def test_background_thread(self) -> None:
+        called = threading.Event()
+        self.epp.keep_alive.side_effect = lambda max_idle: called.set()
+
+        with KeepAlive(interval=60, check_interval=0.01) as keep_alive:
+            keep_alive.register(self.epp)
+            self.assertTrue(keep_alive.is_running)
+            self.assertTrue(called.wait(5))
+
+        self.assertFalse(keep_alive.is_running)
@@ -0,0 +1,113 @@
+"""
+OpenMetrics exporter unit tests
+"""
+import shutil
+import unittest
+import urllib.error
+import urllib.request
+
+from pyepp.domain import Domain
+from pyepp.epp import EppCommunicator
+from pyepp.instrumentation import CommandMetrics
+from pyepp.openmetrics import CONTENT_TYPE, MetricsCollector, MetricsServer
+from pyepp.testing import MockEppServer
+
+
+def command_metrics(**kwargs) -> CommandMetrics:
+    return CommandMetrics(**{"command_type": "check", "session_id": "session", **kwargs})
+
+
+class MetricsCollectorTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.collector = MetricsCollector(buckets=(0.1, 1.0))
+
+    def test_empty(self) -> None:
+        metrics = self.collector.render()
+
+        self.assertIn("# TYPE pyepp_commands counter\n", metrics)
+        self.assertIn("pyepp_sessions_open 0\n", metrics)
+        self.assertTrue(metrics.endswith("# EOF\n"))
+
+    def test_commands(self) -> None:
+        self.collector.command_executed(command_metrics(result_code=1000, server_time=0.05, bytes_sent=10,
+                                                        bytes_received=20))
+        self.collector.command_executed(command_metrics(result_code=1000, server_time=0.5, rate_limit_wait=0.25))
+        self.collector.command_executed(command_metrics(command_type="info", result_code=2303, server_time=2.0))
+        self.collector.command_executed(command_metrics(command_type="info", error=OSError()))
+
+        metrics = self.collector.render().splitlines()
+
+        self.assertIn('pyepp_commands_total{command="check",code="1000"} 2', metrics)
+        self.assertIn('pyepp_commands_total{command="info",code="2303"} 1', metrics)
+        self.assertIn('pyepp_commands_total{command="info",code="error"} 1', metrics)
+        self.assertIn('pyepp_server_wait_seconds_bucket{command="check",le="0.1"} 1', metrics)
+        self.assertIn('pyepp_server_wait_seconds_bucket{command="check",le="1.0"} 2', metrics)
+        self.assertIn('pyepp_server_wait_seconds_bucket{command="check",le="+Inf"} 2', metrics)
+        self.assertIn('pyepp_server_wait_seconds_bucket{command="info",le="+Inf"} 1', metrics)
+        self.assertIn('pyepp_server_wait_seconds_count{command="check"} 2', metrics)
+        self.assertIn('pyepp_server_wait_seconds_sum{command="check"} 0.55', metrics)
+        self.assertIn('pyepp_command_duration_seconds_count{command="info"} 2', metrics)
+        self.assertIn("pyepp_rate_limit_wait_seconds_total 0.25", metrics)
+        self.assertIn("pyepp_rate_limited_commands_total 1", metrics)
+        self.assertIn("pyepp_sent_bytes_total 10", metrics)
+        self.assertIn("pyepp_received_bytes_total 20", metrics)
+
+    def test_sessions(self) -> None:
+        self.collector.session_opened("A")
+        self.collector.session_opened("B")
+        self.collector.session_closed("A")
+        self.collector.reconnected("B")
+
+        metrics = self.collector.render().splitlines()
+
+        self.assertIn("pyepp_sessions_open 1", metrics)
+        self.assertIn("pyepp_reconnects_total 1", metrics)
+
+    def test_label_escaping(self) -> None:
+        self.collector.command_executed(command_metrics(command_type='a"b\\c\nd', result_code=1000))
+
+        self.assertIn('pyepp_commands_total{command="a\\"b\\\\c\\nd",code="1000"} 1', self.collector.render())
+
+
+class MetricsServerTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.collector = MetricsCollector()
+        self.server = MetricsServer(self.collector)
+        self.server.start()
+        self.addCleanup(self.server.stop)
+        self.url = "http://{}:{}".format(*self.server.address)
+
+    def test_metrics(self) -> None:
+        self.collector.session_opened("A")
+
+        with urllib.request.urlopen(f"{self.url}/metrics") as response:
+            self.assertEqual(response.headers["Content-Type"], CONTENT_TYPE)
+            self.assertIn("pyepp_sessions_open 1", response.read().decode())
+
+    def test_not_found(self) -> None:
+        with self.assertRaises(urllib.error.HTTPError) as context:
+            urllib.request.urlopen(f"{self.url}/other")
+        self.assertEqual(context.exception.code, 404)
+        context.exception.close()
+
+
+@unittest.skipUnless(shutil.which("openssl"), "openssl is required to generate a certificate")
+class MetricsCollectorIntegrationTest(unittest.TestCase):
+
+    def test_communicator_metrics(self) -> None:
+        collector = MetricsCollector()
+        with MockEppServer() as server:
+            epp = EppCommunicator(*server.address, ssl_context=server.client_ssl_context(), observers=[collector])
+            epp.connect()
+            epp.login("user", "password")
+            Domain(epp).check(["example.nz"])
+            self.assertIn("pyepp_sessions_open 1", collector.render().splitlines())
+
+            epp.logout()
+
+        metrics = collector.render().splitlines()
+        self.assertIn('pyepp_commands_total{command="check",code="1000"} 1', metrics)
+        self.assertIn('pyepp_commands_total{command="logout",code="1500"} 1', metrics)
+        self.assertIn("pyepp_sessions_open 0", metrics)
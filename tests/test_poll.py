@@ -6,6 +6,7 @@ import unittest
 from datetime import date
 from unittest.mock import MagicMock
 
+from pyepp.base_command import ErrorCodeInResultException
 from pyepp.poll import Poll, ServiceMessageQueueData, ServiceMessageData
 from pyepp.epp import EppCommunicator, EppResultData
 
@@ -44,7 +45,8 @@ class HostTest(unittest.TestCase):
                 "client_transaction_id": "c6710aac-cbcf-48d0-9ec3-cfaad1cadc81",
                 "code": 1301,
                 "message": "Command completed successfully; ack to dequeue",
-                "raw_response": "<response>\n"
+                "raw_response": '<epp xmlns="urn:ietf:params:xml:ns:epp-1.0" xmlns:contact="urn:ietf:params:xml:ns:contact-1.0" xmlns:domain="urn:ietf:params:xml:ns:domain-1.0" xmlns:host="urn:ietf:params:xml:ns:host-1.0">\n'
+                "<response>\n"
                 '<result code="1301">\n'
                 "<msg>Command completed successfully; ack to dequeue</msg>\n"
                 "</result>\n"
@@ -57,7 +59,8 @@ class HostTest(unittest.TestCase):
                 "<clTRID>c6710aac-cbcf-48d0-9ec3-cfaad1cadc81</clTRID>\n"
                 "<svTRID>CIRA-000097025501-0000000002</svTRID>\n"
                 "</trID>\n"
-                "</response>",
+                "</response>\n"
+                "</epp>",
                 "reason": None,
                 "repository_object_id": None,
                 "result_data": ServiceMessageQueueData(
@@ -112,7 +115,8 @@ class HostTest(unittest.TestCase):
                 "client_transaction_id": "c6710aac-cbcf-48d0-9ec3-cfaad1cadc81",
                 "code": 1000,
                 "message": "Command completed successfully",
-                "raw_response": "<response>\n"
+                "raw_response": '<epp xmlns="urn:ietf:params:xml:ns:epp-1.0" xmlns:contact="urn:ietf:params:xml:ns:contact-1.0" xmlns:domain="urn:ietf:params:xml:ns:domain-1.0" xmlns:host="urn:ietf:params:xml:ns:host-1.0">\n'
+                "<response>\n"
                 '<result code="1000">\n'
                 "<msg>Command completed successfully</msg>\n"
                 "</result>\n"
@@ -122,7 +126,8 @@ class HostTest(unittest.TestCase):
                 "<clTRID>c6710aac-cbcf-48d0-9ec3-cfaad1cadc81</clTRID>\n"
                 "<svTRID>CIRA-000097025501-0000000002</svTRID>\n"
                 "</trID>\n"
-                "</response>",
+                "</response>\n"
+                "</epp>",
                 "reason": None,
                 "repository_object_id": None,
                 "result_data": None,
@@ -138,6 +143,98 @@ class HostTest(unittest.TestCase):
         self.assertEqual(result.result_data.message_count, 1)
         self.assertEqual(result.result_data.message_id, 27690316)
 
+    def _poll_result(self, code: int, message_id: int = None) -> EppResultData:
+        return EppResultData(
+            code=code,
+            message="message",
+            raw_response="response",
+            result_data=(
+                ServiceMessageQueueData(message_count=1, message_id=message_id)
+                if message_id
+                else None
+            ),
+        )
+
+    def test_drain(self) -> None:
+        poll = Poll(MagicMock(EppCommunicator))
+        poll.request = MagicMock(
+            side_effect=[
+                self._poll_result(1301, 1),
+                self._poll_result(1301, 2),
+                self._poll_result(1300),
+            ]
+        )
+        poll.acknowledge = MagicMock(return_value=self._poll_result(1000))
+
+        messages = list(poll.drain())
+
+        self.assertEqual([message.message_id for message in messages], [1, 2])
+        self.assertEqual(
+            [call.args[0] for call in poll.acknowledge.call_args_list], [1, 2]
+        )
+
+    def test_drain_empty_queue(self) -> None:
+        poll = Poll(MagicMock(EppCommunicator))
+        poll.request = MagicMock(return_value=self._poll_result(1300))
+        poll.acknowledge = MagicMock()
+
+        self.assertEqual(list(poll.drain()), [])
+        poll.acknowledge.assert_not_called()
+
+    def test_drain_callback_failure(self) -> None:
+        poll = Poll(MagicMock(EppCommunicator))
+        poll.request = MagicMock(return_value=self._poll_result(1301, 1))
+        poll.acknowledge = MagicMock()
+        callback = MagicMock(side_effect=ValueError)
+
+        with self.assertRaises(ValueError):
+            list(poll.drain(callback))
+
+        callback.assert_called_once()
+        poll.acknowledge.assert_not_called()
+
+    def test_drain_consumer_stops(self) -> None:
+        poll = Poll(MagicMock(EppCommunicator))
+        poll.request = MagicMock(return_value=self._poll_result(1301, 1))
+        poll.acknowledge = MagicMock()
+
+        next(poll.drain())
+
+        poll.acknowledge.assert_not_called()
+
+    def test_drain_errors(self) -> None:
+        poll = Poll(MagicMock(EppCommunicator))
+        poll.request = MagicMock(return_value=self._poll_result(2400))
+
+        with self.assertRaises(ErrorCodeInResultException):
+            list(poll.drain())
+
+        poll.request = MagicMock(return_value=self._poll_result(1301, 1))
+        poll.acknowledge = MagicMock(return_value=self._poll_result(2303))
+
+        with self.assertRaises(ErrorCodeInResultException):
+            list(poll.drain())
+
+    def test_drain_pipelined(self) -> None:
+        epp_communicator = MagicMock(EppCommunicator)
+        epp_communicator.execute_pipelined.side_effect = [
+            iter([self._poll_result(1000), self._poll_result(1301, 2)]),
+            iter([self._poll_result(1000), self._poll_result(1300)]),
+        ]
+        poll = Poll(epp_communicator)
+        poll.request = MagicMock(return_value=self._poll_result(1301, 1))
+        poll._parse_request = MagicMock(side_effect=lambda result: result)
+        poll._parse_acknowledge = MagicMock(side_effect=lambda result: result)
+        callback = MagicMock()
+
+        messages = list(poll.drain(callback, pipelined=True))
+
+        self.assertEqual([message.message_id for message in messages], [1, 2])
+        self.assertEqual(callback.call_count, 2)
+        poll.request.assert_called_once()
+        commands, = epp_communicator.execute_pipelined.call_args_list[0].args
+        self.assertIn('msgID="1"', list(commands)[0])
+
     def test_data_to_dict(self) -> None:
         epp_communicator = MagicMock(EppCommunicator)
         poll = Poll(epp_communicator)
@@ -0,0 +1,194 @@
+"""
+Session pool unit tests
+"""
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from pyepp.epp import EppCommunicatorException, EppSessionLimitExceededException
+from pyepp.pool import SessionPool, SessionPoolException
+
+
+def make_session() -> MagicMock:
+    session = MagicMock()
+    session.is_connected = True
+    return session
+
+
+class SessionPoolTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.epp_class = patch("pyepp.pool.EppCommunicator").start()
+        self.epp_class.side_effect = lambda *args, **kwargs: make_session()
+        self.addCleanup(patch.stopall)
+
+        self.pool = SessionPool("localhost", "700", "user", "password", size=2, timeout=0.1)
+
+    def test_rate_limiter_is_shared(self) -> None:
+        rate_limiter = MagicMock()
+        pool = SessionPool("localhost", "700", "user", "password", size=2, rate_limiter=rate_limiter)
+
+        pool.acquire()
+        pool.acquire()
+
+        for call in self.epp_class.call_args_list:
+            self.assertIs(call.kwargs["rate_limiter"], rate_limiter)
+
+    def test_invalid_size(self) -> None:
+        self.assertRaises(ValueError, SessionPool, "localhost", "700", "user", "password", size=0)
+
+    def test_session_is_logged_in_and_reused(self) -> None:
+        with self.pool.session() as epp_1:
+            epp_1.connect.assert_called_once()
+            epp_1.login.assert_called_once_with("user", "password", extensions=None)
+
+        with self.pool.session() as epp_2:
+            self.assertIs(epp_1, epp_2)
+
+        self.assertEqual(self.epp_class.call_count, 1)
+        self.assertEqual(self.pool.open_sessions, 1)
+
+    def test_pool_size_is_enforced(self) -> None:
+        epp_1 = self.pool.acquire()
+        epp_2 = self.pool.acquire()
+
+        self.assertIsNot(epp_1, epp_2)
+        self.assertRaises(SessionPoolException, self.pool.acquire)
+
+        self.pool.release(epp_1)
+        self.assertIs(self.pool.acquire(), epp_1)
+
+    def test_waiting_caller_gets_released_session(self) -> None:
+        pool = SessionPool("localhost", "700", "user", "password", size=1, timeout=5)
+        epp = pool.acquire()
+        result = []
+
+        waiter = threading.Thread(target=lambda: result.append(pool.acquire()))
+        waiter.start()
+        pool.release(epp)
+        waiter.join(5)
+
+        self.assertEqual(result, [epp])
+
+    def test_dead_session_is_replaced(self) -> None:
+        with self.pool.session() as epp_1:
+            pass
+        epp_1.is_connected = False
+
+        with self.pool.session() as epp_2:
+            self.assertIsNot(epp_1, epp_2)
+
+        epp_1.close.assert_called()
+        self.assertEqual(self.pool.open_sessions, 1)
+
+    def test_failed_session_is_discarded(self) -> None:
+        with self.assertRaises(EppCommunicatorException):
+            with self.pool.session() as epp_1:
+                raise EppCommunicatorException("Cannot connect to server. Please re-login!")
+
+        epp_1.close.assert_called()
+        self.assertEqual(self.pool.open_sessions, 0)
+
+        with self.pool.session() as epp_2:
+            self.assertIsNot(epp_1, epp_2)
+
+    def test_other_errors_keep_session(self) -> None:
+        with self.assertRaises(ValueError):
+            with self.pool.session() as epp_1:
+                raise ValueError()
+
+        with self.pool.session() as epp_2:
+            self.assertIs(epp_1, epp_2)
+
+    def test_idle_session_is_checked(self) -> None:
+        pool = SessionPool("localhost", "700", "user", "password", size=1, max_idle=0)
+        with pool.session() as epp_1:
+            pass
+        epp_1.hello.side_effect = EppCommunicatorException("Cannot connect to server. Please re-login!")
+
+        with pool.session() as epp_2:
+            self.assertIsNot(epp_1, epp_2)
+
+        epp_1.hello.assert_called_once()
+
+    def test_idle_session_socket_error_frees_slot(self) -> None:
+        pool = SessionPool("localhost", "700", "user", "password", size=1, max_idle=0, timeout=0.1)
+        with pool.session() as epp_1:
+            pass
+        epp_1.hello.side_effect = BrokenPipeError("Broken pipe")
+
+        with pool.session() as epp_2:
+            self.assertIsNot(epp_1, epp_2)
+
+        epp_1.close.assert_called_once()
+        self.assertEqual(pool.open_sessions, 1)
+
+    def test_session_limit_lowers_pool_size(self) -> None:
+        epp_1 = self.pool.acquire()
+
+        limited = make_session()
+        limited.login.side_effect = EppSessionLimitExceededException("Session limit exceeded!")
+        self.epp_class.side_effect = lambda *args, **kwargs: limited
+
+        self.assertRaises(SessionPoolException, self.pool.acquire)
+        limited.close.assert_called_once()
+        self.assertEqual(self.pool.size, 1)
+        self.assertEqual(self.pool.open_sessions, 1)
+
+        self.pool.release(epp_1)
+        self.assertIs(self.pool.acquire(), epp_1)
+
+    def test_session_limit_without_open_sessions(self) -> None:
+        limited = make_session()
+        limited.login.side_effect = EppSessionLimitExceededException("Session limit exceeded!")
+        self.epp_class.side_effect = lambda *args, **kwargs: limited
+
+        self.assertRaises(EppSessionLimitExceededException, self.pool.acquire)
+        self.assertEqual(self.pool.open_sessions, 0)
+
+    def test_connect_error_frees_slot(self) -> None:
+        broken = make_session()
+        broken.connect.side_effect = EppCommunicatorException("Could not setup a sec sure connection")
+        self.epp_class.side_effect = lambda *args, **kwargs: broken
+
+        self.assertRaises(EppCommunicatorException, self.pool.acquire)
+        self.assertEqual(self.pool.open_sessions, 0)
+
+    def test_close(self) -> None:
+        with self.pool as pool:
+            with pool.session() as epp:
+                pass
+
+        epp.logout.assert_called_once()
+        self.assertEqual(self.pool.open_sessions, 0)
+        self.assertRaises(SessionPoolException, self.pool.acquire)
+
+    def test_keep_alive(self) -> None:
+        with patch("pyepp.pool.KeepAlive") as keep_alive_class:
+            pool = SessionPool("localhost", "700", "user", "password", keep_alive_interval=240)
+            keep_alive = keep_alive_class.return_value
+            keep_alive_class.assert_called_once_with(240)
+            keep_alive.start.assert_called_once()
+
+            epp = pool.acquire()
+            keep_alive.register.assert_called_once_with(epp)
+
+            pool.release(epp, discard=True)
+            keep_alive.unregister.assert_called_once_with(epp)
+
+            pool.close()
+            keep_alive.stop.assert_called_once()
+
+    def test_keep_alive_failure_discards_session(self) -> None:
+        pool = SessionPool("localhost", "700", "user", "password", size=1, timeout=0.1, keep_alive_interval=240)
+        self.addCleanup(pool.close)
+        with pool.session() as epp_1:
+            pass
+        epp_1.keep_alive.side_effect = EppCommunicatorException("Timed out reading from the server.")
+        epp_1.close.side_effect = lambda: setattr(epp_1, "is_connected", False)
+
+        pool._keep_alive.check()
+
+        with pool.session() as epp_2:
+            self.assertIsNot(epp_1, epp_2)
+        self.assertEqual(pool.open_sessions, 1)
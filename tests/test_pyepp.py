@@ -1,12 +1,19 @@
 """
 pyepp module unit tests
 """
+import io
 import unittest
 
 from unittest.mock import MagicMock, patch
 
 from pyepp.command_templates import HELLO_XML
-from pyepp.epp import EppCommunicator, EppCommunicatorException, EppResultCode, EppResultData
+from pyepp.epp import (
+    EppCommunicator,
+    EppCommunicatorException,
+    EppResultCode,
+    EppResultData,
+    EppSessionLimitExceededException,
+)
 
 
 class PyEPPTests(unittest.TestCase):
@@ -76,6 +83,15 @@ class PyEPPTests(unittest.TestCase):
 
         self.assertRaises(EppCommunicatorException, epp.login, "user", "pass")
 
+    def test_login_2502(self) -> None:
+        epp = EppCommunicator(**self.epp_config)
+        expected_result = \
+            EppResultData(**{'code': 2502, 'message': "Session limit exceeded; server closing connection",
+                             'reason': None, 'raw_response': "response", 'result_data': None})
+        epp.execute = MagicMock(return_value=expected_result)
+
+        self.assertRaises(EppSessionLimitExceededException, epp.login, "user", "pass")
+
     def test_logout(self) -> None:
         epp = EppCommunicator(**self.epp_config)
         expected_result = \
@@ -140,6 +156,21 @@ class PyEPPTests(unittest.TestCase):
         result = epp.execute(HELLO_XML)
         self.assertEqual(result, expected_result)
 
+    def test_execute_closing_connection(self) -> None:
+        epp = EppCommunicator(**self.epp_config)
+        epp.greeting = "greeting"
+        ssl_socket = MagicMock()
+        epp._ssl_socket = ssl_socket
+        raw_response = b'''<?xml version="1.0" encoding="UTF-8"?>
+<epp xmlns="urn:ietf:params:xml:ns:epp-1.0"><response><result code="2502"><msg>Session limit exceeded; server closing connection</msg></result><trID><svTRID>CIRA-000057351729-0000000001</svTRID></trID></response></epp>'''
+        epp._execute_command = MagicMock(return_value=raw_response)
+
+        result = epp.execute(HELLO_XML)
+
+        self.assertEqual(result.code, 2502)
+        self.assertFalse(epp.is_connected)
+        ssl_socket.close.assert_called_once()
+
     def test_execute_epp_exception(self) -> None:
         epp = EppCommunicator(**self.epp_config)
         epp.connect = MagicMock(return_value=None)
@@ -159,13 +190,12 @@ class PyEPPTests(unittest.TestCase):
     def test_read(self) -> None:
         epp = EppCommunicator(**self.epp_config)
         expected_result = b'<?xml version="1.0" encoding="UTF-8"?>\n<epp xmlns="urn:ietf:params:xml:ns:epp-1.0" xmlns:fury="urn:ietf:params:xml:ns:fury-1.0" xmlns:droplist="urn:ietf:params:xml:ns:droplist-1.0" xmlns:idn="urn:ietf:params:xml:ns:idn-1.0" xmlns:host="urn:ietf:params:xml:ns:host-1.0" xmlns:contact="urn:ietf:params:xml:ns:contact-1.0" xmlns:domain="urn:ietf:params:xml:ns:domain-1.0" xmlns:secDNS="urn:ietf:params:xml:ns:secDNS-1.1" xmlns:launch="urn:ietf:params:xml:ns:launch-1.0" xmlns:mark="urn:ietf:params:xml:ns:mark-1.0" xmlns:smd="urn:ietf:params:xml:ns:signedMark-1.0" xmlns:ds="http://www.w3.org/2000/09/xmldsig#" xmlns:rgp="urn:ietf:params:xml:ns:rgp-1.0" xmlns:fee="urn:ietf:params:xml:ns:fee-0.11">\n    <greeting>\n        <svID>EPP Server Version: 8.0.4 (de4e6cbdab9536033563b335e4fa4555cf24c931)</svID>\n        <svDate>2023-03-30T20:56:22.740Z</svDate>\n        <svcMenu>\n            <version>1.0</version>\n            <lang>fr</lang>\n            <lang>en</lang>\n            <objURI>urn:ietf:params:xml:ns:epp-1.0</objURI>\n            <objURI>urn:ietf:params:xml:ns:domain-1.0</objURI>\n            <objURI>urn:ietf:params:xml:ns:host-1.0</objURI>\n            <objURI>urn:ietf:params:xml:ns:contact-1.0</objURI>\n            <svcExtension>\n                <extURI>urn:ietf:params:xml:ns:rgp-1.0</extURI>\n                <extURI>urn:ietf:params:xml:ns:fury-1.0</extURI>\n                <extURI>urn:ietf:params:xml:ns:fury-2.0</extURI>\n                <extURI>urn:ietf:params:xml:ns:droplist-1.0</extURI>\n                <extURI>urn:ietf:params:xml:ns:fury-rgp-1.0</extURI>\n                <extURI>urn:ietf:params:xml:ns:idn-1.0</extURI>\n                <extURI>urn:ietf:params:xml:ns:secDNS-1.1</extURI>\n                <extURI>urn:ietf:params:xml:ns:launch-1.0</extURI>\n                <extURI>urn:ietf:params:xml:ns:mark-1.0</extURI>\n                <extURI>urn:ietf:params:xml:ns:signedMark-1.0</extURI>\n                <extURI>urn:ietf:params:xml:ns:fee-0.11</extURI>\n                <extURI>urn:ietf:params:xml:ns:fee-0.9</extURI>\n                <extURI>http://www.w3.org/2000/09/xmldsig#</extURI>\n            </svcExtension>\n        </svcMenu>\n        <dcp>\n            <access>\n                <none/>\n            </access>\n            <statement>\n                <purpose>\n                    <admin/>\n                </purpose>\n                <recipient>\n                    <ours/>\n                </recipient>\n                <retention>\n                    <legal/>\n                </retention>\n            </statement>\n        </dcp>\n    </greeting>\n</epp>'
-        epp._ssl_socket = MagicMock(
-            read=MagicMock(return_value=b'\x00\x00\n\t'),
-            recv=MagicMock(return_value=expected_result)
-        )
+        stream = io.BytesIO(b'\x00\x00\n\t' + expected_result)
+        epp._ssl_socket = MagicMock(recv_into=MagicMock(side_effect=stream.readinto))
 
         result = epp._read()
         self.assertEqual(result, expected_result)
+        self.assertEqual(epp.bytes_received, len(expected_result) + 4)
 
     def test_write(self) -> None:
         epp = EppCommunicator(**self.epp_config)
@@ -175,7 +205,8 @@ class PyEPPTests(unittest.TestCase):
         result = epp._write(HELLO_XML)
 
         self.assertEqual(result, expected_result)
-        self.assertEqual(epp._ssl_socket.sendall.call_count, 2)
+        epp._ssl_socket.sendall.assert_called_once_with(b'\x00\x00\x00k' + (HELLO_XML + "\r\n").encode("utf-8"))
+        self.assertEqual(epp.bytes_sent, expected_result + 4)
 
 
 if __name__ == "__main__":
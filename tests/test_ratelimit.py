@@ -0,0 +1,70 @@
+"""
+Rate limiter unit tests
+"""
+import unittest
+from unittest.mock import MagicMock, patch
+
+from pyepp.epp import EppCommunicator
+from pyepp.ratelimit import RateLimiter, RateLimitMetrics, TokenBucket
+
+
+class RateLimitTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.now = 100.0
+        patch("pyepp.ratelimit.time.monotonic", side_effect=lambda: self.now).start()
+        self.sleep = patch("pyepp.ratelimit.time.sleep").start()
+        self.addCleanup(patch.stopall)
+
+    def test_invalid_bucket(self) -> None:
+        self.assertRaises(ValueError, TokenBucket, 0)
+        self.assertRaises(ValueError, TokenBucket, 1, 0)
+
+    def test_token_bucket(self) -> None:
+        bucket = TokenBucket(rate=2, capacity=2)
+
+        self.assertEqual([bucket.reserve() for _ in range(4)], [0, 0, 0.5, 1.0])
+
+        self.now += 1.5
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertEqual(bucket.reserve(), 0.5)
+
+    def test_token_bucket_is_capped(self) -> None:
+        bucket = TokenBucket(rate=10, capacity=1)
+        self.now += 60
+
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertAlmostEqual(bucket.reserve(), 0.1)
+
+    def test_command_rates(self) -> None:
+        rate_limiter = RateLimiter(command_rates={"create": 1})
+
+        for _ in range(3):
+            rate_limiter.acquire("create")
+            rate_limiter.acquire("check")
+        rate_limiter.acquire()
+
+        self.assertEqual([call.args[0] for call in self.sleep.call_args_list], [1.0, 2.0])
+        self.assertEqual(rate_limiter.get_metrics(), {
+            "create": RateLimitMetrics(commands=3, throttled=2, wait_time=3.0),
+            "check": RateLimitMetrics(commands=3),
+            "other": RateLimitMetrics(commands=1),
+        })
+        self.assertEqual(rate_limiter.wait_time, 3.0)
+
+    def test_overall_rate(self) -> None:
+        rate_limiter = RateLimiter(rate=10, burst=1, command_rates={"create": 1})
+
+        self.assertEqual(rate_limiter.acquire("check"), 0)
+        self.assertAlmostEqual(rate_limiter.acquire("create"), 0.1)
+
+    def test_communicator_waits_for_rate_limit(self) -> None:
+        rate_limiter = MagicMock(RateLimiter)
+        rate_limiter.acquire.return_value = 0.5
+        epp = EppCommunicator("localhost", "700", rate_limiter=rate_limiter)
+        epp._write = MagicMock()
+        epp._read = MagicMock(return_value=b"<epp/>")
+
+        epp._execute_command("<epp><command><info><domain:info/></info></command></epp>")
+
+        rate_limiter.acquire.assert_called_once_with("info")
@@ -0,0 +1,215 @@
+"""
+Mock EPP server unit tests
+"""
+import shutil
+import time
+import unittest
+
+from pyepp.base_command import ErrorCodeInResultException
+from pyepp.contact import Contact
+from pyepp.domain import Domain
+from pyepp.epp import EppCommunicator, EppCommunicatorException, EppSessionLimitExceededException
+from pyepp.host import Host
+from pyepp.poll import Poll
+from pyepp.testing import GREETING_XML, MockEppServer, MockSession, create_response
+
+
+class CreateResponseTest(unittest.TestCase):
+
+    def test_create_response(self) -> None:
+        response = create_response(2303, "Object does not exist", "ABC&123")
+
+        self.assertIn('<result code="2303">', response)
+        self.assertIn("<clTRID>ABC&amp;123</clTRID>", response)
+        self.assertNotIn("resData", response)
+
+
+class MockEppServerRespondTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.server = MockEppServer()
+
+    def test_syntax_error(self) -> None:
+        self.assertIn('code="2001"', self.server.respond(b"<epp"))
+
+    def test_unknown_object(self) -> None:
+        response = self.server.respond(
+            b'<epp xmlns="urn:ietf:params:xml:ns:epp-1.0"><command><check>'
+            b'<other:check xmlns:other="urn:other"/></check><clTRID>ABC</clTRID></command></epp>'
+        )
+
+        self.assertIn('code="2101"', response)
+        self.assertIn("<clTRID>ABC</clTRID>", response)
+
+    def test_command_before_login(self) -> None:
+        response = self.server.respond(
+            b'<epp xmlns="urn:ietf:params:xml:ns:epp-1.0"><command><poll op="req"/></command></epp>',
+            MockSession(),
+        )
+
+        self.assertIn('code="2002"', response)
+
+    def test_scripted_responses(self) -> None:
+        command = b'<epp xmlns="urn:ietf:params:xml:ns:epp-1.0"><command><poll op="req"/></command></epp>'
+        self.server.script(
+            "poll:req",
+            create_response(1300, "Command completed successfully; no messages"),
+            lambda xml: create_response(2400, xml.decode()),
+            None,
+        )
+
+        self.assertIn('code="1300"', self.server.respond(command))
+        self.assertIn('code="2400"', self.server.respond(command))
+        self.assertIsNone(self.server.respond(command))
+        self.assertIn('code="1301"', self.server.respond(command))
+
+    def test_responses(self) -> None:
+        server = MockEppServer(responses={"poll:ack": create_response(2303, "Object does not exist")})
+        command = b'<epp xmlns="urn:ietf:params:xml:ns:epp-1.0"><command><poll op="ack" msgID="1"/></command></epp>'
+
+        self.assertIn('code="2303"', server.respond(command))
+        self.assertIn('code="2303"', server.respond(command))
+
+
+@unittest.skipUnless(shutil.which("openssl"), "openssl is required to generate a certificate")
+class MockEppServerTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.server = MockEppServer()
+        self.server.start()
+        self.addCleanup(self.server.stop)
+
+        self.epp = EppCommunicator(*self.server.address, ssl_context=self.server.client_ssl_context())
+        self.addCleanup(self.epp.close)
+        self.epp.connect()
+        self.epp.login("user", "password")
+
+    def test_greeting(self) -> None:
+        self.assertIn(b"<greeting>", self.epp.greeting)
+        self.assertIn(b"<greeting>", self.epp.hello())
+
+    def test_object_commands(self) -> None:
+        result = Domain(self.epp).check(["example1.nz", "example2.nz"])
+        self.assertEqual(
+            result.result_data,
+            {
+                "example1.nz": {"avail": True, "reason": None},
+                "example2.nz": {"avail": True, "reason": None},
+            },
+        )
+
+        self.assertEqual(Domain(self.epp).info("example.nz").result_data.domain_name, "example.nz")
+        self.assertEqual(Contact(self.epp).info("contact").result_data.id, "contact")
+        self.assertEqual(Host(self.epp).info("ns1.example.nz").result_data.host_name, "ns1.example.nz")
+        self.assertEqual(Domain(self.epp).delete("example.nz").code, 1000)
+
+    def test_poll(self) -> None:
+        result = Poll(self.epp).request()
+
+        self.assertEqual(result.code, 1301)
+        self.assertEqual(result.result_data.message_id, 1)
+        self.assertEqual(Poll(self.epp).acknowledge(1).code, 1000)
+
+    def test_logout_closes_the_connection(self) -> None:
+        self.assertEqual(self.epp.logout().code, 1500)
+        self.assertEqual(self.server.connections, 1)
+        self.assertEqual(self.server.commands, 2)
+
+
+@unittest.skipUnless(shutil.which("openssl"), "openssl is required to generate a certificate")
+class ProgrammableMockEppServerTest(unittest.TestCase):
+
+    def create_server(self, **kwargs) -> MockEppServer:
+        server = MockEppServer(**kwargs)
+        server.start()
+        self.addCleanup(server.stop)
+        return server
+
+    def create_communicator(self, server: MockEppServer, **kwargs) -> EppCommunicator:
+        epp = EppCommunicator(*server.address, ssl_context=server.client_ssl_context(), **kwargs)
+        self.addCleanup(epp.close)
+        epp.connect()
+        return epp
+
+    def test_greeting(self) -> None:
+        greeting = GREETING_XML.replace("pyepp mock server", "Registry")
+        server = self.create_server(greeting=greeting)
+
+        self.assertIn(b"<svID>Registry</svID>", self.create_communicator(server).greeting)
+
+    def test_authentication(self) -> None:
+        server = self.create_server(users={"user": "password"})
+
+        with self.assertRaises(EppCommunicatorException):
+            self.create_communicator(server).login("user", "wrong")
+        self.assertEqual(self.create_communicator(server).login("user", "password").code, 1000)
+        self.assertEqual(server.sessions, 1)
+
+    def test_session_limit(self) -> None:
+        server = self.create_server(max_sessions=1)
+        epp = self.create_communicator(server)
+        epp.login("user", "password")
+
+        with self.assertRaises(EppSessionLimitExceededException):
+            self.create_communicator(server).login("user", "password")
+
+        epp.logout()
+        for _ in range(50):
+            if not server.sessions:
+                break
+            time.sleep(0.01)
+        self.assertEqual(self.create_communicator(server).login("user", "password").code, 1000)
+
+    def test_latency(self) -> None:
+        server = self.create_server(latency=0.1)
+        epp = self.create_communicator(server)
+
+        start = time.perf_counter()
+        epp.login("user", "password")
+
+        self.assertGreaterEqual(time.perf_counter() - start, 0.1)
+
+    def test_dropped_connection(self) -> None:
+        server = self.create_server()
+        server.script("domain:info", None)
+        epp = self.create_communicator(server)
+        epp.login("user", "password")
+
+        with self.assertRaises(EppCommunicatorException):
+            Domain(epp).info("example.nz")
+
+    def test_reconnect_after_dropped_connections(self) -> None:
+        server = self.create_server()
+        epp = self.create_communicator(server, auto_reconnect=True)
+        epp.login("user", "password")
+
+        self.assertEqual(server.drop_connections(), 1)
+        self.assertEqual(Domain(epp).info("example.nz").code, 1000)
+        self.assertEqual(server.connections, 2)
+
+    def test_stopped_pipeline(self) -> None:
+        """A pipeline stopped with commands in flight does not leave their responses to the next command."""
+        server = self.create_server()
+        epp = self.create_communicator(server)
+        epp.login("user", "password")
+        domain_names = [f"example{i}.nz" for i in range(25)]
+
+        results = Domain(epp).check_many(domain_names, batch_size=5, pipeline_window=5)
+        next(results)
+        results.close()
+
+        self.assertFalse(epp.is_connected)
+        with self.assertRaises(EppCommunicatorException):
+            Domain(epp).info("example.nz")
+
+    def test_failed_pipeline(self) -> None:
+        server = self.create_server()
+        server.script("domain:check", create_response(2400, "Command failed"))
+        epp = self.create_communicator(server)
+        epp.login("user", "password")
+        domain_names = [f"example{i}.nz" for i in range(25)]
+
+        with self.assertRaises(ErrorCodeInResultException):
+            list(Domain(epp).check_many(domain_names, batch_size=5, pipeline_window=5))
+
+        self.assertFalse(epp.is_connected)